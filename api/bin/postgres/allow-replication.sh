@@ -0,0 +1,5 @@
+#!/bin/sh
+# Run by the grants-db container when it creates its database, lets
+# the grants-db-replica container stream from it, see start-replica.sh
+
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
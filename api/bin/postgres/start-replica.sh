@@ -0,0 +1,20 @@
+#!/bin/sh
+# Entrypoint of the grants-db-replica container. Copies grants-db and then
+# follows it as a streaming standby, so the replica lag check in
+# PostgresDBClient can be tested against a real replica.
+
+set -e
+
+export PGPASSWORD="$POSTGRES_PASSWORD"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_basebackup --host=grants-db --username="$POSTGRES_USER" --pgdata="$PGDATA" --write-recovery-conf --wal-method=stream
+  do
+    echo "waiting on grants-db to accept replication connections..."
+    rm -rf "${PGDATA:?}"/*
+    sleep 3
+  done
+  chmod 700 "$PGDATA"
+fi
+
+exec postgres
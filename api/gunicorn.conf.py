@@ -5,16 +5,47 @@ Attributes:
     bind(str): The socket to bind. Formatted as '0.0.0.0:$PORT'.
     workers(int): The number of worker processes for handling requests.
     threads(int): The number of threads per worker for handling requests.
+    worker_class(str): The type of workers, gevent if enabled, otherwise threads.
+    worker_connections(int): With gevent workers, the number of requests each worker handles at once.
+    preload_app(bool): Whether the app is created once in the master process before forking the workers.
+    wsgi_app(str): The app for the workers to run.
 
 For more information, see https://docs.gunicorn.org/en/stable/configure.html
 """
 
 import os
 
-from src.app_config import AppConfig
+# The gevent worker patches the standard library (sockets, locks, threads, etc.) so they
+# switch to another request rather than block, but only when it starts, after a preloaded
+# app was imported. Anything imported before patching keeps blocking, notably psycopg picks
+# how it waits on the DB when it's imported, and modules like urllib3 keep references to
+# the unpatched ssl classes. So when preloading, patch here, before anything else is
+# imported. That includes AppConfig (and pydantic), so the env vars are read directly.
+#
+# Gunicorn itself has already imported socket, ssl and threading before it loads this file,
+# as it has before the gevent worker patches them when not preloading, which gevent supports.
+_TRUE_VALUES = {'1', 'on', 't', 'true', 'y', 'yes'}
+_patch_for_gevent = (
+    os.environ.get('USE_GEVENT_WORKERS', '').lower() in _TRUE_VALUES
+    and os.environ.get('PRELOAD_APP', '').lower() in _TRUE_VALUES
+)
+if _patch_for_gevent:
+    from gevent import monkey
+
+    monkey.patch_all()
+
+import gc  # noqa: E402
+
+from src.app_config import AppConfig  # noqa: E402
 
 app_config = AppConfig()
 
+if app_config.use_gevent_workers and app_config.preload_app and not _patch_for_gevent:
+    # For example if they're only set in an env file, which AppConfig also reads
+    raise RuntimeError(
+        'USE_GEVENT_WORKERS and PRELOAD_APP must be set as environment variables to use both'
+    )
+
 bind = app_config.host + ':' + str(app_config.port)
 # Calculates the number of usable cores and doubles it. Recommended number of workers per core is two.
 # https://docs.gunicorn.org/en/latest/design.html#how-many-workers
@@ -23,4 +54,39 @@ bind = app_config.host + ':' + str(app_config.port)
 # os.cpu_count(): Return the number of CPUs in the system.
 
 workers = (len(os.sched_getaffinity(0)) * 2) + 1
-threads = 4
+
+if app_config.use_gevent_workers:
+    # Each worker handles up to worker_connections requests at once, as requests mostly
+    # wait on the DB or OpenSearch. Each worker process has its own database connection
+    # pool, requests past the size of the pool wait for a connection from it.
+    # See documentation/api/gunicorn-workers.md for how to size the pools.
+    worker_class = 'gevent'
+    worker_connections = app_config.gevent_worker_connections
+else:
+    threads = 4
+    # Each worker process has its own database connection pool, a worker
+    # needs at most one connection per thread (see DB_POOL_SIZE in PostgresDBConfig)
+
+# With preloading, the app is created in the master process, and each worker is forked
+# with a copy of it. The workers share the memory of the app (copy-on-write) rather than
+# each importing and building everything themselves, and start much faster.
+#
+# The DB and search clients aren't created in the master, their connections can't be
+# shared across processes, so each worker creates its own after it's forked (post_fork).
+# Note that with preloading, code changes are only picked up by restarting the master.
+preload_app = app_config.preload_app
+wsgi_app = 'src.app:create_app(defer_clients=True)' if preload_app else 'src.app:create_app()'
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        # Move everything in the master to the permanent generation, so garbage collection
+        # in the workers doesn't touch, and so copy, the memory they share with the master.
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from src.app import register_clients
+
+        register_clients(worker.app.wsgi())
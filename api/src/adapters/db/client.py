@@ -27,6 +27,8 @@ class DBClient(abc.ABC, metaclass=abc.ABCMeta):
     It has methods for getting a new connection or session object.
 
     A derived class must initialize _engine in the __init__ function
+    and can override _get_read_only_engine to route read-only work elsewhere,
+    for example to a read replica.
     """
 
     _engine: sqlalchemy.engine.Engine
@@ -35,22 +37,44 @@ class DBClient(abc.ABC, metaclass=abc.ABCMeta):
     def check_db_connection(self) -> None:
         raise NotImplementedError()
 
-    def get_connection(self) -> Connection:
+    def get_pool_saturation(self) -> float | None:
+        """Get the fraction of the connections the pool can open that are in use
+
+        Once this reaches 1, anything that needs a connection has to wait for one
+        to be returned to the pool. None if the client doesn't know its pool's limits.
+        """
+        return None
+
+    def _get_read_only_engine(self) -> sqlalchemy.engine.Engine:
+        return self._engine
+
+    def _get_engine(self, read_only: bool) -> sqlalchemy.engine.Engine:
+        if read_only:
+            return self._get_read_only_engine()
+        return self._engine
+
+    def get_connection(self, read_only: bool = False) -> Connection:
         """Return a new database connection object.
 
         Use the connection to execute SQL queries without using the ORM.
 
+        If read_only is set, the connection may be to a read replica,
+        so it should not be used for any writes.
+
         Usage:
             with db.get_connection() as conn:
                 conn.execute(...)
         """
-        return self._engine.connect()
+        return self._get_engine(read_only).connect()
 
-    def get_session(self) -> Session:
+    def get_session(self, read_only: bool = False) -> Session:
         """Return a new session object.
 
         In general, only one session object should be created per request.
 
+        If read_only is set, the session may be bound to a read replica,
+        so it should not be used for any writes.
+
         If you want to automatically commit or rollback the session, use
         the session.begin() context manager.
         See https://docs.sqlalchemy.org/en/13/orm/session_basics.html#when-do-i-construct-a-session-when-do-i-commit-it-and-when-do-i-close-it
@@ -62,4 +86,4 @@ class DBClient(abc.ABC, metaclass=abc.ABCMeta):
                 # session is automatically committed here
                 # or rolled back if an exception is raised
         """
-        return Session(bind=self._engine, expire_on_commit=False, autocommit=False)
+        return Session(bind=self._get_engine(read_only), expire_on_commit=False, autocommit=False)
@@ -1,4 +1,7 @@
 import logging
+import threading
+import time
+from contextlib import ExitStack
 from typing import Any
 
 import boto3
@@ -6,11 +9,54 @@ import psycopg
 import sqlalchemy
 import sqlalchemy.pool as pool
 
+import src.adapters.db.query_stats as query_stats
 from src.adapters.db.client import DBClient
-from src.adapters.db.clients.postgres_config import PostgresDBConfig, get_db_config
+from src.adapters.db.clients.postgres_config import PostgresDBConfig, ReplicaType, get_db_config
 
 logger = logging.getLogger(__name__)
 
+# IAM auth tokens are valid for 15 minutes. We reuse a token for less than that
+# so a connection is never opened with one that's about to expire. This also
+# stays within the lifetime of the credentials the token was signed with, as
+# boto3 refreshes temporary credentials 10-15 minutes before they expire.
+IAM_AUTH_TOKEN_REUSE_SECONDS = 10 * 60
+
+# boto3 clients are thread-safe once created, but creating them isn't,
+# so they're created and tokens are refreshed while holding the lock
+_iam_auth_token_lock = threading.Lock()
+_rds_clients: dict[str, Any] = {}
+# (region, host, port, user) -> (token, time.monotonic() it was generated)
+_iam_auth_tokens: dict[tuple[str, str, int, str], tuple[str, float]] = {}
+
+# How many seconds the replica is behind the primary, for each type of replica.
+# Is null if the lag is unknown, which we treat as too far behind.
+REPLICA_LAG_QUERIES = {
+    # Aurora readers don't replay WAL, Aurora reports how far behind the writer
+    # each instance is. If the cluster has no readers, the reader endpoint
+    # connects to the writer, which is never behind.
+    ReplicaType.AURORA: sqlalchemy.text(
+        """
+        SELECT CASE
+            WHEN session_id = 'MASTER_SESSION_ID' THEN 0
+            ELSE replica_lag_in_msec / 1000.0
+        END
+        FROM aurora_replica_status()
+        WHERE server_id = aurora_db_instance_identifier()
+        """
+    ),
+    # A standby that has replayed everything it received is caught up, even if
+    # its last replayed transaction is old because the primary hasn't had any writes.
+    ReplicaType.POSTGRES: sqlalchemy.text(
+        """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+        """
+    ),
+}
+
 
 class PostgresDBClient(DBClient):
     """
@@ -22,10 +68,32 @@ class PostgresDBClient(DBClient):
         if not db_config:
             db_config = get_db_config()
         self._engine = self._configure_engine(db_config)
+        self._pool_max_overflow = db_config.pool_max_overflow
+        query_stats.register_engine_events(
+            self._engine, db_config.repeated_statement_warning_threshold
+        )
+
+        self._replica_engine: sqlalchemy.engine.Engine | None = None
+        replica_config = db_config.get_replica_config()
+        if replica_config is not None:
+            self._replica_engine = self._configure_engine(replica_config)
+            query_stats.register_engine_events(
+                self._replica_engine, db_config.repeated_statement_warning_threshold
+            )
+
+        self._replica_lag_query = REPLICA_LAG_QUERIES[db_config.replica_type]
+        self._replica_max_lag_seconds = db_config.replica_max_lag_seconds
+        self._replica_lag_check_interval_seconds = db_config.replica_lag_check_interval_seconds
+        self._replica_lag_lock = threading.Lock()
+        self._replica_lag_checked_at: float | None = None
+        self._is_replica_usable = False
 
         if db_config.check_connection_on_init:
             self.check_db_connection()
 
+        if db_config.pool_prefill_size > 0:
+            self.prefill_pool(db_config.pool_prefill_size)
+
     def _configure_engine(self, db_config: PostgresDBConfig) -> sqlalchemy.engine.Engine:
         # We want to be able to control the connection parameters for each
         # connection because for IAM authentication with RDS, short-lived tokens are
@@ -35,9 +103,29 @@ class PostgresDBClient(DBClient):
         # For more details on building connection pools, see the docs:
         # https://docs.sqlalchemy.org/en/13/core/pooling.html#constructing-a-pool
         def get_conn() -> Any:
-            return psycopg.connect(**get_connection_parameters(db_config))
+            start_time = time.perf_counter()
+            conn = psycopg.connect(**get_connection_parameters(db_config))
+            conn.prepared_max = db_config.prepared_max
+            duration_ms = (time.perf_counter() - start_time) * 1000
 
-        conn_pool = pool.QueuePool(get_conn, max_overflow=10, pool_size=20)
+            query_stats.record_connection(duration_ms)
+            logger.info(
+                "created new database connection",
+                extra={
+                    "db.host": db_config.host,
+                    "db.connection_duration_ms": round(duration_ms, 3),
+                },
+            )
+            return conn
+
+        conn_pool = pool.QueuePool(
+            get_conn,
+            pool_size=db_config.pool_size,
+            max_overflow=db_config.pool_max_overflow,
+            timeout=db_config.pool_timeout,
+            recycle=db_config.pool_recycle,
+            pre_ping=db_config.pool_pre_ping,
+        )
 
         # The URL only needs to specify the dialect, since the connection pool
         # handles the actual connections.
@@ -52,6 +140,114 @@ class PostgresDBClient(DBClient):
             # json_serializer=lambda o: json.dumps(o, default=pydantic.json.pydantic_encoder),
         )
 
+    def prefill_pool(self, size: int) -> None:
+        """Open connections up front so they're waiting in the pool for the first requests.
+
+        The connections are all checked out at once so that each is a new
+        connection, then returned to the pool. Failing to connect is logged
+        rather than raised, as requests will connect themselves if needed.
+        """
+        engines = [self._engine]
+        if self._replica_engine is not None:
+            engines.append(self._replica_engine)
+
+        for engine in engines:
+            # Opening more connections than the pool keeps would just close the rest
+            engine_size = min(size, engine.pool.size())  # type: ignore[attr-defined]
+
+            start_time = time.perf_counter()
+            with ExitStack() as stack:
+                try:
+                    for _ in range(engine_size):
+                        stack.enter_context(engine.connect())
+                except Exception:
+                    logger.exception("Failed to prefill database connection pool")
+                    continue
+
+            logger.info(
+                "prefilled database connection pool",
+                extra={
+                    "db.pool_status": engine.pool.status(),
+                    "db.pool_prefill_size": engine_size,
+                    "db.pool_prefill_duration_ms": round(
+                        (time.perf_counter() - start_time) * 1000, 3
+                    ),
+                },
+            )
+
+    def get_pool_saturation(self) -> float | None:
+        # Only the primary's pool, any read-only work can fall back to it
+        conn_pool = self._engine.pool
+        pool_size = conn_pool.size()  # type: ignore[attr-defined]
+
+        if pool_size == 0 or self._pool_max_overflow < 0:
+            # The pool can open unlimited connections
+            return 0.0
+
+        return conn_pool.checkedout() / (pool_size + self._pool_max_overflow)  # type: ignore[attr-defined]
+
+    def _get_read_only_engine(self) -> sqlalchemy.engine.Engine:
+        if self._replica_engine is not None and self._check_replica_usable():
+            return self._replica_engine
+
+        return self._engine
+
+    def _check_replica_usable(self) -> bool:
+        """Whether the replica is reachable and close enough to the primary to use.
+
+        The result is reused for replica_lag_check_interval_seconds. Only one
+        thread checks at a time, the others use the previous result while
+        the check runs rather than waiting on it.
+        """
+        checked_at = self._replica_lag_checked_at
+        if (
+            checked_at is not None
+            and time.monotonic() - checked_at < self._replica_lag_check_interval_seconds
+        ):
+            return self._is_replica_usable
+
+        if not self._replica_lag_lock.acquire(blocking=False):
+            return self._is_replica_usable
+
+        try:
+            lag_seconds = self._get_replica_lag_seconds()
+            is_replica_usable = (
+                lag_seconds is not None and lag_seconds <= self._replica_max_lag_seconds
+            )
+
+            if not is_replica_usable:
+                logger.warning(
+                    "database replica is unavailable or behind, using primary for reads",
+                    extra={
+                        "replica_lag_seconds": lag_seconds,
+                        "replica_max_lag_seconds": self._replica_max_lag_seconds,
+                    },
+                )
+            elif not self._is_replica_usable:
+                logger.info(
+                    "using database replica for reads",
+                    extra={"replica_lag_seconds": lag_seconds},
+                )
+
+            self._is_replica_usable = is_replica_usable
+            self._replica_lag_checked_at = time.monotonic()
+        finally:
+            self._replica_lag_lock.release()
+
+        return self._is_replica_usable
+
+    def _get_replica_lag_seconds(self) -> float | None:
+        assert self._replica_engine is not None
+
+        try:
+            with self._replica_engine.connect() as conn:
+                lag_seconds = conn.scalar(self._replica_lag_query)
+        except Exception:
+            logger.exception("Failed to check database replica lag")
+            return None
+
+        return float(lag_seconds) if lag_seconds is not None else None
+
     def check_db_connection(self) -> None:
         with self.get_connection() as conn:
             conn_info = conn.connection.dbapi_connection.info  # type: ignore
@@ -77,13 +273,13 @@ class PostgresDBClient(DBClient):
 
 
 def get_connection_parameters(db_config: PostgresDBConfig) -> dict[str, Any]:
-    connect_args: dict[str, Any] = {}
+    connect_args: dict[str, Any] = {"prepare_threshold": db_config.get_prepare_threshold()}
 
     if db_config.password is None:
         assert (
             db_config.aws_region is not None
         ), "AWS region needs to be configured for DB IAM auth if DB password is not configured"
-        password = generate_iam_auth_token(
+        password = get_iam_auth_token(
             db_config.aws_region, db_config.host, db_config.port, db_config.username
         )
     else:
@@ -101,6 +297,23 @@ def get_connection_parameters(db_config: PostgresDBConfig) -> dict[str, Any]:
     )
 
 
+def get_iam_auth_token(aws_region: str, host: str, port: int, user: str) -> str:
+    """Get an IAM auth token for connecting to the DB, reusing a cached token if it's still valid"""
+    key = (aws_region, host, port, user)
+
+    with _iam_auth_token_lock:
+        cached_token = _iam_auth_tokens.get(key)
+        if (
+            cached_token is not None
+            and time.monotonic() - cached_token[1] < IAM_AUTH_TOKEN_REUSE_SECONDS
+        ):
+            return cached_token[0]
+
+        token = generate_iam_auth_token(aws_region, host, port, user)
+        _iam_auth_tokens[key] = (token, time.monotonic())
+        return token
+
+
 def generate_iam_auth_token(aws_region: str, host: str, port: int, user: str) -> str:
     logger.info(
         "generating db iam auth token",
@@ -111,13 +324,20 @@ def generate_iam_auth_token(aws_region: str, host: str, port: int, user: str) ->
             "port": port,
         },
     )
-    client = boto3.client("rds", region_name=aws_region)
+    client = _get_rds_client(aws_region)
     token = client.generate_db_auth_token(
         DBHostname=host, Port=port, DBUsername=user, Region=aws_region
     )
     return token
 
 
+def _get_rds_client(aws_region: str) -> Any:
+    if aws_region not in _rds_clients:
+        _rds_clients[aws_region] = boto3.client("rds", region_name=aws_region)
+
+    return _rds_clients[aws_region]
+
+
 def verify_ssl(connection_info: Any) -> None:
     """Verify that the database connection is encrypted and log a warning if not."""
     if connection_info.pgconn.ssl_in_use:
@@ -1,4 +1,5 @@
 import logging
+from enum import StrEnum
 from typing import Optional
 
 from pydantic import Field
@@ -9,6 +10,13 @@ from src.util.env_config import PydanticBaseEnvConfig
 logger = logging.getLogger(__name__)
 
 
+class ReplicaType(StrEnum):
+    # An Aurora reader, which shares storage with the writer rather than replaying WAL
+    AURORA = "aurora"
+    # A Postgres standby that replays WAL streamed from the primary
+    POSTGRES = "postgres"
+
+
 class PostgresDBConfig(PydanticBaseEnvConfig):
     check_connection_on_init: bool = Field(True, alias="DB_CHECK_CONNECTION_ON_INIT")
     aws_region: Optional[str] = Field(None, alias="AWS_REGION")
@@ -20,6 +28,52 @@ class PostgresDBConfig(PydanticBaseEnvConfig):
     hide_sql_parameter_logs: bool = Field(True, alias="HIDE_SQL_PARAMETER_LOGS")
     ssl_mode: str = Field("require", alias="DB_SSL_MODE")
 
+    # Connection pool settings, applied to each engine in each process.
+    # With synchronous gunicorn workers, a process only needs as many
+    # connections as it has threads, see gunicorn.conf.py. With gevent
+    # workers see documentation/api/gunicorn-workers.md for sizing these.
+    pool_size: int = Field(20, alias="DB_POOL_SIZE")
+    pool_max_overflow: int = Field(10, alias="DB_POOL_MAX_OVERFLOW")
+    # Seconds to wait for a connection from the pool before erroring
+    pool_timeout: float = Field(30, alias="DB_POOL_TIMEOUT")
+    # Replace connections older than this many seconds, -1 to never replace them
+    pool_recycle: int = Field(-1, alias="DB_POOL_RECYCLE")
+    # Test each connection is still alive when checking it out of the pool
+    pool_pre_ping: bool = Field(False, alias="DB_POOL_PRE_PING")
+    # How many connections to open when the client is created, so
+    # that the first requests don't pay the cost of connecting
+    pool_prefill_size: int = Field(0, alias="DB_POOL_PREFILL_SIZE")
+
+    # psycopg prepares a statement on the server once it has run this many times
+    # on a connection, so Postgres doesn't re-plan it on every run.
+    # 0 prepares every statement on its first run.
+    prepare_threshold: int = Field(5, alias="DB_PREPARE_THRESHOLD")
+    # The most prepared statements psycopg keeps per connection
+    prepared_max: int = Field(100, alias="DB_PREPARED_MAX")
+    # PgBouncer in transaction pooling mode can run each transaction on a different
+    # server connection, which won't have the statements prepared on another.
+    # Prepared statements are disabled when this is set.
+    pgbouncer_transaction_pooling: bool = Field(False, alias="DB_PGBOUNCER_TRANSACTION_POOLING")
+
+    # If set, log a warning when the same SQL statement runs more than this many
+    # times within a single request or task, which usually indicates an N+1 query
+    repeated_statement_warning_threshold: int | None = Field(
+        None, alias="DB_REPEATED_STATEMENT_WARNING_THRESHOLD"
+    )
+
+    # If a read replica host is set, requests that only read data can be
+    # routed to it, see PostgresDBClient.get_session(read_only=True)
+    replica_host: str | None = Field(None, alias="DB_REPLICA_HOST")
+    replica_port: int | None = Field(None, alias="DB_REPLICA_PORT")
+    # How the replica's lag is checked depends on how it replicates
+    replica_type: ReplicaType = Field(ReplicaType.AURORA, alias="DB_REPLICA_TYPE")
+    # Fallback to the primary when the replica is more than this many seconds behind
+    replica_max_lag_seconds: float = Field(30, alias="DB_REPLICA_MAX_LAG_SECONDS")
+    # How long the result of checking the replica lag is reused for
+    replica_lag_check_interval_seconds: float = Field(
+        5, alias="DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS"
+    )
+
     schema_prefix_override: str | None = Field(None)
 
     def get_schema_translate_map(self) -> dict[str, str]:
@@ -29,6 +83,24 @@ class PostgresDBConfig(PydanticBaseEnvConfig):
 
         return {schema: f"{prefix}{schema}" for schema in Schemas}
 
+    def get_prepare_threshold(self) -> int | None:
+        if self.pgbouncer_transaction_pooling:
+            return None
+
+        return self.prepare_threshold
+
+    def get_replica_config(self) -> "PostgresDBConfig | None":
+        """Get the config for connecting to the read replica, if one is configured"""
+        if self.replica_host is None:
+            return None
+
+        return self.model_copy(
+            update={
+                "host": self.replica_host,
+                "port": self.replica_port if self.replica_port is not None else self.port,
+            }
+        )
+
 
 def get_db_config() -> PostgresDBConfig:
     db_config = PostgresDBConfig()
@@ -42,6 +114,10 @@ def get_db_config() -> PostgresDBConfig:
             "password": "***" if db_config.password is not None else None,
             "port": db_config.port,
             "hide_sql_parameter_logs": db_config.hide_sql_parameter_logs,
+            "replica_host": db_config.replica_host,
+            "replica_type": db_config.replica_type,
+            "pool_size": db_config.pool_size,
+            "pool_max_overflow": db_config.pool_max_overflow,
         },
     )
 
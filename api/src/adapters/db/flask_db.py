@@ -38,16 +38,20 @@ Example:
         db_client = flask_db.get_db(current_app)
         # db_client.get_connection() or db_client.get_session()
 """
+from contextlib import ExitStack
 from functools import wraps
 from typing import Callable, Concatenate, ParamSpec, TypeVar
 
-from flask import Flask, current_app
+from flask import Flask, Response, current_app, g
 
 import src.adapters.db as db
+import src.adapters.db.query_stats as query_stats
+import src.logging.flask_logger as flask_logger
 from src.adapters.db.client import DBClient
 
 _FLASK_EXTENSION_KEY_PREFIX = "db"
 _DEFAULT_CLIENT_NAME = "default"
+_QUERY_STATS_EXTENSION_KEY = "db_query_stats"
 
 
 def register_db_client(
@@ -66,6 +70,35 @@ def register_db_client(
     flask_extension_key = f"{_FLASK_EXTENSION_KEY_PREFIX}{client_name}"
     app.extensions[flask_extension_key] = db_client
 
+    # The query stats cover every DB client, so only need to be setup once.
+    # For the stats to be included in the end request log, the flask logger
+    # must be initialized before this, see flask_logger.init_app
+    if _QUERY_STATS_EXTENSION_KEY not in app.extensions:
+        app.extensions[_QUERY_STATS_EXTENSION_KEY] = True
+        app.before_request(_start_tracking_query_stats)
+        app.after_request(_log_query_stats)
+        app.teardown_request(_stop_tracking_query_stats)
+
+
+def _start_tracking_query_stats() -> None:
+    """Track the SQL statements run during the request"""
+    g.query_stats_exit_stack = ExitStack()
+    g.query_stats = g.query_stats_exit_stack.enter_context(query_stats.track_query_stats())
+
+
+def _log_query_stats(response: Response) -> Response:
+    """Add the SQL statement counts and timing to the end request log"""
+    if "query_stats" in g:
+        flask_logger.add_extra_data_to_current_request_logs(g.query_stats.get_metrics())
+
+    return response
+
+
+def _stop_tracking_query_stats(exception: BaseException | None) -> None:
+    query_stats_exit_stack = g.pop("query_stats_exit_stack", None)
+    if query_stats_exit_stack is not None:
+        query_stats_exit_stack.close()
+
 
 def get_db(app: Flask, client_name: str = _DEFAULT_CLIENT_NAME) -> DBClient:
     """Get the database connection for the given Flask app.
@@ -91,7 +124,7 @@ T = TypeVar("T")
 
 
 def with_db_session(
-    *, client_name: str = _DEFAULT_CLIENT_NAME
+    *, client_name: str = _DEFAULT_CLIENT_NAME, read_only: bool = False
 ) -> Callable[[Callable[Concatenate[db.Session, P], T]], Callable[P, T]]:
     """Decorator for functions that need a database session.
 
@@ -99,6 +132,10 @@ def with_db_session(
     as the first positional argument. A transaction is not started automatically.
     To start a transaction use db_session.begin()
 
+    If read_only is set, the session is bound to the read replica when one is
+    configured and caught up with the primary, see PostgresDBClient. Only use
+    it for functions that don't write to the database.
+
     Usage:
         @with_db_session()
         def foo(db_session: db.Session):
@@ -111,12 +148,17 @@ def with_db_session(
         @with_db_session(client_name="legacy_db")
         def fiz(db_session: db.Session, x, y, z):
             ...
+
+        @with_db_session(read_only=True)
+        def buzz(db_session: db.Session):
+            ...
     """
 
     def decorator(f: Callable[Concatenate[db.Session, P], T]) -> Callable[P, T]:
         @wraps(f)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            with get_db(current_app, client_name=client_name).get_session() as session:
+            db_client = get_db(current_app, client_name=client_name)
+            with db_client.get_session(read_only=read_only) as session:
                 return f(session, *args, **kwargs)
 
         return wrapper
@@ -0,0 +1,164 @@
+"""
+This module tracks how many SQL statements are run, and how long they take,
+within a unit of work like a single API request or a task. It also tracks
+any new database connections opened during it, and how long they took to setup.
+
+It hooks into the engine events of a DB client (see register_engine_events) and
+records every statement to whatever tracking is active in the current context.
+
+Usage:
+    import src.adapters.db.query_stats as query_stats
+
+    with query_stats.track_query_stats() as stats:
+        db_session.execute(...)
+
+    logger.info("done", extra=stats.get_metrics())
+
+Optionally, a warning can be logged when the same statement is run more than
+N times within one unit of work, which usually means a relationship is being
+lazy-loaded once per record (an N+1 query) rather than loaded in bulk.
+"""
+import dataclasses
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+import sqlalchemy
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Keep the warning logs a reasonable size if the statement is very long
+MAX_LOGGED_STATEMENT_LENGTH = 1000
+
+_QUERY_START_TIMES_KEY = "query_stats_start_times"
+
+
+@dataclasses.dataclass
+class QueryStats:
+    statement_count: int = 0
+    duration_ms: float = 0
+
+    # The number of times each distinct statement ran. As the statements are
+    # parameterized, the same query with different parameters has the same text.
+    statement_counts: Counter[str] = dataclasses.field(default_factory=Counter)
+
+    # New connections opened, rather than reused from the connection pool
+    connection_count: int = 0
+    connection_duration_ms: float = 0
+
+    # If this tracking is nested within another, for example
+    # a task run within a request, we record statements to both
+    parent: "QueryStats | None" = None
+
+    def record_statement(
+        self,
+        statement: str,
+        duration_ms: float,
+        repeated_statement_warning_threshold: int | None = None,
+    ) -> None:
+        self.statement_count += 1
+        self.duration_ms += duration_ms
+        self.statement_counts[statement] += 1
+
+        # Only warn the first time we go over the threshold for a given statement
+        if (
+            repeated_statement_warning_threshold is not None
+            and self.statement_counts[statement] == repeated_statement_warning_threshold + 1
+        ):
+            logger.warning(
+                "The same SQL statement ran more than %s times, this may be an N+1 query",
+                repeated_statement_warning_threshold,
+                extra={
+                    "db.repeated_statement": statement[:MAX_LOGGED_STATEMENT_LENGTH],
+                    "db.repeated_statement_threshold": repeated_statement_warning_threshold,
+                },
+            )
+
+        if self.parent is not None:
+            self.parent.record_statement(statement, duration_ms)
+
+    def record_connection(self, duration_ms: float) -> None:
+        self.connection_count += 1
+        self.connection_duration_ms += duration_ms
+
+        if self.parent is not None:
+            self.parent.record_connection(duration_ms)
+
+    def get_metrics(self) -> dict[str, int | float]:
+        return {
+            "db.statement_count": self.statement_count,
+            "db.distinct_statement_count": len(self.statement_counts),
+            "db.duration_ms": round(self.duration_ms, 3),
+            "db.connection_count": self.connection_count,
+            "db.connection_duration_ms": round(self.connection_duration_ms, 3),
+        }
+
+
+_current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def get_current_query_stats() -> QueryStats | None:
+    return _current_query_stats.get()
+
+
+def record_connection(duration_ms: float) -> None:
+    """
+    Record a new database connection to the query stats of the current context
+    """
+    query_stats = _current_query_stats.get()
+    if query_stats is not None:
+        query_stats.record_connection(duration_ms)
+
+
+@contextmanager
+def track_query_stats() -> Iterator[QueryStats]:
+    """
+    Track the SQL statements run within the context manager
+    """
+    query_stats = QueryStats(parent=_current_query_stats.get())
+    token = _current_query_stats.set(query_stats)
+
+    try:
+        yield query_stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def register_engine_events(
+    engine: sqlalchemy.engine.Engine, repeated_statement_warning_threshold: int | None = None
+) -> None:
+    """
+    Record every statement the engine runs to the query stats of the current context
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: sqlalchemy.Connection, *args: Any) -> None:
+        conn.info.setdefault(_QUERY_START_TIMES_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: sqlalchemy.Connection, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        start_time = conn.info[_QUERY_START_TIMES_KEY].pop()
+
+        query_stats = _current_query_stats.get()
+        if query_stats is not None:
+            query_stats.record_statement(
+                statement,
+                (time.perf_counter() - start_time) * 1000,
+                repeated_statement_warning_threshold,
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context: sqlalchemy.engine.ExceptionContext) -> None:
+        # after_cursor_execute isn't called when a statement errors,
+        # so remove the start time that it otherwise would have
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_QUERY_START_TIMES_KEY):
+            conn.info[_QUERY_START_TIMES_KEY].pop()
@@ -1,9 +1,9 @@
-from typing import Any, Type
+from typing import Any, Callable, Type
 
 from sqlalchemy import Integer
 from sqlalchemy.types import TypeDecorator
 
-from src.db.models.lookup import LookupRegistry, LookupTable
+from src.db.models.lookup import LookupConfig, LookupRegistry, LookupTable
 
 
 class LookupColumn(TypeDecorator):
@@ -23,25 +23,50 @@ class LookupColumn(TypeDecorator):
     def __init__(self, lookup_table: Type[LookupTable], *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self.lookup_table = lookup_table
+        self._lookup_config: LookupConfig | None = None
+
+    def _get_lookup_config(self) -> LookupConfig:
+        # Fetched on first use rather than in the constructor as the models
+        # can be defined before their lookup tables are registered. After
+        # that, converting values is just a lookup in the config's mappings.
+        if self._lookup_config is None:
+            self._lookup_config = LookupRegistry.get_lookup_config(self.lookup_table)
+
+        return self._lookup_config
 
     def process_bind_param(self, value: Any | None, dialect: Any) -> int | None:
         if value is None:
             return None
 
-        if not LookupRegistry.is_valid_type_for_table(self.lookup_table, value):
+        lookup_config = self._get_lookup_config()
+
+        if not isinstance(value, lookup_config.get_enums()):
             raise Exception(
                 f"Cannot convert value of type {type(value)} for binding column in table {self.lookup_table.get_table_name()}"
             )
 
-        return LookupRegistry.get_lookup_int_for_enum(self.lookup_table, value)
+        return lookup_config.get_enum_to_int_map().get(value)
 
     def process_result_value(self, value: Any | None, dialect: Any) -> Any | None:
-        if value is None:
-            return None
+        return self.result_processor(dialect, None)(value)
 
-        if not isinstance(value, int):
-            raise Exception(
-                f"Cannot process value from DB of type {type(value)} in table {self.lookup_table.get_table_name()}"
-            )
+    def result_processor(self, dialect: Any, coltype: Any) -> Callable[[Any], Any]:
+        # SQLAlchemy gets this once per query, and then calls the processor for every row,
+        # so everything it needs is looked up here. The DB driver already gives us ints,
+        # so there isn't any processing of the underlying Integer to do first.
+        int_to_enum_map = self._get_lookup_config().get_int_to_enum_map()
+        table_name = self.lookup_table.get_table_name()
+
+        def process(value: Any | None) -> Any | None:
+            if value is None:
+                return None
+
+            lookup_enum = int_to_enum_map.get(value)
+            if lookup_enum is None and not isinstance(value, int):
+                raise Exception(
+                    f"Cannot process value from DB of type {type(value)} in table {table_name}"
+                )
+
+            return lookup_enum
 
-        return LookupRegistry.get_enum_for_lookup_int(self.lookup_table, value)
+        return process
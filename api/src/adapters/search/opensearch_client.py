@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Any, Generator, Iterable
 
 import opensearchpy
@@ -44,10 +45,15 @@ class SearchClient:
         *,
         shard_count: int = 1,
         replica_count: int = 1,
-        analysis: dict | None = None
+        analysis: dict | None = None,
+        mappings: dict | None = None
     ) -> None:
         """
         Create an empty search index
+
+        Mappings can optionally be provided for any fields where the
+        dynamic mapping OpenSearch would otherwise generate isn't what we want.
+        See: https://opensearch.org/docs/latest/field-types/
         """
 
         # Allow the user to adjust how the index analyzer + tokenization works
@@ -62,6 +68,9 @@ class SearchClient:
             },
         }
 
+        if mappings is not None:
+            body["mappings"] = mappings
+
         logger.info("Creating search index %s", index_name, extra={"index_name": index_name})
         self._client.indices.create(index_name, body=body)
 
@@ -78,7 +87,8 @@ class SearchClient:
         records: Iterable[dict[str, Any]],
         primary_key_field: str,
         *,
-        refresh: bool = True
+        refresh: bool = True,
+        routing_field: str | None = None
     ) -> None:
         """
         Bulk upsert records to an index
@@ -86,6 +96,11 @@ class SearchClient:
         See: https://opensearch.org/docs/latest/api-reference/document-apis/bulk/ for details
         In this method we only use the "index" operation which creates or updates a record
         based on the id value.
+
+        If a routing field is provided, the value of that field in each record is used
+        to decide which shard the record is stored on, rather than its ID. Records
+        without a value for the field fall back to the default routing.
+        See: https://opensearch.org/docs/latest/field-types/metadata-fields/routing/
         """
 
         bulk_operations = []
@@ -97,7 +112,12 @@ class SearchClient:
             #
             # {"index": {"_id": 123}}
             # {"opportunity_id": 123, "opportunity_title": "example title", ...}
-            bulk_operations.append({"index": {"_id": record[primary_key_field]}})
+            index_operation = {"_id": record[primary_key_field]}
+
+            if routing_field is not None and record.get(routing_field) is not None:
+                index_operation["routing"] = record[routing_field]
+
+            bulk_operations.append({"index": index_operation})
             bulk_operations.append(record)
 
         logger.info(
@@ -111,18 +131,36 @@ class SearchClient:
         )
         self._client.bulk(index=index_name, body=bulk_operations, refresh=refresh)
 
-    def bulk_delete(self, index_name: str, ids: Iterable[Any], *, refresh: bool = True) -> None:
+    def bulk_delete(
+        self,
+        index_name: str,
+        ids: Iterable[Any],
+        *,
+        refresh: bool = True,
+        routing: dict[Any, str | None] | None = None
+    ) -> None:
         """
         Bulk delete records from an index
 
         See: https://opensearch.org/docs/latest/api-reference/document-apis/bulk/ for details.
         In this method, we delete records based on the IDs passed in.
+
+        Records that were upserted with a routing value need that same value
+        to be deleted, which can be passed in as a mapping of ID to routing value.
         """
+        if routing is None:
+            routing = {}
+
         bulk_operations = []
 
         for _id in ids:
             # { "delete": { "_id": "tt2229499" } }
-            bulk_operations.append({"delete": {"_id": _id}})
+            delete_operation = {"_id": _id}
+
+            if routing.get(_id) is not None:
+                delete_operation["routing"] = routing[_id]
+
+            bulk_operations.append({"delete": delete_operation})
 
         logger.info(
             "Deleting records from %s",
@@ -160,8 +198,7 @@ class SearchClient:
         extra = {"index_name": index_name, "index_alias": alias_name}
         logger.info("Swapping index that backs alias %s", alias_name, extra=extra)
 
-        existing_index_mapping = self._client.cat.aliases(alias_name, format="json")
-        existing_indexes = [i["index"] for i in existing_index_mapping]
+        existing_indexes = self.get_alias_index_names(alias_name)
 
         logger.info(
             "Found existing indexes", extra=extra | {"existing_indexes": ",".join(existing_indexes)}
@@ -179,6 +216,76 @@ class SearchClient:
             for index in existing_indexes:
                 self.delete_index(index)
 
+    def get_alias_index_names(self, alias_name: str) -> list[str]:
+        """
+        Get the names of the index(es) that an alias currently points to
+        """
+        existing_index_mapping = self._client.cat.aliases(alias_name, format="json")
+        return [i["index"] for i in existing_index_mapping]
+
+    def reindex(
+        self,
+        source_index_name: str,
+        dest_index_name: str,
+        *,
+        slices: int | str = "auto",
+        refresh: bool = True,
+        poll_interval_seconds: float = 10
+    ) -> dict:
+        """
+        Copy every document from one index to another within the search cluster.
+
+        Useful when only the settings or mappings of an index change, as the documents
+        don't need to be rebuilt and sent over from our side. The documents are re-analyzed
+        using the settings/mappings of the destination index, which must already exist.
+        Any routing of the documents is kept as-is.
+
+        The reindex is split into slices which run in parallel, and is run as a background
+        task on the cluster which we poll until it completes, so that a long-running reindex
+        doesn't depend on a single HTTP request staying open.
+
+        Returns the response of the reindex task, which includes counts like total and created.
+
+        See: https://opensearch.org/docs/latest/api-reference/document-apis/reindex/
+        """
+        extra = {"source_index_name": source_index_name, "dest_index_name": dest_index_name}
+        logger.info("Reindexing %s to %s", source_index_name, dest_index_name, extra=extra)
+
+        start_response = self._client.reindex(
+            body={"source": {"index": source_index_name}, "dest": {"index": dest_index_name}},
+            params={"wait_for_completion": "false", "slices": slices, "refresh": refresh},
+        )
+        task_id = start_response["task"]
+        extra |= {"task_id": task_id}
+
+        while True:
+            task_response = self._client.tasks.get(task_id=task_id)
+            if task_response.get("completed"):
+                break
+
+            status = task_response.get("task", {}).get("status", {})
+            logger.info(
+                "Waiting for reindex task to complete",
+                extra=extra | {"total": status.get("total"), "created": status.get("created")},
+            )
+            time.sleep(poll_interval_seconds)
+
+        if "error" in task_response:
+            raise RuntimeError("Reindex task %s failed: %s" % (task_id, task_response["error"]))
+
+        response = task_response.get("response", {})
+        if len(response.get("failures", [])) > 0:
+            raise RuntimeError(
+                "Reindex task %s failed for %s document(s): %s"
+                % (task_id, len(response["failures"]), response["failures"][0])
+            )
+
+        logger.info(
+            "Reindex task completed",
+            extra=extra | {"total": response.get("total"), "created": response.get("created")},
+        )
+        return response
+
     def search_raw(self, index_name: str, search_query: dict) -> dict:
         # Simple wrapper around search if you don't want the request or response
         # object handled in any special way.
@@ -262,4 +369,5 @@ def _get_connection_parameters(opensearch_config: OpensearchConfig) -> dict[str,
         verify_certs=opensearch_config.verify_certs,
         ssl_assert_hostname=False,
         ssl_show_warn=False,
+        pool_maxsize=opensearch_config.pool_maxsize,
     )
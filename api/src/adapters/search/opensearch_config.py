@@ -15,6 +15,10 @@ class OpensearchConfig(PydanticBaseEnvConfig):
     port: int  # OPENSEARCH_PORT
     use_ssl: bool = Field(default=True)  # OPENSEARCH_USE_SSL
     verify_certs: bool = Field(default=True)  # OPENSEARCH_VERIFY_CERTS
+    # The most connections kept open to OpenSearch per process. Should be at least the
+    # number of requests a worker handles at once, or connections get opened and then
+    # discarded, see documentation/api/gunicorn-workers.md
+    pool_maxsize: int = Field(default=10)  # OPENSEARCH_POOL_MAXSIZE
 
 
 def get_opensearch_config() -> OpensearchConfig:
@@ -27,6 +31,7 @@ def get_opensearch_config() -> OpensearchConfig:
             "port": opensearch_config.port,
             "use_ssl": opensearch_config.use_ssl,
             "verify_certs": opensearch_config.verify_certs,
+            "pool_maxsize": opensearch_config.pool_maxsize,
         },
     )
 
@@ -1,11 +1,13 @@
 import logging
 
 from apiflask import APIBlueprint
+from flask import current_app
 from sqlalchemy import text
 from werkzeug.exceptions import ServiceUnavailable
 
 import src.adapters.db as db
 import src.adapters.db.flask_db as flask_db
+import src.api.readiness as readiness
 from src.api import response
 from src.api.route_utils import raise_flask_error
 from src.api.schemas.extension import fields
@@ -19,6 +21,18 @@ class HealthcheckResponseSchema(AbstractResponseSchema):
     data = fields.MixinField(metadata={"example": None})
 
 
+class ReadinessResponseSchema(AbstractResponseSchema):
+    data = fields.Dict(
+        keys=fields.String(),
+        values=fields.Boolean(),
+        metadata={
+            "description": "Each check of the dependencies of the API, and whether it passed."
+            " Only the db check decides whether the API is ready, the others are informational",
+            "example": {"db": True, "db_pool": True, "search_index": True},
+        },
+    )
+
+
 healthcheck_blueprint = APIBlueprint("healthcheck", __name__, tag="Health")
 
 
@@ -37,3 +51,28 @@ def health(db_session: db.Session) -> response.ApiResponse:
         raise_flask_error(ServiceUnavailable.code, message="Service Unavailable")
 
     return response.ApiResponse(message="Service healthy")
+
+
+@healthcheck_blueprint.get("/health/live")
+@healthcheck_blueprint.output(HealthcheckResponseSchema)
+@healthcheck_blueprint.doc(responses=[200])
+def health_live() -> response.ApiResponse:
+    # Only checks that the process can handle requests, so that
+    # a dependency being down doesn't get the API restarted
+    return response.ApiResponse(message="Service alive")
+
+
+@healthcheck_blueprint.get("/health/ready")
+@healthcheck_blueprint.output(ReadinessResponseSchema)
+@healthcheck_blueprint.doc(responses=[200, ServiceUnavailable.code])
+def health_ready() -> response.ApiResponse:
+    # The checks run in the background, see src/api/readiness.py, so this
+    # doesn't add load to the DB or search index however often it's called
+    result = readiness.get_readiness_checker(current_app).get_result()
+
+    if not result.is_ready:
+        raise_flask_error(
+            ServiceUnavailable.code, message="Service Unavailable", detail=result.checks
+        )
+
+    return response.ApiResponse(message="Service ready", data=result.checks)
@@ -0,0 +1,70 @@
+"""Module for a faster JSON provider for Flask, backed by orjson.
+
+The responses are semantically the same as Flask's default JSON provider:
+keys are sorted, the same indentation is used, and dates, Decimals, UUIDs,
+dataclasses and enums are converted the same way. The only differences in
+the output bytes are that non-ASCII characters are written as UTF-8
+rather than escaped, and very large or small floats use a shorter but
+equivalent exponent format (1e16 rather than 1e+16).
+
+Usage:
+    from src.api.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+"""
+import json
+import logging
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _get_option(self, indent: bool) -> int:
+        # Dates and dataclasses are passed through to the default function so they're
+        # converted the same way as the default provider. Otherwise orjson would use
+        # the ISO date format, and not sort the keys of dataclasses.
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        return option
+
+    def _orjson_dumps(self, obj: Any, indent: bool) -> str:
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._get_option(indent)).decode()
+        except orjson.JSONEncodeError:
+            # orjson is stricter than json about a few values, like integers
+            # over 64 bits, so fallback to json for anything it can't encode
+            logger.warning("Failed to encode JSON with orjson, using json instead", exc_info=True)
+            kwargs: dict[str, Any] = {"indent": 2} if indent else {"separators": (",", ":")}
+            return super().dumps(obj, **kwargs)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Responses are dumped either indented or compact, see DefaultJSONProvider.response.
+        # Anything else, like other separators, is left to the json module.
+        if kwargs == {"indent": 2}:
+            indent = True
+        elif kwargs == {"separators": (",", ":")}:
+            indent = False
+        else:
+            return super().dumps(obj, **kwargs)
+
+        return self._orjson_dumps(obj, indent)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+
+        return orjson.loads(s)
@@ -37,7 +37,7 @@ See [Release Phases](https://github.com/github/roadmap?tab=readme-ov-file#releas
 @opportunity_blueprint.output(opportunity_schemas.OpportunitySearchResponseV0Schema)
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
+@flask_db.with_db_session(read_only=True)
 def opportunity_search(
     db_session: db.Session, search_params: dict, feature_flag_config: FeatureFlagConfig
 ) -> response.ApiResponse:
@@ -68,7 +68,7 @@ def opportunity_search(
 @opportunity_blueprint.output(opportunity_schemas.OpportunityGetResponseV0Schema)
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
+@flask_db.with_db_session(read_only=True)
 def opportunity_get(db_session: db.Session, opportunity_id: int) -> response.ApiResponse:
     add_extra_data_to_current_request_logs({"request.path.opportunity_id": opportunity_id})
     logger.info("GET /v0/opportunities/:opportunity_id")
@@ -70,7 +70,7 @@ examples = {
 @opportunity_blueprint.output(opportunity_schemas.OpportunitySearchResponseV01Schema)
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
+@flask_db.with_db_session(read_only=True)
 def opportunity_search(db_session: db.Session, search_params: dict) -> response.ApiResponse:
     add_extra_data_to_current_request_logs(flatten_dict(search_params, prefix="request.body"))
     logger.info("POST /v0.1/opportunities/search")
@@ -95,7 +95,7 @@ def opportunity_search(db_session: db.Session, search_params: dict) -> response.
 @opportunity_blueprint.output(opportunity_schemas.OpportunityGetResponseV01Schema)
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
+@flask_db.with_db_session(read_only=True)
 def opportunity_get(db_session: db.Session, opportunity_id: int) -> response.ApiResponse:
     add_extra_data_to_current_request_logs({"opportunity.opportunity_id": opportunity_id})
     logger.info("GET /v0.1/opportunities/:opportunity_id")
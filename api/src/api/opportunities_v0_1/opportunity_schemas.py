@@ -287,6 +287,7 @@ class OpportunitySearchRequestV01Schema(Schema):
         generate_pagination_schema(
             "OpportunityPaginationSchema",
             [
+                "relevancy",
                 "opportunity_id",
                 "opportunity_number",
                 "opportunity_title",
@@ -294,6 +295,7 @@ class OpportunitySearchRequestV01Schema(Schema):
                 "close_date",
                 "agency_code",
             ],
+            include_cursor=True,
         ),
         required=True,
     )
@@ -1,7 +1,7 @@
 import io
 import logging
 
-from flask import Response
+from flask import Response, current_app, g, jsonify
 
 import src.adapters.db as db
 import src.adapters.db.flask_db as flask_db
@@ -9,11 +9,19 @@ import src.adapters.search as search
 import src.adapters.search.flask_opensearch as flask_opensearch
 import src.api.opportunities_v1.opportunity_schemas as opportunity_schemas
 import src.api.response as response
+import src.auth.rate_limit as rate_limit
 import src.util.datetime_util as datetime_util
 from src.api.opportunities_v1.opportunity_blueprint import opportunity_blueprint
+from src.api.route_utils import get_cache_headers, is_not_modified, not_modified_response
 from src.auth.api_key_auth import api_key_auth
 from src.logging.flask_logger import add_extra_data_to_current_request_logs
-from src.services.opportunities_v1.get_opportunity import get_opportunity, get_opportunity_versions
+from src.services.opportunities_v1.get_opportunity import (
+    get_opportunity_etag,
+    get_opportunity_versions,
+    get_opportunity_versions_etag,
+)
+from src.services.opportunities_v1.get_opportunity_json import get_opportunity_json
+from src.services.opportunities_v1.opportunity_document import get_opportunity_document
 from src.services.opportunities_v1.opportunity_to_csv import opportunities_to_csv
 from src.services.opportunities_v1.search_opportunities import search_opportunities
 from src.util.dict_util import flatten_dict
@@ -153,6 +161,11 @@ def opportunity_search(
     add_extra_data_to_current_request_logs(flatten_dict(search_params, prefix="request.body"))
     logger.info("POST /v1/opportunities/search")
 
+    if _is_expensive_search(search_params):
+        rate_limit.check_rate_limit(
+            g.current_user.username, rate_limit.RateLimitBucket.EXPENSIVE_SEARCH
+        )
+
     opportunities, aggregations, pagination_info = search_opportunities(
         search_client, search_params
     )
@@ -186,29 +199,73 @@ def opportunity_search(
     )
 
 
+def _is_expensive_search(search_params: dict) -> bool:
+    # Every value filtered on adds to the search query
+    filter_value_count = sum(
+        len(search_filter.get("one_of", []))
+        for search_filter in search_params.get("filters", {}).values()
+    )
+
+    return rate_limit.get_rate_limiter(current_app).is_expensive_search(
+        page_size=search_params["pagination"]["page_size"],
+        is_csv=search_params.get("format") == opportunity_schemas.SearchResponseFormat.CSV,
+        filter_value_count=filter_value_count,
+    )
+
+
 @opportunity_blueprint.get("/opportunities/<int:opportunity_id>")
 @opportunity_blueprint.output(opportunity_schemas.OpportunityGetResponseV1Schema())
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
-def opportunity_get(db_session: db.Session, opportunity_id: int) -> response.ApiResponse:
+@flask_db.with_db_session(read_only=True)
+def opportunity_get(db_session: db.Session, opportunity_id: int) -> Response:
     add_extra_data_to_current_request_logs({"opportunity.opportunity_id": opportunity_id})
     logger.info("GET /v1/opportunities/:opportunity_id")
     with db_session.begin():
-        opportunity = get_opportunity(db_session, opportunity_id)
+        # Check whether the client already has the current version before loading
+        # the opportunity. If it doesn't exist, fetching it below gives the 404
+        etag = get_opportunity_etag(db_session, opportunity_id)
+        if etag is not None and is_not_modified(etag):
+            return not_modified_response(etag)
+
+        # If the opportunity has an up-to-date document, it's already
+        # serialized, otherwise serialize it in a single query
+        opportunity_data = None
+        if etag is not None:
+            opportunity_data = get_opportunity_document(db_session, opportunity_id, etag)
+        if opportunity_data is None:
+            opportunity_data = get_opportunity_json(db_session, opportunity_id)
+
+    return _opportunity_data_response(opportunity_data, etag)
 
-    return response.ApiResponse(message="Success", data=opportunity)
+
+def _opportunity_data_response(opportunity_data: dict, etag: str | None) -> Response:
+    # The same response that OpportunityGetResponseV1Schema makes,
+    # but the opportunity data is already serialized
+    data_response = jsonify({"message": "Success", "data": opportunity_data, "status_code": 200})
+    if etag is not None:
+        data_response.headers.update(get_cache_headers(etag))
+    return data_response
 
 
 @opportunity_blueprint.get("/opportunities/<int:opportunity_id>/versions")
 @opportunity_blueprint.output(opportunity_schemas.OpportunityVersionsGetResponseV1Schema)
 @opportunity_blueprint.auth_required(api_key_auth)
 @opportunity_blueprint.doc(description=SHARED_ALPHA_DESCRIPTION)
-@flask_db.with_db_session()
-def opportunity_versions_get(db_session: db.Session, opportunity_id: int) -> response.ApiResponse:
+@flask_db.with_db_session(read_only=True)
+def opportunity_versions_get(
+    db_session: db.Session, opportunity_id: int
+) -> response.ApiResponse | tuple[response.ApiResponse, int, dict] | Response:
     add_extra_data_to_current_request_logs({"opportunity.opportunity_id": opportunity_id})
     logger.info("GET /v1/opportunities/:opportunity_id/versions")
     with db_session.begin():
+        etag = get_opportunity_versions_etag(db_session, opportunity_id)
+        if etag is not None and is_not_modified(etag):
+            return not_modified_response(etag)
+
         data = get_opportunity_versions(db_session, opportunity_id)
 
-    return response.ApiResponse(message="Success", data=data)
+    if etag is None:
+        return response.ApiResponse(message="Success", data=data)
+
+    return response.ApiResponse(message="Success", data=data), 200, get_cache_headers(etag)
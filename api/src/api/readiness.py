@@ -0,0 +1,204 @@
+"""
+This module checks whether the API is ready to handle requests, in the background.
+
+Rather than checking the DB and search index on every call to the readiness endpoint,
+which load balancers poll every few seconds for every worker, a background thread
+checks them on an interval and the endpoint serves the latest result.
+
+Only the checks in REQUIRED_CHECKS decide whether the API is ready, as the load balancer
+stops sending a worker requests when it isn't. The others are only reported: a saturated
+DB connection pool is the state of a single worker that clears up as its requests finish,
+and without the search index alias only the search endpoints fail.
+
+Usage:
+    from flask import current_app
+    import src.api.readiness as readiness
+
+    result = readiness.get_readiness_checker(current_app).get_result()
+"""
+import dataclasses
+import logging
+import threading
+import time
+from typing import Callable
+
+from flask import Flask
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+from sqlalchemy import text
+
+import src.adapters.db.flask_db as flask_db
+import src.adapters.search.flask_opensearch as flask_opensearch
+from src.adapters.db.client import DBClient
+from src.adapters.search import SearchClient
+from src.search.search_config import get_search_config
+from src.util.env_config import PydanticBaseEnvConfig
+
+logger = logging.getLogger(__name__)
+
+_READINESS_CHECKER_KEY = "readiness-checker"
+_readiness_checker_lock = threading.Lock()
+
+# The API can't handle requests if these checks fail, including "fresh",
+# which fails if the checks haven't completed recently
+REQUIRED_CHECKS = frozenset({"db", "fresh"})
+
+
+class ReadinessConfig(PydanticBaseEnvConfig):
+    model_config = SettingsConfigDict(env_prefix="READINESS_")
+
+    # How many seconds between each check of the dependencies
+    check_interval_seconds: float = Field(default=10)  # READINESS_CHECK_INTERVAL_SECONDS
+    # The db_pool check fails when more than this fraction of the
+    # connections the DB connection pool can open are in use
+    max_db_pool_saturation: float = Field(default=0.9)  # READINESS_MAX_DB_POOL_SATURATION
+    # If the checks haven't completed for this many intervals, for example
+    # because the DB isn't responding, the API isn't considered ready
+    stale_after_intervals: int = Field(default=3)  # READINESS_STALE_AFTER_INTERVALS
+
+
+@dataclasses.dataclass(frozen=True)
+class ReadinessResult:
+    # The name of each check, and whether it passed
+    checks: dict[str, bool]
+    # When the checks ran, from time.monotonic()
+    checked_at: float
+
+    @property
+    def is_ready(self) -> bool:
+        return all(
+            is_passed
+            for check_name, is_passed in self.checks.items()
+            if check_name in REQUIRED_CHECKS
+        )
+
+
+class ReadinessChecker:
+    """
+    Check the dependencies of the API in a background thread, and keep the latest result.
+
+    The thread is started the first time a result is needed, so that it runs in the
+    process that serves the requests, even if the app was created before forking.
+    """
+
+    def __init__(
+        self,
+        db_client: DBClient,
+        search_client: SearchClient,
+        config: ReadinessConfig | None = None,
+    ) -> None:
+        if config is None:
+            config = ReadinessConfig()
+
+        self.db_client = db_client
+        self.search_client = search_client
+        self.config = config
+
+        self._checks: dict[str, Callable[[], bool]] = {
+            "db": self.check_db,
+            "db_pool": self.check_db_pool,
+            "search_index": self.check_search_index,
+        }
+
+        self._lock = threading.Lock()
+        self._result: ReadinessResult | None = None
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    def get_result(self) -> ReadinessResult:
+        """
+        Get the latest result of the checks
+
+        The first call runs the checks before returning, and starts checking
+        in the background. After that, this only returns the latest result.
+        """
+        if self._result is None:
+            with self._lock:
+                if self._result is None:
+                    self._result = self.run_checks()
+                    self._start_background_checks()
+
+        result = self._result
+
+        stale_after_seconds = self.config.check_interval_seconds * self.config.stale_after_intervals
+        if time.monotonic() - result.checked_at > stale_after_seconds:
+            return ReadinessResult(
+                checks=result.checks | {"fresh": False}, checked_at=result.checked_at
+            )
+
+        return result
+
+    def run_checks(self) -> ReadinessResult:
+        checks = {}
+        for check_name, check in self._checks.items():
+            try:
+                checks[check_name] = check()
+            except Exception:
+                logger.exception("Readiness check failed", extra={"readiness_check": check_name})
+                checks[check_name] = False
+
+        return ReadinessResult(checks=checks, checked_at=time.monotonic())
+
+    def check_db(self) -> bool:
+        with self.db_client.get_connection() as conn:
+            return conn.scalar(text("SELECT 1 AS healthy")) == 1
+
+    def check_db_pool(self) -> bool:
+        pool_saturation = self.db_client.get_pool_saturation()
+        if pool_saturation is None:
+            return True
+
+        if pool_saturation > self.config.max_db_pool_saturation:
+            logger.warning(
+                "DB connection pool is saturated", extra={"db.pool_saturation": pool_saturation}
+            )
+            return False
+
+        return True
+
+    def check_search_index(self) -> bool:
+        index_alias = get_search_config().opportunity_search_index_alias
+        if not self.search_client.alias_exists(index_alias):
+            logger.warning(
+                "Search index alias does not exist", extra={"search_index_alias": index_alias}
+            )
+            return False
+
+        return True
+
+    def _start_background_checks(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run_background_checks, name="readiness-checker", daemon=True
+        )
+        self._thread.start()
+
+    def _run_background_checks(self) -> None:
+        while not self._stop_event.wait(self.config.check_interval_seconds):
+            self._result = self.run_checks()
+
+    def stop(self) -> None:
+        """Stop checking in the background, waiting for a check in progress to finish"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def get_readiness_checker(app: Flask) -> ReadinessChecker:
+    """
+    Get the readiness checker of the app, creating it the first time
+
+    It's created on first use rather than with the app, as
+    the DB and search clients may be created after the app is.
+    """
+    readiness_checker = app.extensions.get(_READINESS_CHECKER_KEY)
+
+    if readiness_checker is None:
+        with _readiness_checker_lock:
+            readiness_checker = app.extensions.get(_READINESS_CHECKER_KEY)
+            if readiness_checker is None:
+                readiness_checker = ReadinessChecker(
+                    flask_db.get_db(app), flask_opensearch.get_search_client(app)
+                )
+                app.extensions[_READINESS_CHECKER_KEY] = readiness_checker
+
+    return readiness_checker
@@ -0,0 +1,156 @@
+"""Module for compressing Flask responses.
+
+Responses are compressed with the best encoding that both the client accepts,
+based on its Accept-Encoding header, and that we support: zstd, brotli or gzip.
+
+Small responses, and responses that are already compressed or aren't
+a text format like JSON or CSV, are sent as is.
+
+Usage:
+    import src.api.response_compression as response_compression
+
+    app = create_app()
+    response_compression.init_app(app)
+"""
+import gzip
+import logging
+from typing import Callable
+
+import brotli
+import flask
+import zstandard
+from pydantic import Field
+
+from src.logging.flask_logger import add_extra_data_to_current_request_logs
+from src.util.env_config import PydanticBaseEnvConfig
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/javascript", "application/x-yaml"}
+
+
+class ResponseCompressionConfig(PydanticBaseEnvConfig):
+    enable_response_compression: bool = Field(True, alias="ENABLE_RESPONSE_COMPRESSION")
+    # Responses smaller than this many bytes aren't worth compressing
+    min_size: int = Field(1024, alias="RESPONSE_COMPRESSION_MIN_SIZE")
+
+    # Compression levels for each encoding. Higher levels make smaller responses
+    # but take more CPU, the defaults are a balance of the two for API responses
+    gzip_level: int = Field(6, alias="RESPONSE_COMPRESSION_GZIP_LEVEL")
+    brotli_quality: int = Field(4, alias="RESPONSE_COMPRESSION_BROTLI_QUALITY")
+    zstd_level: int = Field(3, alias="RESPONSE_COMPRESSION_ZSTD_LEVEL")
+
+
+def get_encoders(config: ResponseCompressionConfig) -> dict[str, Callable[[bytes], bytes]]:
+    """Get the supported encodings and their compression functions, most preferred first"""
+    zstd_compressor = zstandard.ZstdCompressor(level=config.zstd_level)
+
+    return {
+        "zstd": zstd_compressor.compress,
+        "br": lambda data: brotli.compress(data, quality=config.brotli_quality),
+        # mtime=0 so the same response always compresses to the same bytes
+        "gzip": lambda data: gzip.compress(data, compresslevel=config.gzip_level, mtime=0),
+    }
+
+
+def init_app(app: flask.Flask, config: ResponseCompressionConfig | None = None) -> None:
+    """Compress the responses of the Flask app.
+
+    This should be called after the flask logger is initialized, so the size of
+    the compressed response is what's logged at the end of the request.
+    """
+    if config is None:
+        config = ResponseCompressionConfig()
+
+    if not config.enable_response_compression:
+        logger.info("response compression is disabled")
+        return
+
+    encoders = get_encoders(config)
+
+    def _compress_response(response: flask.Response) -> flask.Response:
+        return compress_response(response, config.min_size, encoders)
+
+    app.after_request(_compress_response)
+
+    logger.info(
+        "initialized response compression",
+        extra={"encodings": ",".join(encoders), "min_size": config.min_size},
+    )
+
+
+def compress_response(
+    response: flask.Response, min_size: int, encoders: dict[str, Callable[[bytes], bytes]]
+) -> flask.Response:
+    if response.status_code == 304:
+        return _update_not_modified_response(response, encoders)
+
+    if not _is_compressible(response):
+        return response
+
+    content_length = response.content_length
+    if content_length is None or content_length < min_size:
+        return response
+
+    # Whether the response is compressed depends on the Accept-Encoding header,
+    # so caches need to keep them separate by it
+    response.vary.add("Accept-Encoding")
+
+    # If the client gives several encodings equal preference, this picks the first of ours
+    encoding = flask.request.accept_encodings.best_match(encoders.keys())
+    if encoding is None:
+        return response
+
+    response.set_data(encoders[encoding](response.get_data()))
+    response.headers["Content-Encoding"] = encoding
+
+    _weaken_etag(response)
+
+    add_extra_data_to_current_request_logs(
+        {
+            "response.content_encoding": encoding,
+            "response.uncompressed_content_length": content_length,
+        }
+    )
+
+    return response
+
+
+def _update_not_modified_response(
+    response: flask.Response, encoders: dict[str, Callable[[bytes], bytes]]
+) -> flask.Response:
+    # A 304 response has no body, but has the ETag the full response would have had,
+    # which is weak if it would have been compressed. How large the full response is
+    # isn't known here, so assume it would have been if the client accepts one of our
+    # encodings. At worst the ETag is weak where it could have been strong, which
+    # If-None-Match still matches.
+    response.vary.add("Accept-Encoding")
+
+    if flask.request.accept_encodings.best_match(encoders.keys()) is not None:
+        _weaken_etag(response)
+
+    return response
+
+
+def _weaken_etag(response: flask.Response) -> None:
+    # The compressed response isn't byte-for-byte the same as the uncompressed
+    # one, so the ETag is only weakly the same. If-None-Match uses weak
+    # comparison, so either version still matches it.
+    etag, is_weak = response.get_etag()
+    if etag is not None and not is_weak:
+        response.set_etag(etag, weak=True)
+
+
+def _is_compressible(response: flask.Response) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+
+    # Files and streamed responses are sent as is, rather than reading them into memory
+    if response.direct_passthrough or response.is_streamed:
+        return False
+
+    if "Content-Encoding" in response.headers:
+        return False
+
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
@@ -2,6 +2,8 @@ from typing import Any, Never
 
 from apiflask import abort
 from apiflask.types import ResponseHeaderType
+from flask import Response, current_app, request
+from werkzeug.http import quote_etag
 
 from src.api.response import ValidationErrorDetail
 
@@ -20,3 +22,27 @@ def raise_flask_error(
     abort(
         status_code, message, detail, headers, extra_data={"validation_issues": validation_issues}
     )
+
+
+def is_not_modified(etag: str) -> bool:
+    """Whether the client already has the version of the resource with this ETag
+
+    Checks the If-None-Match header of the current request
+    """
+    return request.if_none_match.contains_weak(etag)
+
+
+def get_cache_headers(etag: str) -> dict[str, str]:
+    """Headers that let clients and CDNs cache a resource and revalidate it with the ETag"""
+    max_age = current_app.config["CACHE_CONTROL_MAX_AGE"]
+    return {
+        "ETag": quote_etag(etag),
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+        # Responses are only returned with a valid API key,
+        # so caches need to keep them separate by key
+        "Vary": "X-Auth",
+    }
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status=304, headers=get_cache_headers(etag))
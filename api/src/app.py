@@ -10,9 +10,11 @@ import src.adapters.db.flask_db as flask_db
 import src.adapters.search as search
 import src.adapters.search.flask_opensearch as flask_opensearch
 import src.api.feature_flags.feature_flag_config as feature_flag_config
+import src.api.response_compression as response_compression
 import src.logging
 import src.logging.flask_logger as flask_logger
 from src.api.healthcheck import healthcheck_blueprint
+from src.api.json_provider import OrjsonProvider
 from src.api.opportunities_v0 import opportunity_blueprint as opportunities_v0_blueprint
 from src.api.opportunities_v0_1 import opportunity_blueprint as opportunities_v0_1_blueprint
 from src.api.opportunities_v1 import opportunity_blueprint as opportunities_v1_blueprint
@@ -37,11 +39,22 @@ See [Release Phases](https://github.com/github/roadmap?tab=readme-ov-file#releas
 """
 
 
-def create_app() -> APIFlask:
+def create_app(defer_clients: bool = False) -> APIFlask:
+    """
+    Create the Flask app.
+
+    If defer_clients is set, the DB and search clients aren't created, and
+    register_clients must be called before the app handles any requests. This is for
+    gunicorn's preload mode (see gunicorn.conf.py), which creates the app in the master
+    process before forking the workers. The connections in the pools of these clients
+    can't be shared across processes, so each worker creates its own after the fork.
+    """
     app = APIFlask(__name__, title=TITLE, version=API_OVERALL_VERSION)
 
     setup_logging(app)
-    register_db_client(app)
+    response_compression.init_app(app)
+    if not defer_clients:
+        register_db_client(app)
 
     feature_flag_config.initialize()
 
@@ -49,11 +62,25 @@ def create_app() -> APIFlask:
     configure_app(app)
     register_blueprints(app)
     register_index(app)
-    register_search_client(app)
+
+    if defer_clients:
+        # Anything built now is shared with every worker forked
+        # afterwards, rather than each worker building its own
+        build_openapi_spec(app)
+    else:
+        register_search_client(app)
 
     return app
 
 
+def register_clients(app: APIFlask) -> None:
+    """
+    Create the clients of an app made by create_app(defer_clients=True)
+    """
+    register_db_client(app)
+    register_search_client(app)
+
+
 def setup_logging(app: APIFlask) -> None:
     src.logging.init(__package__)
     flask_logger.init_app(logging.root, app)
@@ -91,7 +118,11 @@ def configure_app(app: APIFlask) -> None:
     # Set a few values for the Swagger endpoint
     app.config["OPENAPI_VERSION"] = "3.1.0"
 
-    app.json.compact = False  # type: ignore
+    if app_config.use_orjson_json_provider:
+        app.json = OrjsonProvider(app)
+    app.json.compact = app_config.compact_json_responses  # type: ignore
+
+    app.config["CACHE_CONTROL_MAX_AGE"] = app_config.cache_control_max_age
 
     # Set various general OpenAPI config values
     app.info = {
@@ -113,6 +144,13 @@ def configure_app(app: APIFlask) -> None:
         return restructure_error_response(error)
 
 
+def build_openapi_spec(app: APIFlask) -> dict | str:
+    # Getting app.spec builds the spec, which APIFlask then caches and serves
+    # from, rather than building it the first time the spec is requested
+    with app.app_context():
+        return app.spec
+
+
 def register_blueprints(app: APIFlask) -> None:
     app.register_blueprint(healthcheck_blueprint)
     app.register_blueprint(opportunities_v0_blueprint)
@@ -13,3 +13,29 @@ class AppConfig(PydanticBaseEnvConfig):
     # For the OpenAPI docs, set whether the auth tokens are stored
     # across refreshes of the page. Currently we only set this to true locally
     persist_authorization_openapi: bool = False
+
+    # Whether JSON responses leave out the indentation and newlines
+    # that make them readable, which makes them a fair bit smaller
+    compact_json_responses: bool = False
+
+    # Whether to encode JSON responses with orjson, which is much faster for large
+    # responses, see OrjsonProvider
+    use_orjson_json_provider: bool = False
+
+    # How many seconds clients and CDNs can cache responses with
+    # an ETag for, before revalidating them with the API
+    cache_control_max_age: int = 60
+
+    # Whether gunicorn creates the app once in its master process and then forks
+    # the workers from it, rather than each worker creating its own. The workers
+    # start faster, and share the memory of everything loaded before the fork.
+    # See gunicorn.conf.py
+    preload_app: bool = False
+
+    # Whether gunicorn runs gevent workers, which each handle many requests at once by
+    # switching between them while they wait on the DB or OpenSearch, rather than a
+    # few threads. See documentation/api/gunicorn-workers.md
+    use_gevent_workers: bool = False
+
+    # With gevent workers, the most requests each worker handles at once
+    gevent_worker_connections: int = 100
@@ -7,6 +7,7 @@ import flask
 from apiflask import HTTPTokenAuth
 
 from src.api.route_utils import raise_flask_error
+from src.auth.rate_limit import check_rate_limit
 from src.logging.flask_logger import add_extra_data_to_current_request_logs
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,9 @@ def verify_token(token: str) -> User:
 
     logger.info("Authentication successful")
 
+    # Counts every authenticated request against the budget of the API key
+    check_rate_limit(user.username)
+
     return user
 
 
@@ -0,0 +1,188 @@
+"""
+This module limits how many requests each API key can make, with token buckets.
+
+Each API key has a bucket of tokens for each RateLimitBucket. A request takes
+a token from the bucket, and the bucket refills at a steady rate up to its
+capacity. When the bucket is empty, the request gets a 429 response with a
+Retry-After header saying how long until the next token.
+
+Every authenticated request takes a token from the DEFAULT bucket, and expensive
+searches also take one from the smaller EXPENSIVE_SEARCH bucket, so a single
+key can't monopolize the workers or the search index with them.
+
+The buckets are kept in a RateLimitStore. By default that's in memory, so each
+worker process limits the requests it handles separately. A store shared between
+processes can be used instead with register_rate_limiter:
+
+    rate_limit.register_rate_limiter(rate_limit.RateLimiter(store=MyStore()), app)
+"""
+import abc
+import dataclasses
+import logging
+import math
+import threading
+import time
+from enum import StrEnum
+
+from flask import Flask, current_app
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from src.api.route_utils import raise_flask_error
+from src.logging.flask_logger import add_extra_data_to_current_request_logs
+from src.util.env_config import PydanticBaseEnvConfig
+
+logger = logging.getLogger(__name__)
+
+_RATE_LIMITER_KEY = "rate-limiter"
+
+
+class RateLimitConfig(PydanticBaseEnvConfig):
+    model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_")
+
+    enabled: bool = Field(default=False)  # RATE_LIMIT_ENABLED
+
+    # Every request with an API key takes a token from this bucket
+    capacity: int = Field(default=120)  # RATE_LIMIT_CAPACITY
+    refill_per_second: float = Field(default=2, gt=0)  # RATE_LIMIT_REFILL_PER_SECOND
+
+    # Expensive searches also take a token from this bucket
+    expensive_search_capacity: int = Field(default=10)  # RATE_LIMIT_EXPENSIVE_SEARCH_CAPACITY
+    expensive_search_refill_per_second: float = Field(
+        default=0.1, gt=0
+    )  # RATE_LIMIT_EXPENSIVE_SEARCH_REFILL_PER_SECOND
+
+    # A search is expensive if it returns a CSV, has a larger page size
+    # than this, or filters on more values than this in total
+    expensive_search_page_size: int = Field(default=100)  # RATE_LIMIT_EXPENSIVE_SEARCH_PAGE_SIZE
+    expensive_search_filter_values: int = Field(
+        default=20
+    )  # RATE_LIMIT_EXPENSIVE_SEARCH_FILTER_VALUES
+
+
+class RateLimitBucket(StrEnum):
+    DEFAULT = "default"
+    EXPENSIVE_SEARCH = "expensive_search"
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimitResult:
+    is_allowed: bool
+    # The tokens left in the bucket after this request
+    remaining: int
+    # If not allowed, how long until the bucket has a token again
+    retry_after_seconds: float
+
+
+class RateLimitStore(abc.ABC, metaclass=abc.ABCMeta):
+    """Keeps the token bucket for each key.
+
+    take_token must check and update the bucket atomically, as
+    requests with the same API key can be handled at the same time.
+    """
+
+    @abc.abstractmethod
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> RateLimitResult:
+        raise NotImplementedError()
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Keeps the token buckets in memory, separately in each process"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # The tokens in each bucket, and when they were last counted from time.monotonic()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> RateLimitResult:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            is_allowed = tokens >= 1
+            retry_after_seconds = 0.0
+            if is_allowed:
+                tokens -= 1
+            else:
+                retry_after_seconds = (1 - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+
+        return RateLimitResult(
+            is_allowed=is_allowed,
+            remaining=math.floor(tokens),
+            retry_after_seconds=retry_after_seconds,
+        )
+
+
+class RateLimiter:
+    def __init__(
+        self, config: RateLimitConfig | None = None, store: RateLimitStore | None = None
+    ) -> None:
+        if config is None:
+            config = RateLimitConfig()
+        if store is None:
+            store = InMemoryRateLimitStore()
+
+        self.config = config
+        self.store = store
+
+    def take_token(self, username: str, bucket: RateLimitBucket) -> RateLimitResult:
+        if bucket == RateLimitBucket.EXPENSIVE_SEARCH:
+            capacity = self.config.expensive_search_capacity
+            refill_per_second = self.config.expensive_search_refill_per_second
+        else:
+            capacity = self.config.capacity
+            refill_per_second = self.config.refill_per_second
+
+        # Keyed by the username rather than the API key itself,
+        # so the key isn't kept anywhere else, like a shared store
+        return self.store.take_token(f"{bucket}:{username}", capacity, refill_per_second)
+
+    def is_expensive_search(self, page_size: int, is_csv: bool, filter_value_count: int) -> bool:
+        return (
+            is_csv
+            or page_size > self.config.expensive_search_page_size
+            or filter_value_count > self.config.expensive_search_filter_values
+        )
+
+
+def register_rate_limiter(rate_limiter: RateLimiter, app: Flask) -> None:
+    app.extensions[_RATE_LIMITER_KEY] = rate_limiter
+
+
+def get_rate_limiter(app: Flask) -> RateLimiter:
+    rate_limiter = app.extensions.get(_RATE_LIMITER_KEY)
+
+    if rate_limiter is None:
+        # Made on first use, so an app that doesn't register
+        # one gets an in-memory store configured from the env
+        rate_limiter = app.extensions.setdefault(_RATE_LIMITER_KEY, RateLimiter())
+
+    return rate_limiter
+
+
+def check_rate_limit(username: str, bucket: RateLimitBucket = RateLimitBucket.DEFAULT) -> None:
+    """
+    Take a token from the bucket of the API key for the current request,
+    raising a 429 error if there are none left.
+
+    How many tokens are left is added to the request logs, so
+    the usage of each API key can be found from them.
+    """
+    rate_limiter = get_rate_limiter(current_app)
+    if not rate_limiter.config.enabled:
+        return
+
+    result = rate_limiter.take_token(username, bucket)
+    add_extra_data_to_current_request_logs({f"rate_limit.{bucket}.remaining": result.remaining})
+
+    if not result.is_allowed:
+        add_extra_data_to_current_request_logs({"rate_limit.exceeded_bucket": str(bucket)})
+        logger.warning("Rate limit exceeded")
+        raise_flask_error(
+            429,
+            "Too many requests, please try again later",
+            headers={"Retry-After": str(math.ceil(result.retry_after_seconds))},
+        )
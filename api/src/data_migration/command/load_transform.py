@@ -11,6 +11,7 @@ import src.adapters.db.flask_db as flask_db
 import src.db.foreign
 import src.db.models.staging
 from src.task.opportunities.set_current_opportunities_task import SetCurrentOpportunitiesTask
+from src.task.opportunities.update_opportunity_documents_task import UpdateOpportunityDocumentsTask
 
 from ..data_migration_blueprint import data_migration_blueprint
 from ..load.load_oracle_data_task import LoadOracleDataTask
@@ -27,12 +28,22 @@ logger = logging.getLogger(__name__)
 @click.option(
     "--set-current/--no-set-current", default=True, help="run SetCurrentOpportunitiesTask"
 )
+@click.option(
+    "--update-documents/--no-update-documents",
+    default=True,
+    help="run UpdateOpportunityDocumentsTask",
+)
 @click.option(
     "--insert-chunk-size", default=4000, help="chunk size for load inserts", show_default=True
 )
 @flask_db.with_db_session()
 def load_transform(
-    db_session: db.Session, load: bool, transform: bool, set_current: bool, insert_chunk_size: int
+    db_session: db.Session,
+    load: bool,
+    transform: bool,
+    set_current: bool,
+    update_documents: bool,
+    insert_chunk_size: int,
 ) -> None:
     logger.info("load and transform start")
 
@@ -45,5 +56,7 @@ def load_transform(
         TransformOracleDataTask(db_session).run()
     if set_current:
         SetCurrentOpportunitiesTask(db_session).run()
+    if update_documents:
+        UpdateOpportunityDocumentsTask(db_session).run()
 
     logger.info("load and transform complete")
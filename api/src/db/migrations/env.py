@@ -18,6 +18,8 @@ config = context.config
 
 logger = logging.getLogger("migrations")
 
+MIGRATION_ONLY_INDEXES = {"opportunity_opportunity_number_trgm_idx"}
+
 # Initialize logging
 with src.logging.init("migrations"):
     # add your model's MetaData object here
@@ -51,6 +53,10 @@ with src.logging.init("migrations"):
             return False
         if type_ == "table" and getattr(object, "schema", None) == Schemas.LEGACY:
             return False
+        if type_ == "index" and name in MIGRATION_ONLY_INDEXES:
+            # Indexes that are only created by a migration when the
+            # database supports them, and so aren't defined on the models
+            return False
         else:
             return True
 
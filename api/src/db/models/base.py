@@ -56,7 +56,10 @@ class Base(DeclarativeBase):
         return cls.__tablename__
 
     def _dict(self) -> dict:
-        return {c.key: getattr(self, c.key) for c in inspect(self).mapper.column_attrs}
+        # Deferred columns are skipped, as accessing them would query the DB
+        return {
+            c.key: getattr(self, c.key) for c in inspect(self).mapper.column_attrs if not c.deferred
+        }
 
     def for_json(self) -> dict:
         json_valid_dict = {}
@@ -74,9 +77,8 @@ class Base(DeclarativeBase):
     def copy(self, **kwargs: dict[str, Any]) -> "Base":
         # TODO - Python 3.11 will let us make the return Self instead
         table = self.__table__
-        non_pk_columns = [
-            k for k in table.columns.keys() if k not in table.primary_key.columns.keys()  # type: ignore
-        ]
+        # Generated columns can't be set, the DB computes them
+        non_pk_columns = [c.key for c in table.columns if not c.primary_key and c.computed is None]
         data = {c: getattr(self, c) for c in non_pk_columns}
         data.update(kwargs)
         copy = self.__class__(**data)
@@ -1,7 +1,8 @@
 import dataclasses
 from abc import ABC, ABCMeta, abstractmethod
 from enum import IntEnum, StrEnum
-from typing import Generic, Optional, Tuple, Type, TypeVar
+from types import MappingProxyType
+from typing import Generic, Iterable, Mapping, Optional, Tuple, Type, TypeVar
 
 T = TypeVar("T", StrEnum, IntEnum)
 
@@ -47,6 +48,11 @@ class LookupConfig(Generic[T]):
     _enum_to_lookup_map: dict[T, Lookup]
     _int_to_lookup_map: dict[int, Lookup]
 
+    # Direct mappings between the enums and lookup ints, these are what get used
+    # when converting values of a LookupColumn so are made once up front
+    _enum_to_int_map: Mapping[T, int]
+    _int_to_enum_map: Mapping[int, T]
+
     def __init__(self, lookups: list[Lookup]) -> None:
         enum_types_seen: set[Type[T]] = set()
         _enum_to_lookup_map: dict[T, Lookup] = {}
@@ -88,6 +94,13 @@ class LookupConfig(Generic[T]):
         self._enum_to_lookup_map: dict[T, Lookup] = _enum_to_lookup_map
         self._int_to_lookup_map: dict[int, Lookup] = _int_to_lookup_map
 
+        self._enum_to_int_map = MappingProxyType(
+            {lookup.lookup_enum: lookup.lookup_val for lookup in lookups}
+        )
+        self._int_to_enum_map = MappingProxyType(
+            {lookup.lookup_val: lookup.lookup_enum for lookup in lookups}
+        )
+
     def get_enums(self) -> Tuple[Type[T], ...]:
         return self._enums
 
@@ -98,11 +111,7 @@ class LookupConfig(Generic[T]):
         """
         Given an enum, get the lookup int for it in the DB
         """
-        lookup = self._enum_to_lookup_map.get(e)
-        if lookup is None:
-            return None
-
-        return lookup.lookup_val
+        return self._enum_to_int_map.get(e)
 
     def get_lookup_for_int(self, num: int) -> Optional[Lookup]:
         """
@@ -114,7 +123,34 @@ class LookupConfig(Generic[T]):
         """
         Given a lookup int, get the enum for it (via the lookup object)
         """
-        lookup = self.get_lookup_for_int(num)
-        if lookup is None:
-            return None
-        return lookup.lookup_enum
+        return self._int_to_enum_map.get(num)
+
+    def get_ints_for_enums(self, enums: Iterable[T | None]) -> list[int | None]:
+        """
+        Given several enums, get the lookup ints for them in the DB, in the same order
+
+        Meant for converting many values at once, None and any unmapped enums become None.
+        """
+        enum_to_int_map = self._enum_to_int_map
+        return [None if e is None else enum_to_int_map.get(e) for e in enums]
+
+    def get_enums_for_ints(self, nums: Iterable[int | None]) -> list[T | None]:
+        """
+        Given several lookup ints, get the enums for them, in the same order
+
+        Meant for converting many values at once, None and any unmapped ints become None.
+        """
+        int_to_enum_map = self._int_to_enum_map
+        return [None if num is None else int_to_enum_map.get(num) for num in nums]
+
+    def get_enum_to_int_map(self) -> Mapping[T, int]:
+        """
+        Get an immutable mapping of each enum to its lookup int
+        """
+        return self._enum_to_int_map
+
+    def get_int_to_enum_map(self) -> Mapping[int, T]:
+        """
+        Get an immutable mapping of each lookup int to its enum
+        """
+        return self._int_to_enum_map
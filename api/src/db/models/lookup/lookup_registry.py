@@ -1,6 +1,6 @@
 import logging
 from enum import Enum, IntEnum, StrEnum
-from typing import Any, Callable, Type, TypeVar
+from typing import Any, Callable, Iterable, Type, TypeVar
 
 from src.db.models.lookup.lookup import LookupConfig
 from src.db.models.lookup.lookup_table import LookupTable
@@ -39,7 +39,10 @@ class LookupRegistry:
         return decorator
 
     @classmethod
-    def _get_lookup_config(cls, lookup_table: Type[LookupTable]) -> LookupConfig:
+    def get_lookup_config(cls, lookup_table: Type[LookupTable]) -> LookupConfig:
+        """
+        Get the lookup config registered for a Lookup Table
+        """
         lookup_config = cls._lookup_registry.get(lookup_table)
         if lookup_config is None:
             raise Exception(
@@ -57,7 +60,7 @@ class LookupRegistry:
         if lookup_enum is None:
             return None
 
-        lookup_config = cls._get_lookup_config(lookup_table)
+        lookup_config = cls.get_lookup_config(lookup_table)
 
         return lookup_config.get_int_for_enum(lookup_enum)
 
@@ -71,10 +74,34 @@ class LookupRegistry:
         if lookup_val is None:
             return None
 
-        lookup_config = cls._get_lookup_config(lookup_table)
+        lookup_config = cls.get_lookup_config(lookup_table)
 
         return lookup_config.get_enum_for_int(lookup_val)
 
+    @classmethod
+    def get_lookup_ints_for_enums(
+        cls, lookup_table: Type[LookupTable], lookup_enums: Iterable[StrEnum | IntEnum | None]
+    ) -> list[int | None]:
+        """
+        Given a Lookup Table + several Enums, get the lookup int values to store in the DB
+
+        The same as calling get_lookup_int_for_enum for each, but only fetches
+        the lookup config once, for loaders converting many values at a time.
+        """
+        return cls.get_lookup_config(lookup_table).get_ints_for_enums(lookup_enums)
+
+    @classmethod
+    def get_enums_for_lookup_ints(
+        cls, lookup_table: Type[LookupTable], lookup_vals: Iterable[int | None]
+    ) -> list[Enum | None]:
+        """
+        Given a Lookup Table + several lookup ints, get the enums that are mapped to them
+
+        The same as calling get_enum_for_lookup_int for each, but only fetches
+        the lookup config once, for loaders converting many values at a time.
+        """
+        return cls.get_lookup_config(lookup_table).get_enums_for_ints(lookup_vals)
+
     @classmethod
     def is_valid_type_for_table(
         cls, lookup_table: Type[LookupTable], lookup_val: Any | None
@@ -89,7 +116,7 @@ class LookupRegistry:
         if lookup_val is None:
             return True
 
-        lookup_config = cls._get_lookup_config(lookup_table)
+        lookup_config = cls.get_lookup_config(lookup_table)
 
         return isinstance(lookup_val, lookup_config.get_enums())
 
@@ -1,6 +1,7 @@
 from datetime import date
 
-from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, Computed, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,6 +26,13 @@ from src.db.models.lookup_models import (
 class Opportunity(ApiSchemaTable, TimestampMixin):
     __tablename__ = "opportunity"
 
+    __table_args__ = (
+        Index("opportunity_search_vector_idx", "search_vector", postgresql_using="gin"),
+        # Need to define the table args like this to inherit whatever we set on the super table
+        # otherwise we end up overwriting things and Alembic remakes the whole table
+        ApiSchemaTable.__table_args__,
+    )
+
     opportunity_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
     opportunity_number: Mapped[str | None]
@@ -45,6 +53,19 @@ class Opportunity(ApiSchemaTable, TimestampMixin):
     revision_number: Mapped[int | None]
     modified_comments: Mapped[str | None]
 
+    # A weighted full-text search vector of the opportunity, maintained by Postgres.
+    # Deferred so it's only loaded if explicitly requested, it's only used for querying.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(opportunity_title, '')), 'A')"
+            " || setweight(to_tsvector('english', coalesce(opportunity_number, '')), 'A')"
+            " || setweight(to_tsvector('english', coalesce(agency, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # These presumably refer to the TUSER_ACCOUNT, and TUSER_PROFILE tables
     # although the legacy DB does not have them setup as foreign keys
     publisher_user_id: Mapped[str | None]
@@ -103,6 +124,14 @@ class OpportunitySummary(ApiSchemaTable, TimestampMixin):
         UniqueConstraint(
             "is_forecast", "revision_number", "opportunity_id", postgresql_nulls_not_distinct=True
         ),
+        Index("opportunity_summary_search_vector_idx", "search_vector", postgresql_using="gin"),
+        # For fetching the versions of an opportunity, most recent first
+        Index(
+            "opportunity_summary_opportunity_id_version_idx",
+            "opportunity_id",
+            "is_forecast",
+            "version_number",
+        ),
         # Need to define the table args like this to inherit whatever we set on the super table
         # otherwise we end up overwriting things and Alembic remakes the whole table
         ApiSchemaTable.__table_args__,
@@ -117,6 +146,16 @@ class OpportunitySummary(ApiSchemaTable, TimestampMixin):
 
     summary_description: Mapped[str | None]
 
+    # See Opportunity.search_vector
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(summary_description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     is_cost_sharing: Mapped[bool | None]
     is_forecast: Mapped[bool]
 
@@ -230,6 +269,17 @@ class OpportunitySummary(ApiSchemaTable, TimestampMixin):
 class OpportunityAssistanceListing(ApiSchemaTable, TimestampMixin):
     __tablename__ = "opportunity_assistance_listing"
 
+    __table_args__ = (
+        Index(
+            "opportunity_assistance_listing_search_vector_idx",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # Need to define the table args like this to inherit whatever we set on the super table
+        # otherwise we end up overwriting things and Alembic remakes the whole table
+        ApiSchemaTable.__table_args__,
+    )
+
     opportunity_assistance_listing_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
     opportunity_id: Mapped[int] = mapped_column(
@@ -240,6 +290,16 @@ class OpportunityAssistanceListing(ApiSchemaTable, TimestampMixin):
     assistance_listing_number: Mapped[str | None]
     program_title: Mapped[str | None]
 
+    # See Opportunity.search_vector
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(program_title, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     updated_by: Mapped[str | None]
     created_by: Mapped[str | None]
 
@@ -369,3 +429,27 @@ class CurrentOpportunitySummary(ApiSchemaTable, TimestampMixin):
         ForeignKey(LkOpportunityStatus.opportunity_status_id),
         index=True,
     )
+
+
+class OpportunityDocument(ApiSchemaTable, TimestampMixin):
+    """
+    An opportunity serialized the same way the API returns it, so it can be
+    read with a single lookup rather than loading the opportunity and all of
+    its related records. This is maintained by the UpdateOpportunityDocumentsTask.
+
+    The document version is the ETag of the opportunity it was serialized from,
+    if that doesn't match the current ETag of the opportunity, the document is out of date.
+    """
+
+    __tablename__ = "opportunity_document"
+
+    opportunity_id: Mapped[int] = mapped_column(
+        BigInteger,
+        # The documents are only derived from the opportunity, so they can
+        # always be deleted along with it
+        ForeignKey(Opportunity.opportunity_id, ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    document: Mapped[dict] = mapped_column(JSONB)
+    document_version: Mapped[str]
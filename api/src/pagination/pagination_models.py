@@ -43,6 +43,10 @@ class PaginationParams(BaseModel):
     order_by: str
     sort_direction: SortDirection
 
+    # The next_cursor of a prior page, if set the page
+    # after it is fetched and the page_offset is ignored
+    cursor: str | None = None
+
     @property
     def is_ascending(self) -> bool:
         return self.sort_direction == SortDirection.ASCENDING
@@ -59,6 +63,11 @@ class PaginationInfo:
     total_records: int
     total_pages: int
 
+    next_cursor: str | None = None
+
+    # Endpoints may estimate the totals rather than count every record
+    is_total_records_approximate: bool = False
+
     @classmethod
     def from_pagination_params(
         cls, pagination_params: PaginationParams, paginator: Paginator
@@ -70,6 +79,8 @@ class PaginationInfo:
             sort_direction=pagination_params.sort_direction,
             total_records=paginator.total_records,
             total_pages=paginator.total_pages,
+            next_cursor=paginator.next_cursor,
+            is_total_records_approximate=not paginator.is_total_records_exact,
         )
 
     @classmethod
@@ -83,4 +94,5 @@ class PaginationInfo:
             sort_direction=pagination_params.sorting.sort_direction,
             total_records=paginator.total_records,
             total_pages=paginator.total_pages,
+            is_total_records_approximate=not paginator.is_total_records_exact,
         )
@@ -62,12 +62,15 @@ def generate_sorting_schema(
     return Schema.from_dict(ordering_schema_fields, name=cls_name)  # type: ignore
 
 
-def generate_pagination_schema(cls_name: str, order_by_fields: list[str]) -> Type[Schema]:
+def generate_pagination_schema(
+    cls_name: str, order_by_fields: list[str], include_cursor: bool = False
+) -> Type[Schema]:
     """
     Generate a schema that describes the pagination for a pagination endpoint.
 
         cls_name will be what the model is named internally by Marshmallow and what OpenAPI shows.
         order_by_fields can be a list of fields that the endpoint allows you to sort the response by
+        include_cursor adds an optional cursor field for endpoints that support keyset pagination
 
     This is functionally equivalent to specifying your own class like so:
 
@@ -120,6 +123,14 @@ def generate_pagination_schema(cls_name: str, order_by_fields: list[str]) -> Typ
             },
         ),
     }
+
+    if include_cursor:
+        pagination_schema_fields["cursor"] = fields.String(
+            metadata={
+                "description": "The next_cursor from the pagination info of the prior page, to fetch the page after it. Fetching pages by cursor stays fast no matter how deep the page is. If provided, the page_offset is ignored.",
+            },
+        )
+
     return Schema.from_dict(pagination_schema_fields, name=cls_name)  # type: ignore
 
 
@@ -138,6 +149,12 @@ class PaginationInfoSchema(Schema):
     total_pages = fields.Integer(
         metadata={"description": "The total number of pages that can be fetched", "example": 2}
     )
+    is_total_records_approximate = fields.Boolean(
+        metadata={
+            "description": "Whether the total_records and total_pages are an estimate rather than an exact count",
+            "example": False,
+        }
+    )
     order_by = fields.String(
         metadata={"description": "The field that the records were sorted by", "example": "id"}
     )
@@ -145,3 +162,9 @@ class PaginationInfoSchema(Schema):
         SortDirection,
         metadata={"description": "The direction the records are sorted"},
     )
+    next_cursor = fields.String(
+        allow_none=True,
+        metadata={
+            "description": "A cursor that can be passed in the next request to fetch the page after this one, only set by endpoints that support it when there may be more records",
+        },
+    )
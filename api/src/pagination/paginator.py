@@ -1,17 +1,64 @@
+import base64
+import json
 import math
-from typing import Generic, Sequence, Type, TypeVar
+from datetime import date, datetime
+from enum import StrEnum
+from typing import Any, Generic, Sequence, Type, TypeVar
 
-from sqlalchemy import Select, func, inspect
+from sqlalchemy import ColumnElement, Select, and_, func, inspect, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 import src.adapters.db as db
 from src.db.models.base import Base
 
 DEFAULT_PAGE_SIZE = 25
 
+# The most records the CAPPED count strategy will count, and
+# the fewest the ESTIMATED count strategy will estimate
+DEFAULT_MAX_COUNT = 10_000
+
 
 T = TypeVar("T", bound=Base)
 
 
+class InvalidCursorError(Exception):
+    pass
+
+
+class CountStrategy(StrEnum):
+    """
+    How the paginator determines the total number of records
+    """
+
+    # Run a separate count(DISTINCT <primary key>) query when the paginator is created
+    EXACT = "exact"
+
+    # Count the records with count(*) OVER () in the same query that fetches
+    # the page, so the filters and joins of the query only run once.
+    # This counts rows, not distinct records, so it should only be used for
+    # queries that return one row per record (ie. no joins to one-to-many tables)
+    WINDOW = "window"
+
+    # Count at most max_count records, so a query matching a huge number of
+    # records doesn't need to scan all of them just to count them
+    CAPPED = "capped"
+
+    # Use the number of records the Postgres query planner estimates the query
+    # will return. If the estimate is under max_count, the records are counted exactly instead.
+    # Best suited to unfiltered or lightly filtered queries, where the estimates are
+    # more accurate, and the exact count would need to scan the most records.
+    ESTIMATED = "estimated"
+
+    # Don't count the records. The total is only a lower bound of the records
+    # up to the page that was fetched, plus one if there are more after it.
+    # If the page is past the last one, or is fetched after a cursor,
+    # the total is left at zero.
+    NONE = "none"
+
+
 class Paginator(Generic[T]):
     """
     DB select statement paginator that helps with setting up queries
@@ -36,10 +83,46 @@ class Paginator(Generic[T]):
         paginator: Paginator[Opportunity] = Paginator(stmt, db_session, page_size=10)
         users: list[Opportunity] = paginator.page_at(page_offset=2)
 
+    Keyset pagination
+    -----------------
+    Fetching a page by its offset requires the DB to scan and throw away every
+    record on the prior pages, so deep pages get slower and slower. If the column
+    the query is sorted by is passed in as the sort_column, each page fetched will also
+    set a next_cursor which can be passed to page_after to fetch the following page
+    by seeking directly to it instead::
+
+        # The query must be sorted by the sort column, and then the primary key
+        # in the same direction, with any null values sorted last
+        stmt = select(Opportunity).order_by(
+            nulls_last(desc(Opportunity.agency)), desc(Opportunity.opportunity_id)
+        )
+
+        paginator = Paginator(
+            Opportunity, stmt, db_session, sort_column=Opportunity.agency, is_ascending=False
+        )
+        first_page = paginator.page_at(page_offset=1)
+        second_page = paginator.page_after(paginator.next_cursor)
+
+    Counting
+    --------
+    By default the total number of records is counted with a separate query, which
+    needs to run all the same joins and filters as the page query. See CountStrategy
+    for the alternatives. For the WINDOW and NONE strategies, the total_records and
+    total_pages are only set once a page has been fetched, and is_total_records_exact
+    is set to False whenever the total is not the exact count.
     """
 
     def __init__(
-        self, table_model: Type[Base], stmt: Select, db_session: db.Session, page_size: int = 25
+        self,
+        table_model: Type[Base],
+        stmt: Select,
+        db_session: db.Session,
+        page_size: int = 25,
+        *,
+        sort_column: InstrumentedAttribute | ColumnElement | None = None,
+        is_ascending: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        max_count: int = DEFAULT_MAX_COUNT,
     ):
         self.table_model = table_model
         self.stmt = stmt
@@ -50,25 +133,197 @@ class Paginator(Generic[T]):
 
         self.page_size = page_size
 
-        self.total_records = _get_record_count(self.table_model, self.db_session, self.stmt)
-        self.total_pages = int(math.ceil(self.total_records / self.page_size))
+        self.sort_column = sort_column
+        self.is_ascending = is_ascending
+        self.primary_key = inspect(table_model).primary_key[0]
+
+        # Set when fetching a page if keyset pagination is setup and
+        # there may be more records after the page that was fetched
+        self.next_cursor: str | None = None
+
+        self.count_strategy = count_strategy
+        self.max_count = max_count
+
+        self.total_records = 0
+        self.total_pages = 0
+        self.is_total_records_exact = True
+
+        if count_strategy == CountStrategy.EXACT:
+            self._set_total_records(self._count_records())
+        elif count_strategy == CountStrategy.CAPPED:
+            record_count = _get_capped_record_count(
+                self.table_model, self.db_session, self.stmt, self.max_count
+            )
+            self._set_total_records(
+                min(record_count, self.max_count), is_exact=record_count <= self.max_count
+            )
+        elif count_strategy == CountStrategy.ESTIMATED:
+            estimated_count = _get_estimated_record_count(
+                self.table_model, self.db_session, self.stmt
+            )
+            if estimated_count < self.max_count:
+                self._set_total_records(self._count_records())
+            else:
+                self._set_total_records(estimated_count, is_exact=False)
 
     def page_at(self, page_offset: int) -> Sequence[T]:
         """
         Get a specific page for pagination
         """
-        if page_offset <= 0 or page_offset > self.total_pages:
+        if page_offset <= 0:
+            return []
+
+        # If the records were already counted exactly, we know if the page is past the end
+        if (
+            self._is_counted_upfront()
+            and self.is_total_records_exact
+            and page_offset > self.total_pages
+        ):
             return []
 
         offset = self.page_size * (page_offset - 1)
 
-        return (
-            self.db_session.execute(self.stmt.offset(offset).limit(self.page_size))
-            .unique()
-            .scalars()
-            .all()
+        return self._fetch_page(self.stmt.offset(offset), offset)
+
+    def page_after(self, cursor: str) -> Sequence[T]:
+        """
+        Get the page of records that come after the cursor of a prior page
+        """
+        if self.sort_column is None:
+            raise ValueError("A sort column is required for keyset pagination")
+
+        sort_value, primary_key_value = decode_cursor(cursor, self.sort_column)
+
+        # A window count would only count the records after the cursor, not every record
+        if self.count_strategy == CountStrategy.WINDOW:
+            self._set_total_records(self._count_records())
+
+        stmt = self.stmt.where(self._get_keyset_filter(sort_value, primary_key_value))
+        return self._fetch_page(stmt, offset=None)
+
+    def _is_counted_upfront(self) -> bool:
+        return self.count_strategy in (
+            CountStrategy.EXACT,
+            CountStrategy.CAPPED,
+            CountStrategy.ESTIMATED,
         )
 
+    def _fetch_page(self, stmt: Select, offset: int | None) -> Sequence[T]:
+        # The offset is None when fetching a page after a cursor
+        limit = self.page_size
+        if self.count_strategy == CountStrategy.NONE:
+            # Fetch an extra record to know whether there are any after this page
+            limit += 1
+
+        stmt = stmt.limit(limit)
+
+        # Each row is the record, followed by any of these additional columns
+        is_window_count = self.count_strategy == CountStrategy.WINDOW and offset is not None
+        if is_window_count:
+            stmt = stmt.add_columns(func.count().over())
+        if self.sort_column is not None:
+            # The values the cursor is built from
+            stmt = stmt.add_columns(self.sort_column, self.primary_key)
+
+        rows = self.db_session.execute(stmt).unique().all()
+
+        if self.count_strategy == CountStrategy.NONE:
+            has_more_records = len(rows) > self.page_size
+            rows = rows[: self.page_size]
+
+            if offset is None:
+                # After a cursor, the rows only tell us about the records after it,
+                # and how many records come before the cursor isn't known
+                self._set_total_records(0, is_exact=False)
+            elif len(rows) > 0 or offset == 0:
+                # The total is only known if this page has the last record
+                self._set_total_records(
+                    offset + len(rows) + int(has_more_records),
+                    is_exact=not has_more_records,
+                )
+            else:
+                # Past the last page, so we only know there are fewer than offset
+                # records. Leave the total unset rather than report that as a count.
+                self._set_total_records(0, is_exact=False)
+        elif is_window_count:
+            if len(rows) > 0:
+                self._set_total_records(rows[0][1])
+            else:
+                # Past the last page, so the query has no rows to get the count from
+                self._set_total_records(self._count_records())
+        elif not self.is_total_records_exact and offset is not None and len(rows) > 0:
+            # The page we fetched can correct a capped or estimated total
+            if len(rows) < self.page_size:
+                self._set_total_records(offset + len(rows))
+            elif offset + len(rows) > self.total_records:
+                self._set_total_records(offset + len(rows), is_exact=False)
+
+        # A page smaller than the page size is the last page
+        if self.sort_column is not None and len(rows) == self.page_size:
+            sort_value, primary_key_value = rows[-1][-2:]
+            self.next_cursor = encode_cursor(sort_value, primary_key_value)
+
+        return [row[0] for row in rows]
+
+    def _count_records(self) -> int:
+        return _get_record_count(self.table_model, self.db_session, self.stmt)
+
+    def _set_total_records(self, total_records: int, is_exact: bool = True) -> None:
+        self.total_records = total_records
+        self.total_pages = int(math.ceil(self.total_records / self.page_size))
+        self.is_total_records_exact = is_exact
+
+    def _get_keyset_filter(self, sort_value: Any, primary_key_value: Any) -> ColumnElement[bool]:
+        # Build a filter for the records that come after a given record when
+        # sorting by the sort column and then primary key, with nulls sorted last:
+        #
+        #   WHERE sort_column > :sort_value
+        #       OR (sort_column = :sort_value AND primary_key > :primary_key_value)
+        #       OR sort_column IS NULL
+        #
+        # with the comparisons flipped when sorting descending
+        assert self.sort_column is not None
+
+        def _after(column: Any, value: Any) -> ColumnElement[bool]:
+            return column > value if self.is_ascending else column < value
+
+        # Everything with a null value was sorted after the non-null values
+        if sort_value is None:
+            return and_(self.sort_column.is_(None), _after(self.primary_key, primary_key_value))
+
+        return or_(
+            _after(self.sort_column, sort_value),
+            and_(self.sort_column == sort_value, _after(self.primary_key, primary_key_value)),
+            self.sort_column.is_(None),
+        )
+
+
+def encode_cursor(sort_value: Any, primary_key_value: Any) -> str:
+    """
+    Build an opaque cursor of a record's position in the sort order
+    """
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+
+    return base64.urlsafe_b64encode(json.dumps([sort_value, primary_key_value]).encode()).decode()
+
+
+def decode_cursor(
+    cursor: str, sort_column: InstrumentedAttribute | ColumnElement
+) -> tuple[Any, Any]:
+    """
+    Parse a cursor built by encode_cursor, raising an InvalidCursorError if it isn't valid
+    """
+    try:
+        sort_value, primary_key_value = json.loads(base64.urlsafe_b64decode(cursor))
+
+        if sort_value is not None and sort_column.type.python_type in (date, datetime):
+            sort_value = sort_column.type.python_type.fromisoformat(sort_value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    return sort_value, primary_key_value
+
 
 def _get_record_count(table_model: Type[Base], db_session: db.Session, stmt: Select) -> int:
     # Simplify the query to instead be select count(DISTINCT(<primary key>)) from <whatever the query was>
@@ -80,3 +335,53 @@ def _get_record_count(table_model: Type[Base], db_session: db.Session, stmt: Sel
         func.count(primary_key.distinct()), maintain_column_froms=True
     )
     return db_session.execute(count_stmt).scalar_one()
+
+
+def _get_capped_record_count(
+    table_model: Type[Base], db_session: db.Session, stmt: Select, max_count: int
+) -> int:
+    # Count the distinct primary keys of at most max_count + 1 records, so we know
+    # if there are more than max_count without having to find every record:
+    #
+    #   select count(*) from (select distinct <primary key> from <whatever the query was> limit :max_count + 1)
+    primary_key = inspect(table_model).primary_key[0]
+
+    capped_stmt = (
+        stmt.order_by(None)
+        .with_only_columns(primary_key, maintain_column_froms=True)
+        .distinct()
+        .limit(max_count + 1)
+        .subquery()
+    )
+    return db_session.execute(select(func.count()).select_from(capped_stmt)).scalar_one()
+
+
+def _get_estimated_record_count(
+    table_model: Type[Base], db_session: db.Session, stmt: Select
+) -> int:
+    # Get the number of rows the query planner estimates the query would return, by running:
+    #
+    #   EXPLAIN (FORMAT JSON) select <primary key> from <whatever the query was>
+    #
+    # For a query of an entire table, the planner estimates this from the
+    # row count Postgres keeps for the table (pg_class.reltuples)
+    primary_key = inspect(table_model).primary_key[0]
+
+    explain_stmt = _Explain(
+        stmt.order_by(None).with_only_columns(primary_key, maintain_column_froms=True)
+    )
+    query_plan = db_session.execute(explain_stmt).scalar_one()
+
+    return int(query_plan[0]["Plan"]["Plan Rows"])
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
@@ -0,0 +1,319 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from enum import StrEnum
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+import src.adapters.db as db
+import src.adapters.search as search
+import src.util.file_util as file_util
+import src.util.text_extraction_util as text_extraction_util
+from src.task.task import Task
+from src.util.datetime_util import get_now_us_eastern_datetime
+from src.util.env_config import PydanticBaseEnvConfig
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_INDEX_MAPPINGS = {
+    "properties": {
+        "attachment_id": {"type": "keyword"},
+        "opportunity_id": {"type": "integer"},
+        "file_name": {"type": "keyword"},
+        "file_path": {"type": "keyword", "index": False},
+        "file_size_bytes": {"type": "long"},
+        "last_modified": {"type": "date"},
+        "content": {"type": "text"},
+    }
+}
+
+
+class LoadAttachmentsToIndexConfig(PydanticBaseEnvConfig):
+    model_config = SettingsConfigDict(env_prefix="LOAD_ATTACHMENT_")
+
+    # The local or S3 directory the attachments are stored in. Every attachment
+    # is expected to be stored as <attachment_path>/<opportunity_id>/<file_name>
+    attachment_path: str  # LOAD_ATTACHMENT_ATTACHMENT_PATH
+
+    shard_count: int = Field(default=1)  # LOAD_ATTACHMENT_SHARD_COUNT
+    replica_count: int = Field(default=1)  # LOAD_ATTACHMENT_REPLICA_COUNT
+
+    alias_name: str = Field(default="attachment-index-alias")  # LOAD_ATTACHMENT_ALIAS_NAME
+    index_prefix: str = Field(default="attachment-index")  # LOAD_ATTACHMENT_INDEX_PREFIX
+
+    # The number of processes to extract text with, defaults to the number of CPUs
+    max_workers: int | None = Field(default=None)  # LOAD_ATTACHMENT_MAX_WORKERS
+
+    # Limits for any individual file, files over these are skipped
+    max_file_size_bytes: int = Field(default=25_000_000)  # LOAD_ATTACHMENT_MAX_FILE_SIZE_BYTES
+    file_timeout_seconds: float = Field(default=60)  # LOAD_ATTACHMENT_FILE_TIMEOUT_SECONDS
+
+    batch_size: int = Field(default=100)  # LOAD_ATTACHMENT_BATCH_SIZE
+
+
+class LoadAttachmentsToIndex(Task):
+    """
+    Extract the text of the attachments of opportunities and load them into
+    their own search index, separate from the opportunity index so that the (much slower)
+    attachment processing never holds up loading the opportunities themselves.
+
+    Text extraction is CPU bound, so files are processed in a pool of worker processes.
+
+    An incremental load only processes files that are new, or whose size or last modified
+    timestamp changed since they were loaded, and deletes any attachments that no longer exist.
+    """
+
+    class Metrics(StrEnum):
+        FILES_FOUND = "files_found"
+        FILES_UNCHANGED = "files_unchanged"
+        FILES_SKIPPED_INVALID_PATH = "files_skipped_invalid_path"
+        FILES_SKIPPED_UNSUPPORTED_TYPE = "files_skipped_unsupported_type"
+        FILES_SKIPPED_TOO_LARGE = "files_skipped_too_large"
+        FILES_TIMED_OUT = "files_timed_out"
+        FILES_FAILED = "files_failed"
+        RECORDS_LOADED = "records_loaded"
+        RECORDS_DELETED = "records_deleted"
+
+    def __init__(
+        self,
+        db_session: db.Session,
+        search_client: search.SearchClient,
+        is_full_refresh: bool = True,
+        config: LoadAttachmentsToIndexConfig | None = None,
+    ) -> None:
+        super().__init__(db_session)
+
+        self.search_client = search_client
+        self.is_full_refresh = is_full_refresh
+
+        if config is None:
+            config = LoadAttachmentsToIndexConfig()
+        self.config = config
+
+        if is_full_refresh:
+            current_timestamp = get_now_us_eastern_datetime().strftime("%Y-%m-%d_%H-%M-%S")
+            self.index_name = f"{self.config.index_prefix}-{current_timestamp}"
+        else:
+            self.index_name = self.config.alias_name
+        self.set_metrics({"index_name": self.index_name})
+
+    def run_task(self) -> None:
+        if self.is_full_refresh:
+            logger.info("Running full refresh")
+            self.full_refresh()
+        else:
+            logger.info("Running incremental load")
+            self.incremental_updates_and_deletes()
+
+    def full_refresh(self) -> None:
+        self.search_client.create_index(
+            self.index_name,
+            shard_count=self.config.shard_count,
+            replica_count=self.config.replica_count,
+            mappings=ATTACHMENT_INDEX_MAPPINGS,
+        )
+
+        self.load_files(self.fetch_attachment_files())
+
+        self.search_client.swap_alias_index(
+            self.index_name, self.config.alias_name, delete_prior_indexes=True
+        )
+
+    def incremental_updates_and_deletes(self) -> None:
+        existing_attachments = self.fetch_existing_attachments_in_index()
+        attachment_files = self.fetch_attachment_files()
+
+        files_to_load = {}
+        for attachment_id, file_info in attachment_files.items():
+            if existing_attachments.get(attachment_id) == _get_file_version(file_info):
+                self.increment(self.Metrics.FILES_UNCHANGED)
+            else:
+                files_to_load[attachment_id] = file_info
+
+        self.load_files(files_to_load)
+
+        attachment_ids_to_delete = existing_attachments.keys() - attachment_files.keys()
+        if len(attachment_ids_to_delete) > 0:
+            self.search_client.bulk_delete(self.index_name, attachment_ids_to_delete)
+            self.increment(self.Metrics.RECORDS_DELETED, len(attachment_ids_to_delete))
+
+    def fetch_attachment_files(self) -> dict[str, file_util.FileInfo]:
+        """
+        Find every attachment file, keyed by its attachment ID
+        """
+        attachment_files = {}
+
+        for file_info in file_util.list_files(self.config.attachment_path):
+            self.increment(self.Metrics.FILES_FOUND)
+
+            attachment_id = _get_attachment_id(self.config.attachment_path, file_info)
+            if attachment_id is None:
+                logger.warning(
+                    "Skipping attachment file not stored under an opportunity ID",
+                    extra={"file_path": file_info.path},
+                )
+                self.increment(self.Metrics.FILES_SKIPPED_INVALID_PATH)
+                continue
+
+            attachment_files[attachment_id] = file_info
+
+        return attachment_files
+
+    def fetch_existing_attachments_in_index(self) -> dict[str, str]:
+        """
+        Fetch the ID of every attachment in the index, mapped
+        to the version of the file that was loaded.
+        """
+        if not self.search_client.alias_exists(self.index_name):
+            raise RuntimeError(
+                "Alias %s does not exist, please run the full refresh job before the incremental job"
+                % self.index_name
+            )
+
+        existing_attachments: dict[str, str] = {}
+
+        for response in self.search_client.scroll(
+            self.config.alias_name,
+            {"size": 10000, "_source": ["attachment_id", "file_size_bytes", "last_modified"]},
+            include_scores=False,
+        ):
+            for record in response.records:
+                existing_attachments[record["attachment_id"]] = _get_version(
+                    record["file_size_bytes"], record["last_modified"]
+                )
+
+        return existing_attachments
+
+    def load_files(self, attachment_files: dict[str, file_util.FileInfo]) -> None:
+        """
+        Extract the text of each file in a pool of worker processes, and
+        upsert the results into the search index in batches as they complete.
+        """
+        files_to_process = {}
+        for attachment_id, file_info in attachment_files.items():
+            if not text_extraction_util.is_supported_file(file_info.path):
+                self.increment(self.Metrics.FILES_SKIPPED_UNSUPPORTED_TYPE)
+            elif file_info.size_bytes > self.config.max_file_size_bytes:
+                self.increment(self.Metrics.FILES_SKIPPED_TOO_LARGE)
+            else:
+                files_to_process[attachment_id] = file_info
+
+        max_workers = self.config.max_workers or os.cpu_count() or 1
+        logger.info(
+            "Extracting text from attachment files",
+            extra={"file_count": len(files_to_process), "max_workers": max_workers},
+        )
+
+        # Only keep a couple files per worker queued up at once, so we aren't
+        # holding the extracted text of every file in memory at the same time.
+        max_pending = max_workers * 2
+        pending: dict[Future, str] = {}
+        json_records: list[dict] = []
+
+        # Use spawn rather than fork, as forking a process with open
+        # DB / search connections and threads isn't safe
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for attachment_id, file_info in files_to_process.items():
+                if len(pending) >= max_pending:
+                    json_records.extend(self._process_completed(pending, files_to_process))
+                    json_records = self._upsert_if_full_batch(json_records)
+
+                future = executor.submit(
+                    text_extraction_util.extract_text_with_limits,
+                    file_info.path,
+                    self.config.max_file_size_bytes,
+                    self.config.file_timeout_seconds,
+                )
+                pending[future] = attachment_id
+
+            while len(pending) > 0:
+                json_records.extend(self._process_completed(pending, files_to_process))
+                json_records = self._upsert_if_full_batch(json_records)
+
+        if len(json_records) > 0:
+            self._upsert(json_records)
+
+    def _process_completed(
+        self, pending: dict[Future, str], files_to_process: dict[str, file_util.FileInfo]
+    ) -> list[dict]:
+        done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+
+        json_records = []
+        for future in done:
+            attachment_id = pending.pop(future)
+            file_info = files_to_process[attachment_id]
+            extra = {"attachment_id": attachment_id, "file_path": file_info.path}
+
+            try:
+                content = future.result()
+            except text_extraction_util.ExtractionTimeoutError:
+                logger.warning("Timed out extracting text from attachment", extra=extra)
+                self.increment(self.Metrics.FILES_TIMED_OUT)
+                continue
+            except text_extraction_util.FileTooLargeError:
+                # The file grew since we listed it
+                self.increment(self.Metrics.FILES_SKIPPED_TOO_LARGE)
+                continue
+            except Exception:
+                logger.exception("Failed to extract text from attachment", extra=extra)
+                self.increment(self.Metrics.FILES_FAILED)
+                continue
+
+            json_records.append(_build_json_record(attachment_id, file_info, content))
+
+        return json_records
+
+    def _upsert_if_full_batch(self, json_records: list[dict]) -> list[dict]:
+        if len(json_records) < self.config.batch_size:
+            return json_records
+
+        self._upsert(json_records)
+        return []
+
+    def _upsert(self, json_records: list[dict]) -> None:
+        logger.info("Loading batch of attachments...")
+        self.search_client.bulk_upsert(self.index_name, json_records, "attachment_id")
+        self.increment(self.Metrics.RECORDS_LOADED, len(json_records))
+
+
+def _get_attachment_id(attachment_path: str, file_info: file_util.FileInfo) -> str | None:
+    """
+    Get the ID of an attachment, its path relative to the attachment directory,
+    for example "123/my_file.pdf". Returns None if the file isn't stored
+    in a folder named after an opportunity ID.
+    """
+    relative_path = file_info.path.removeprefix(attachment_path.rstrip("/")).lstrip("/")
+
+    opportunity_id, _, file_name = relative_path.partition("/")
+    if not opportunity_id.isdigit() or not file_name:
+        return None
+
+    return relative_path
+
+
+def _build_json_record(attachment_id: str, file_info: file_util.FileInfo, content: str) -> dict:
+    opportunity_id, _, _ = attachment_id.partition("/")
+
+    return {
+        "attachment_id": attachment_id,
+        "opportunity_id": int(opportunity_id),
+        "file_name": file_util.get_file_name(file_info.path),
+        "file_path": file_info.path,
+        "file_size_bytes": file_info.size_bytes,
+        "last_modified": file_info.last_modified.isoformat(),
+        "content": content,
+    }
+
+
+def _get_file_version(file_info: file_util.FileInfo) -> str:
+    return _get_version(file_info.size_bytes, file_info.last_modified.isoformat())
+
+
+def _get_version(file_size_bytes: int, last_modified: str) -> str:
+    # We don't have a checksum of each file without reading it, so we
+    # consider a file changed if either its size or last modified timestamp change
+    return f"{file_size_bytes}:{last_modified}"
@@ -1,22 +1,40 @@
 import logging
+from datetime import date
 from enum import StrEnum
-from typing import Iterator, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
-from sqlalchemy import select
-from sqlalchemy.orm import noload, selectinload
 
 import src.adapters.db as db
 import src.adapters.search as search
-from src.api.opportunities_v1.opportunity_schemas import OpportunityV1Schema
-from src.db.models.opportunity_models import CurrentOpportunitySummary, Opportunity
+from src.constants.lookup_constants import OpportunityStatus
+from src.search.search_util import get_top_level_agency
+from src.services.opportunities_v1.opportunity_document import fetch_opportunity_documents
 from src.task.task import Task
-from src.util.datetime_util import get_now_us_eastern_datetime
+from src.util.datetime_util import get_now_us_eastern_date, get_now_us_eastern_datetime
 from src.util.env_config import PydanticBaseEnvConfig
 
 logger = logging.getLogger(__name__)
 
+# Mappings for the fields we derive when loading an opportunity into the index
+# (see add_derived_search_fields). Everything else uses the dynamic mapping
+# which for strings indexes both a tokenized text field and a ".keyword" subfield.
+# The derived fields are only used for filtering, sorting and aggregations, so we
+# map them directly to keyword/date/numeric types and skip the text analysis.
+OPPORTUNITY_INDEX_MAPPINGS = {
+    "properties": {
+        "post_date": {"type": "date"},
+        "close_date": {"type": "date"},
+        "days_until_close": {"type": "integer"},
+        "is_open": {"type": "boolean"},
+        "top_level_agency": {"type": "keyword"},
+        "funding_instrument": {"type": "keyword"},
+        "funding_category": {"type": "keyword"},
+        "applicant_type": {"type": "keyword"},
+    }
+}
+
 
 class LoadOpportunitiesToIndexConfig(PydanticBaseEnvConfig):
     model_config = SettingsConfigDict(env_prefix="LOAD_OPP_SEARCH_")
@@ -29,6 +47,15 @@ class LoadOpportunitiesToIndexConfig(PydanticBaseEnvConfig):
     alias_name: str = Field(default="opportunity-index-alias")  # LOAD_OPP_SEARCH_ALIAS_NAME
     index_prefix: str = Field(default="opportunity-index")  # LOAD_OPP_INDEX_PREFIX
 
+    # Whether to route opportunities to shards by their top-level agency so that
+    # searches filtered by agency only need to query the shards for those agencies.
+    # Only useful with more than one shard. This must match OPPORTUNITY_SEARCH_ROUTE_BY_AGENCY
+    # in the API, and changing it requires a full refresh.
+    route_by_agency: bool = Field(default=False)  # LOAD_OPP_SEARCH_ROUTE_BY_AGENCY
+
+    # How often, in seconds, to check whether a reindex has completed
+    reindex_poll_interval: float = Field(default=10)  # LOAD_OPP_SEARCH_REINDEX_POLL_INTERVAL
+
 
 class LoadOpportunitiesToIndex(Task):
     class Metrics(StrEnum):
@@ -40,25 +67,36 @@ class LoadOpportunitiesToIndex(Task):
         search_client: search.SearchClient,
         is_full_refresh: bool = True,
         config: LoadOpportunitiesToIndexConfig | None = None,
+        is_reindex: bool = False,
     ) -> None:
         super().__init__(db_session)
 
         self.search_client = search_client
         self.is_full_refresh = is_full_refresh
+        self.is_reindex = is_reindex
 
         if config is None:
             config = LoadOpportunitiesToIndexConfig()
         self.config = config
 
-        if is_full_refresh:
+        if is_full_refresh or is_reindex:
             current_timestamp = get_now_us_eastern_datetime().strftime("%Y-%m-%d_%H-%M-%S")
             self.index_name = f"{self.config.index_prefix}-{current_timestamp}"
         else:
             self.index_name = self.config.alias_name
         self.set_metrics({"index_name": self.index_name})
 
+        self.current_date = get_now_us_eastern_date()
+
+        # The top-level agency (and so routing value) of each opportunity
+        # already in the index, only populated for incremental loads
+        self.existing_opportunity_agencies: dict[int, str | None] = {}
+
     def run_task(self) -> None:
-        if self.is_full_refresh:
+        if self.is_reindex:
+            logger.info("Running reindex")
+            self.reindex()
+        elif self.is_full_refresh:
             logger.info("Running full refresh")
             self.full_refresh()
         else:
@@ -66,7 +104,7 @@ class LoadOpportunitiesToIndex(Task):
             self.incremental_updates_and_deletes()
 
     def incremental_updates_and_deletes(self) -> None:
-        existing_opportunity_ids = self.fetch_existing_opportunity_ids_in_index()
+        self.existing_opportunity_agencies = self.fetch_existing_opportunities_in_index()
 
         # load the records incrementally
         # TODO - The point of this incremental load is to support upcoming work
@@ -78,10 +116,16 @@ class LoadOpportunitiesToIndex(Task):
             loaded_opportunity_ids.update(self.load_records(opp_batch))
 
         # Delete
-        opportunity_ids_to_delete = existing_opportunity_ids - loaded_opportunity_ids
+        opportunity_ids_to_delete = (
+            self.existing_opportunity_agencies.keys() - loaded_opportunity_ids
+        )
 
         if len(opportunity_ids_to_delete) > 0:
-            self.search_client.bulk_delete(self.index_name, opportunity_ids_to_delete)
+            self.search_client.bulk_delete(
+                self.index_name,
+                opportunity_ids_to_delete,
+                routing=self._get_existing_routing(opportunity_ids_to_delete),
+            )
 
     def full_refresh(self) -> None:
         # create the index
@@ -89,6 +133,7 @@ class LoadOpportunitiesToIndex(Task):
             self.index_name,
             shard_count=self.config.shard_count,
             replica_count=self.config.replica_count,
+            mappings=OPPORTUNITY_INDEX_MAPPINGS,
         )
 
         # load the records
@@ -100,52 +145,76 @@ class LoadOpportunitiesToIndex(Task):
             self.index_name, self.config.alias_name, delete_prior_indexes=True
         )
 
-    def fetch_opportunities(self) -> Iterator[Sequence[Opportunity]]:
+    def reindex(self) -> None:
         """
-        Fetch the opportunities in batches. The iterator returned
-        will give you each individual batch to be processed.
+        Create a new index with the current settings/mappings, and copy the documents
+        of the index the alias currently points to into it within the search cluster.
 
-        Fetches all opportunities where:
-            * is_draft = False
-            * current_opportunity_summary is not None
+        This is much faster than a full refresh when only the settings or mappings
+        have changed (eg. the analyzer or shard count) as we don't need to query
+        the database or reserialize every opportunity. Note that the documents are
+        copied as-is, so this can't be used when the documents themselves change.
         """
-        return (
-            self.db_session.execute(
-                select(Opportunity)
-                .join(CurrentOpportunitySummary)
-                .where(
-                    Opportunity.is_draft.is_(False),
-                    CurrentOpportunitySummary.opportunity_status.isnot(None),
-                )
-                .options(selectinload("*"), noload(Opportunity.all_opportunity_summaries))
-                .execution_options(yield_per=5000)
+        existing_indexes = self.search_client.get_alias_index_names(self.config.alias_name)
+        if len(existing_indexes) != 1:
+            raise RuntimeError(
+                "Expected alias %s to point to exactly one index to reindex from, found %s"
+                % (self.config.alias_name, existing_indexes)
             )
-            .scalars()
-            .partitions()
+        source_index_name = existing_indexes[0]
+
+        self.search_client.create_index(
+            self.index_name,
+            shard_count=self.config.shard_count,
+            replica_count=self.config.replica_count,
+            mappings=OPPORTUNITY_INDEX_MAPPINGS,
+        )
+
+        response = self.search_client.reindex(
+            source_index_name,
+            self.index_name,
+            poll_interval_seconds=self.config.reindex_poll_interval,
         )
+        self.increment(self.Metrics.RECORDS_LOADED, response.get("created", 0))
 
-    def fetch_existing_opportunity_ids_in_index(self) -> set[int]:
+        self.search_client.swap_alias_index(
+            self.index_name, self.config.alias_name, delete_prior_indexes=True
+        )
+
+    def fetch_opportunities(self) -> Iterator[list[dict]]:
+        """
+        Fetch the serialized opportunities in batches. The iterator returned
+        will give you each individual batch to be processed.
+
+        See fetch_opportunity_documents for which opportunities are fetched.
+        """
+        return fetch_opportunity_documents(self.db_session)
+
+    def fetch_existing_opportunities_in_index(self) -> dict[int, str | None]:
+        """
+        Fetch the IDs of every opportunity in the index, mapped
+        to the top-level agency they were loaded with.
+        """
         if not self.search_client.alias_exists(self.index_name):
             raise RuntimeError(
                 "Alias %s does not exist, please run the full refresh job before the incremental job"
                 % self.index_name
             )
 
-        opportunity_ids: set[int] = set()
+        opportunity_agencies: dict[int, str | None] = {}
 
         for response in self.search_client.scroll(
             self.config.alias_name,
-            {"size": 10000, "_source": ["opportunity_id"]},
+            {"size": 10000, "_source": ["opportunity_id", "top_level_agency"]},
             include_scores=False,
         ):
             for record in response.records:
-                opportunity_ids.add(record["opportunity_id"])
+                opportunity_agencies[record["opportunity_id"]] = record.get("top_level_agency")
 
-        return opportunity_ids
+        return opportunity_agencies
 
-    def load_records(self, records: Sequence[Opportunity]) -> set[int]:
+    def load_records(self, records: Sequence[dict]) -> set[int]:
         logger.info("Loading batch of opportunities...")
-        schema = OpportunityV1Schema()
         json_records = []
 
         loaded_opportunity_ids = set()
@@ -154,15 +223,91 @@ class LoadOpportunitiesToIndex(Task):
             logger.info(
                 "Preparing opportunity for upload to search index",
                 extra={
-                    "opportunity_id": record.opportunity_id,
-                    "opportunity_status": record.opportunity_status,
+                    "opportunity_id": record["opportunity_id"],
+                    "opportunity_status": record["opportunity_status"],
                 },
             )
-            json_records.append(schema.dump(record))
+            json_records.append(add_derived_search_fields(record, self.current_date))
             self.increment(self.Metrics.RECORDS_LOADED)
 
-            loaded_opportunity_ids.add(record.opportunity_id)
+            loaded_opportunity_ids.add(record["opportunity_id"])
 
-        self.search_client.bulk_upsert(self.index_name, json_records, "opportunity_id")
+        routing_field = None
+        if self.config.route_by_agency:
+            routing_field = "top_level_agency"
+            self.delete_records_with_changed_agency(json_records)
+
+        self.search_client.bulk_upsert(
+            self.index_name, json_records, "opportunity_id", routing_field=routing_field
+        )
 
         return loaded_opportunity_ids
+
+    def delete_records_with_changed_agency(self, json_records: list[dict]) -> None:
+        """
+        When routing by agency, an opportunity whose top-level agency changed
+        would be upserted to a different shard, leaving the prior version behind
+        on its old shard. Delete the prior version first, using its old routing.
+        """
+        opportunity_ids_to_delete = [
+            json_record["opportunity_id"]
+            for json_record in json_records
+            if json_record["opportunity_id"] in self.existing_opportunity_agencies
+            and self.existing_opportunity_agencies[json_record["opportunity_id"]]
+            != json_record["top_level_agency"]
+        ]
+
+        if len(opportunity_ids_to_delete) > 0:
+            logger.info(
+                "Deleting opportunities with a changed agency before reloading them",
+                extra={"record_count": len(opportunity_ids_to_delete)},
+            )
+            self.search_client.bulk_delete(
+                self.index_name,
+                opportunity_ids_to_delete,
+                routing=self._get_existing_routing(opportunity_ids_to_delete),
+            )
+
+    def _get_existing_routing(self, opportunity_ids: Iterable[int]) -> dict[int, str | None]:
+        if not self.config.route_by_agency:
+            return {}
+
+        return {
+            opportunity_id: self.existing_opportunity_agencies.get(opportunity_id)
+            for opportunity_id in opportunity_ids
+        }
+
+
+def add_derived_search_fields(json_record: dict[str, Any], current_date: date) -> dict[str, Any]:
+    """
+    Add fields to an opportunity record that are derived from its other values
+    when it gets loaded into the search index. These flatten the values we filter
+    and sort on out of the summary object, and precompute values so queries don't
+    need to calculate them.
+
+    Note that these are only calculated when the record is loaded, so anything
+    relative to the current date is only as up-to-date as the last load.
+
+    The API schemas exclude these fields when loading search results, so
+    they never end up in a response.
+    """
+    summary = json_record.get("summary") or {}
+
+    close_date: str | None = summary.get("close_date")
+
+    days_until_close = None
+    if close_date is not None:
+        days_until_close = (date.fromisoformat(close_date) - current_date).days
+
+    json_record["post_date"] = summary.get("post_date")
+    json_record["close_date"] = close_date
+    json_record["days_until_close"] = days_until_close
+    json_record["is_open"] = json_record.get("opportunity_status") == OpportunityStatus.POSTED and (
+        days_until_close is None or days_until_close >= 0
+    )
+    json_record["top_level_agency"] = get_top_level_agency(json_record.get("agency"))
+    json_record["funding_instrument"] = summary.get("funding_instruments", [])
+    json_record["funding_category"] = summary.get("funding_categories", [])
+    json_record["applicant_type"] = summary.get("applicant_types", [])
+
+    return json_record
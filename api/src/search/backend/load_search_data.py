@@ -3,8 +3,10 @@ import click
 import src.adapters.db as db
 import src.adapters.search as search
 from src.adapters.db import flask_db
+from src.search.backend.load_attachments_to_index import LoadAttachmentsToIndex
 from src.search.backend.load_opportunities_to_index import LoadOpportunitiesToIndex
 from src.search.backend.load_search_data_blueprint import load_search_data_blueprint
+from src.search.backend.warm_search_cache import WarmSearchCacheTask
 
 
 @load_search_data_blueprint.cli.command(
@@ -15,8 +17,41 @@ from src.search.backend.load_search_data_blueprint import load_search_data_bluep
     default=True,
     help="Whether to run a full refresh, or only incrementally update oppportunities",
 )
+@click.option(
+    "--reindex",
+    is_flag=True,
+    default=False,
+    help="Copy the current index into a new index with the latest settings and mappings, rather than reloading from the database",
+)
+@flask_db.with_db_session()
+def load_opportunity_data(db_session: db.Session, full_refresh: bool, reindex: bool) -> None:
+    search_client = search.SearchClient()
+
+    LoadOpportunitiesToIndex(db_session, search_client, full_refresh, is_reindex=reindex).run()
+
+
+@load_search_data_blueprint.cli.command(
+    "load-attachment-data",
+    help="Extract the text of opportunity attachments and load it into the attachment search index",
+)
+@click.option(
+    "--full-refresh/--incremental",
+    default=True,
+    help="Whether to run a full refresh, or only load new or changed attachments",
+)
+@flask_db.with_db_session()
+def load_attachment_data(db_session: db.Session, full_refresh: bool) -> None:
+    search_client = search.SearchClient()
+
+    LoadAttachmentsToIndex(db_session, search_client, full_refresh).run()
+
+
+@load_search_data_blueprint.cli.command(
+    "warm-opportunity-search-cache",
+    help="Replay the most common search requests from the request logs to warm the search index caches",
+)
 @flask_db.with_db_session()
-def load_opportunity_data(db_session: db.Session, full_refresh: bool) -> None:
+def warm_opportunity_search_cache(db_session: db.Session) -> None:
     search_client = search.SearchClient()
 
-    LoadOpportunitiesToIndex(db_session, search_client, full_refresh).run()
+    WarmSearchCacheTask(db_session, search_client).run()
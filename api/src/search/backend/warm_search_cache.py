@@ -0,0 +1,224 @@
+import json
+import logging
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from typing import Any
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+import src.adapters.db as db
+import src.adapters.search as search
+import src.util.file_util as file_util
+from src.services.opportunities_v1.search_opportunities import search_opportunities
+from src.task.task import Task
+from src.util.env_config import PydanticBaseEnvConfig
+
+logger = logging.getLogger(__name__)
+
+# The prefix that the search route uses when adding the
+# request body to the logs, see opportunity_routes.opportunity_search
+REQUEST_BODY_LOG_PREFIX = "request.body."
+
+SEARCH_URL_RULE = "/v1/opportunities/search"
+
+
+class WarmSearchCacheConfig(PydanticBaseEnvConfig):
+    model_config = SettingsConfigDict(env_prefix="WARM_SEARCH_CACHE_")
+
+    # A file (local or S3) of JSON formatted request logs to pull search requests from
+    log_file_path: str  # WARM_SEARCH_CACHE_LOG_FILE_PATH
+
+    top_n: int = Field(default=100)  # WARM_SEARCH_CACHE_TOP_N
+    max_concurrency: int = Field(default=4)  # WARM_SEARCH_CACHE_MAX_CONCURRENCY
+
+
+class WarmSearchCacheTask(Task):
+    """
+    Replay the most common search requests found in the request logs
+    against the search index so that the OpenSearch request/filesystem caches
+    are populated before real traffic hits a newly deployed service or swapped index.
+
+    The requests are replayed twice, the first pass gives us the "cold" latency
+    and warms the caches, the second pass gives us the "warm" latency.
+    """
+
+    class Metrics(StrEnum):
+        LOG_LINES_PROCESSED = "log_lines_processed"
+        LOG_LINES_UNPARSEABLE = "log_lines_unparseable"
+        SEARCH_REQUESTS_FOUND = "search_requests_found"
+        UNIQUE_SEARCH_REQUESTS_FOUND = "unique_search_requests_found"
+        SEARCH_REQUESTS_REPLAYED = "search_requests_replayed"
+        SEARCH_REQUESTS_FAILED = "search_requests_failed"
+
+    def __init__(
+        self,
+        db_session: db.Session,
+        search_client: search.SearchClient,
+        config: WarmSearchCacheConfig | None = None,
+    ) -> None:
+        super().__init__(db_session)
+
+        self.search_client = search_client
+
+        if config is None:
+            config = WarmSearchCacheConfig()
+        self.config = config
+
+    def run_task(self) -> None:
+        search_requests = self.get_top_search_requests()
+
+        cold_latencies = self.replay_search_requests(search_requests)
+        self.set_metrics(_get_latency_metrics("cold", cold_latencies))
+
+        warm_latencies = self.replay_search_requests(search_requests)
+        self.set_metrics(_get_latency_metrics("warm", warm_latencies))
+
+    def get_top_search_requests(self) -> list[dict]:
+        """
+        Parse the request logs and return the most common search
+        request bodies, most frequent first.
+        """
+        request_counts: Counter[str] = Counter()
+
+        with file_util.open_stream(self.config.log_file_path) as log_file:
+            for line in log_file:
+                self.increment(self.Metrics.LOG_LINES_PROCESSED)
+
+                try:
+                    log_record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.increment(self.Metrics.LOG_LINES_UNPARSEABLE)
+                    continue
+
+                search_request = get_search_request_from_log_record(log_record)
+                if search_request is None:
+                    continue
+
+                self.increment(self.Metrics.SEARCH_REQUESTS_FOUND)
+                request_counts[normalize_search_request(search_request)] += 1
+
+        self.set_metrics({self.Metrics.UNIQUE_SEARCH_REQUESTS_FOUND: len(request_counts)})
+
+        return [
+            json.loads(normalized_request)
+            for normalized_request, _ in request_counts.most_common(self.config.top_n)
+        ]
+
+    def replay_search_requests(self, search_requests: list[dict]) -> list[float]:
+        """
+        Run each search request, with at most max_concurrency requests in flight,
+        and return the latency of each successful request in milliseconds.
+        """
+        logger.info(
+            "Replaying search requests",
+            extra={
+                "search_request_count": len(search_requests),
+                "max_concurrency": self.config.max_concurrency,
+            },
+        )
+
+        with ThreadPoolExecutor(max_workers=self.config.max_concurrency) as executor:
+            results = list(executor.map(self._run_search_request, search_requests))
+
+        # Metrics are only incremented here, rather than in the
+        # worker threads, as incrementing them isn't thread-safe
+        latencies = []
+        for latency in results:
+            if latency is None:
+                self.increment(self.Metrics.SEARCH_REQUESTS_FAILED)
+            else:
+                self.increment(self.Metrics.SEARCH_REQUESTS_REPLAYED)
+                latencies.append(latency)
+
+        return latencies
+
+    def _run_search_request(self, search_request: dict) -> float | None:
+        start = time.perf_counter()
+        try:
+            search_opportunities(self.search_client, search_request)
+        except Exception:
+            logger.exception("Failed to replay search request")
+            return None
+
+        return (time.perf_counter() - start) * 1000
+
+
+def get_search_request_from_log_record(log_record: Any) -> dict | None:
+    """
+    Rebuild the search request body from an "end request" log line of a successful
+    search request. The route logs the body flattened, so a log record like::
+
+        {"request.body.query": "research", "request.body.pagination.page_size": 25}
+
+    Would become::
+
+        {"query": "research", "pagination": {"page_size": 25}}
+
+    Any other log record returns None.
+    """
+    if not isinstance(log_record, dict):
+        return None
+
+    if log_record.get("msg") != "end request":
+        return None
+
+    if log_record.get("request.url_rule") != SEARCH_URL_RULE:
+        return None
+
+    if log_record.get("response.status_code") != 200:
+        return None
+
+    search_request: dict = {}
+    for key, value in log_record.items():
+        if not key.startswith(REQUEST_BODY_LOG_PREFIX):
+            continue
+
+        *path, field = key.removeprefix(REQUEST_BODY_LOG_PREFIX).split(".")
+
+        nested_dict = search_request
+        for path_part in path:
+            nested_dict = nested_dict.setdefault(path_part, {})
+        nested_dict[field] = value
+
+    if len(search_request) == 0:
+        return None
+
+    return search_request
+
+
+def normalize_search_request(search_request: dict) -> str:
+    # Requests that only differ in the order of their keys or
+    # filter values run the same query, so we count them together.
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: _normalize(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return sorted(value, key=str)
+        return value
+
+    return json.dumps(_normalize(search_request), sort_keys=True)
+
+
+def _get_latency_metrics(prefix: str, latencies: list[float]) -> dict[str, float | None]:
+    sorted_latencies = sorted(latencies)
+
+    return {
+        f"{prefix}_p50_ms": _percentile(sorted_latencies, 50),
+        f"{prefix}_p90_ms": _percentile(sorted_latencies, 90),
+        f"{prefix}_p99_ms": _percentile(sorted_latencies, 99),
+        f"{prefix}_max_ms": _percentile(sorted_latencies, 100),
+    }
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float | None:
+    # Nearest-rank percentile, we don't need anything more
+    # precise than this for a rough latency report
+    if len(sorted_values) == 0:
+        return None
+
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return round(sorted_values[rank - 1], 3)
@@ -6,6 +6,14 @@ from src.util.env_config import PydanticBaseEnvConfig
 class SearchConfig(PydanticBaseEnvConfig):
     opportunity_search_index_alias: str = Field(default="opportunity-index-alias")
 
+    # Whether the opportunity index was loaded with documents routed by
+    # their top-level agency, see LoadOpportunitiesToIndexConfig.route_by_agency
+    opportunity_search_route_by_agency: bool = Field(default=False)
+
+    # Whether the v0.1 (database) opportunity search matches the query with Postgres
+    # full-text search, rather than partial matching each field with ILIKE
+    opportunity_db_search_full_text: bool = Field(default=False)
+
 
 _search_config: SearchConfig | None = None
 
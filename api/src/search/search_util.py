@@ -0,0 +1,9 @@
+def get_top_level_agency(agency: str | None) -> str | None:
+    """
+    Get the top-level agency from an agency code, for example
+    HHS-NIH11 has a top-level agency of HHS
+    """
+    if not agency:
+        return None
+
+    return agency.split("-")[0]
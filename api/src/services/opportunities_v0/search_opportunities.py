@@ -7,7 +7,7 @@ from src.constants.lookup_constants import OpportunityCategoryLegacy
 from src.db.models.opportunity_models import Opportunity
 from src.db.models.transfer.topportunity_models import TransferTopportunity
 from src.pagination.pagination_models import PaginationInfo, PaginationParamsV0
-from src.pagination.paginator import Paginator
+from src.pagination.paginator import CountStrategy, Paginator
 from src.services.opportunities_v0.opportunity_service_shared import convert_transfer_opp_to_regular
 
 
@@ -56,7 +56,11 @@ def search_opportunities(
         stmt = stmt.where(TransferTopportunity.oppcategory == search_params.category)
 
     paginator: Paginator[TransferTopportunity] = Paginator(
-        TransferTopportunity, stmt, db_session, page_size=search_params.paging.page_size
+        TransferTopportunity,
+        stmt,
+        db_session,
+        page_size=search_params.paging.page_size,
+        count_strategy=CountStrategy.WINDOW,
     )
     opportunities = paginator.page_at(page_offset=search_params.paging.page_offset)
     pagination_info = PaginationInfo.from_pagination_models(search_params, paginator)
@@ -2,10 +2,13 @@ import logging
 from typing import Any, Sequence, Tuple
 
 from pydantic import BaseModel, Field
-from sqlalchemy import Select, asc, desc, nulls_last, or_, select
+from sqlalchemy import ColumnElement, Select, asc, cast, desc, func, nulls_last, or_, select
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, TSVECTOR
 from sqlalchemy.orm import InstrumentedAttribute, noload, selectinload
 
 import src.adapters.db as db
+from src.api.response import ValidationErrorDetail
+from src.api.route_utils import raise_flask_error
 from src.db.models.opportunity_models import (
     CurrentOpportunitySummary,
     LinkOpportunitySummaryApplicantType,
@@ -16,10 +19,15 @@ from src.db.models.opportunity_models import (
     OpportunitySummary,
 )
 from src.pagination.pagination_models import PaginationInfo, PaginationParams
-from src.pagination.paginator import Paginator
+from src.pagination.paginator import CountStrategy, InvalidCursorError, Paginator
+from src.search.search_config import get_search_config
+from src.validation.validation_constants import ValidationErrorType
 
 logger = logging.getLogger(__name__)
 
+# The text search configuration the search vectors of the opportunity tables are built with
+FULL_TEXT_SEARCH_CONFIG = "english"
+
 
 class SearchOpportunityFilters(BaseModel):
     funding_instrument: dict | None = Field(default=None)
@@ -41,7 +49,13 @@ def _join_stmt_to_current_summary(stmt: Select[tuple[Any]]) -> Select[tuple[Any]
     #
     # We need to add joins so that the where/order_by clauses
     # can query against the tables that are relevant for these filters
-    return stmt.join(CurrentOpportunitySummary).join(
+    #
+    # The ON clauses are explicit, as otherwise SQLAlchemy can't determine which
+    # side to join from when the statement also selects opportunity summary columns
+    return stmt.join(
+        CurrentOpportunitySummary,
+        Opportunity.opportunity_id == CurrentOpportunitySummary.opportunity_id,
+    ).join(
         OpportunitySummary,
         CurrentOpportunitySummary.opportunity_summary_id
         == OpportunitySummary.opportunity_summary_id,
@@ -60,6 +74,9 @@ def _add_query_filters(stmt: Select[tuple[Any]], query: str | None) -> Select[tu
         Opportunity.opportunity_id == OpportunityAssistanceListing.opportunity_id,
     )
 
+    if get_search_config().opportunity_db_search_full_text:
+        return _add_full_text_query_filters(stmt, query)
+
     """
     This adds the following to the inner query (assuming the query value is "example")
 
@@ -94,6 +111,46 @@ def _add_query_filters(stmt: Select[tuple[Any]], query: str | None) -> Select[tu
     return stmt
 
 
+def _get_tsquery(query: str) -> ColumnElement:
+    # websearch_to_tsquery supports the syntax of most search engines, like "quoted phrases",
+    # "or" and -excluded words, and never errors for an invalid query
+    return func.websearch_to_tsquery(FULL_TEXT_SEARCH_CONFIG, query)
+
+
+def _add_full_text_query_filters(stmt: Select[tuple[Any]], query: str) -> Select[tuple[Any]]:
+    """
+    This adds the following to the inner query (assuming the query value is "example")
+
+    WHERE
+        (opportunity.search_vector @@ websearch_to_tsquery('english', 'example')
+        OR opportunity_summary.search_vector @@ websearch_to_tsquery('english', 'example')
+        OR opportunity_assistance_listing.search_vector @@ websearch_to_tsquery('english', 'example')
+        OR opportunity.opportunity_number ILIKE '%example%'
+        OR opportunity_assistance_listing.assistance_listing_number = 'example')
+
+    The search vectors are weighted tsvector columns generated by Postgres from the
+    text fields of each table (see Opportunity.search_vector) and have GIN indexes.
+    """
+    tsquery = _get_tsquery(query)
+
+    return stmt.where(
+        or_(
+            # Title, number, and agency
+            Opportunity.search_vector.bool_op("@@")(tsquery),
+            # Summary description
+            OpportunitySummary.search_vector.bool_op("@@")(tsquery),
+            # Program title
+            OpportunityAssistanceListing.search_vector.bool_op("@@")(tsquery),
+            # Number partial match, as opportunity numbers are often searched by a prefix or
+            # suffix which wouldn't match a whole word. If the pg_trgm extension is available,
+            # this uses a trigram index, see the add_opportunity_search_vectors migration.
+            Opportunity.opportunity_number.ilike(f"%{query}%"),
+            # Assistance listing number matches exactly
+            OpportunityAssistanceListing.assistance_listing_number == query,
+        )
+    )
+
+
 def _add_filters(
     stmt: Select[tuple[Any]], filters: SearchOpportunityFilters | None
 ) -> Select[tuple[Any]]:
@@ -149,18 +206,39 @@ def _add_filters(
 
 
 def _add_order_by(
-    stmt: Select[tuple[Opportunity]], pagination: PaginationParams
-) -> Select[tuple[Opportunity]]:
+    stmt: Select[tuple[Opportunity]], pagination: PaginationParams, query: str | None
+) -> Tuple[Select[tuple[Opportunity]], InstrumentedAttribute | ColumnElement]:
     # This generates an order by command like:
     #
-    #   ORDER BY opportunity.opportunity_id DESC NULLS LAST
+    #   ORDER BY opportunity.agency DESC NULLS LAST, opportunity.opportunity_id DESC
+    #
+    # Sorting by the opportunity ID last makes the order stable when records have the
+    # same value, which is required for keyset pagination. Returns the stmt and field sorted by.
 
     # This determines whether we use ascending or descending when building the query
     sort_fn = asc if pagination.is_ascending else desc
 
     match pagination.order_by:
-        case "opportunity_id":
-            field: InstrumentedAttribute = Opportunity.opportunity_id
+        case "relevancy" if query:
+            # Rank by how well the query matches the opportunity, with matches in the
+            # title and number weighted highest, then the agency, then the summary description
+            #
+            # The rank is a real, which is cast to a double as the cursor for the next
+            # page needs a value that is exactly equal to it when read back by Python
+            field: InstrumentedAttribute | ColumnElement = cast(
+                func.ts_rank(
+                    Opportunity.search_vector.op("||")(
+                        func.coalesce(OpportunitySummary.search_vector, cast("", TSVECTOR))
+                    ),
+                    _get_tsquery(query),
+                ),
+                DOUBLE_PRECISION,
+            )
+            # Need to add joins to the query stmt to rank with the opportunity summary
+            stmt = _join_stmt_to_current_summary(stmt)
+        case "opportunity_id" | "relevancy":
+            # Without a query, there is nothing to rank by relevancy
+            field = Opportunity.opportunity_id
         case "opportunity_number":
             field = Opportunity.opportunity_number
         case "opportunity_title":
@@ -184,7 +262,7 @@ def _add_order_by(
             raise Exception(msg)
 
     # Any values that are null will automatically be sorted to the end
-    return stmt.order_by(nulls_last(sort_fn(field)))
+    return stmt.order_by(nulls_last(sort_fn(field)), sort_fn(Opportunity.opportunity_id)), field
 
 
 def search_opportunities(
@@ -255,12 +333,45 @@ def search_opportunities(
         .options(selectinload("*"), noload(Opportunity.all_opportunity_summaries))
     )
 
-    stmt = _add_order_by(stmt, search_params.pagination)
+    stmt, sort_field = _add_order_by(stmt, search_params.pagination, search_params.query)
+
+    # Without any filters, the exact count would need to scan every opportunity
+    # and the planner's estimate is close, so we estimate it instead. Otherwise the
+    # query returns one row per opportunity, so the records can be counted in the
+    # same query that fetches the page.
+    if not search_params.query and search_params.filters is None:
+        count_strategy = CountStrategy.ESTIMATED
+    else:
+        count_strategy = CountStrategy.WINDOW
 
     paginator: Paginator[Opportunity] = Paginator(
-        Opportunity, stmt, db_session, page_size=search_params.pagination.page_size
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=search_params.pagination.page_size,
+        sort_column=sort_field,
+        is_ascending=search_params.pagination.is_ascending,
+        count_strategy=count_strategy,
     )
-    opportunities = paginator.page_at(page_offset=search_params.pagination.page_offset)
+
+    if search_params.pagination.cursor is not None:
+        try:
+            opportunities = paginator.page_after(search_params.pagination.cursor)
+        except InvalidCursorError:
+            raise_flask_error(
+                422,
+                "Invalid pagination cursor",
+                validation_issues=[
+                    ValidationErrorDetail(
+                        type=ValidationErrorType.INVALID,
+                        message="Not a valid pagination cursor.",
+                        field="pagination.cursor",
+                    )
+                ],
+            )
+    else:
+        opportunities = paginator.page_at(page_offset=search_params.pagination.page_offset)
+
     pagination_info = PaginationInfo.from_pagination_params(search_params.pagination, paginator)
 
     return opportunities, pagination_info
@@ -1,27 +1,33 @@
+import hashlib
 from datetime import date
+from typing import Any, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import noload, selectinload
+from sqlalchemy import ColumnElement, ScalarSelect, Select, and_, func, or_, select
+from sqlalchemy.orm import aliased, noload, selectinload
 
 import src.adapters.db as db
 import src.util.datetime_util as datetime_util
 from src.api.route_utils import raise_flask_error
-from src.db.models.opportunity_models import Opportunity, OpportunitySummary
-
-
-def _fetch_opportunity(
-    db_session: db.Session, opportunity_id: int, load_all_opportunity_summaries: bool
-) -> Opportunity:
+from src.db.models.opportunity_models import (
+    CurrentOpportunitySummary,
+    LinkOpportunitySummaryApplicantType,
+    LinkOpportunitySummaryFundingCategory,
+    LinkOpportunitySummaryFundingInstrument,
+    Opportunity,
+    OpportunityAssistanceListing,
+    OpportunitySummary,
+)
+
+
+def _fetch_opportunity(db_session: db.Session, opportunity_id: int) -> Opportunity:
+    # The summaries aren't loaded here, any needed are queried separately
     stmt = (
         select(Opportunity)
         .where(Opportunity.opportunity_id == opportunity_id)
         .where(Opportunity.is_draft.is_(False))
-        .options(selectinload("*"))
+        .options(selectinload("*"), noload(Opportunity.all_opportunity_summaries))
     )
 
-    if not load_all_opportunity_summaries:
-        stmt = stmt.options(noload(Opportunity.all_opportunity_summaries))
-
     opportunity = db_session.execute(stmt).unique().scalar_one_or_none()
 
     if opportunity is None:
@@ -30,70 +36,211 @@ def _fetch_opportunity(
     return opportunity
 
 
+def _get_table_changes(
+    table: Any, *where: ColumnElement[bool]
+) -> tuple[ScalarSelect[int], ScalarSelect[Any]]:
+    # Counting the rows catches any deletes, which updated_at alone wouldn't
+    return (
+        select(func.count()).select_from(table).where(*where).scalar_subquery(),
+        select(func.max(table.updated_at)).select_from(table).where(*where).scalar_subquery(),
+    )
+
+
+def _get_opportunity_version_marker_stmt() -> Select:
+    """Get a query of values that change whenever any of the records for an opportunity change.
+
+    This is a cheap query of the timestamps and row counts of the opportunity
+    and its related records, without loading any of them. Each row is the
+    opportunity ID followed by its values, for every non-draft opportunity.
+    """
+    # The subqueries are correlated to the opportunity of each row
+    is_opportunity_summary = OpportunitySummary.opportunity_id == Opportunity.opportunity_id
+
+    return (
+        select(
+            Opportunity.opportunity_id,
+            Opportunity.updated_at,
+            CurrentOpportunitySummary.opportunity_summary_id,
+            CurrentOpportunitySummary.updated_at,
+            *_get_table_changes(OpportunitySummary, is_opportunity_summary),
+            *_get_table_changes(
+                OpportunityAssistanceListing,
+                OpportunityAssistanceListing.opportunity_id == Opportunity.opportunity_id,
+            ),
+            *_get_table_changes(
+                LinkOpportunitySummaryFundingInstrument,
+                LinkOpportunitySummaryFundingInstrument.opportunity_summary_id
+                == OpportunitySummary.opportunity_summary_id,
+                is_opportunity_summary,
+            ),
+            *_get_table_changes(
+                LinkOpportunitySummaryFundingCategory,
+                LinkOpportunitySummaryFundingCategory.opportunity_summary_id
+                == OpportunitySummary.opportunity_summary_id,
+                is_opportunity_summary,
+            ),
+            *_get_table_changes(
+                LinkOpportunitySummaryApplicantType,
+                LinkOpportunitySummaryApplicantType.opportunity_summary_id
+                == OpportunitySummary.opportunity_summary_id,
+                is_opportunity_summary,
+            ),
+        )
+        .outerjoin(
+            CurrentOpportunitySummary,
+            Opportunity.opportunity_id == CurrentOpportunitySummary.opportunity_id,
+        )
+        .where(Opportunity.is_draft.is_(False))
+    )
+
+
+def _get_opportunity_version_marker(
+    db_session: db.Session, opportunity_id: int
+) -> Sequence[Any] | None:
+    """Get the version marker values of a single opportunity
+
+    Returns None if there isn't a non-draft opportunity with the ID.
+    """
+    stmt = _get_opportunity_version_marker_stmt().where(
+        Opportunity.opportunity_id == opportunity_id
+    )
+
+    return db_session.execute(stmt).one_or_none()
+
+
+def _hash_version_marker(*values: Any) -> str:
+    return hashlib.sha256(repr(values).encode()).hexdigest()
+
+
+def get_opportunity_etag(db_session: db.Session, opportunity_id: int) -> str | None:
+    """Get an ETag for the opportunity, or None if the opportunity doesn't exist
+
+    The ETag changes whenever the opportunity, or any records included with it, change.
+    """
+    version_marker = _get_opportunity_version_marker(db_session, opportunity_id)
+    if version_marker is None:
+        return None
+
+    return _hash_version_marker("opportunity", *version_marker)
+
+
+def get_all_opportunity_etags(db_session: db.Session) -> dict[int, str]:
+    """Get the ETag of every non-draft opportunity, by opportunity ID
+
+    These are the same as get_opportunity_etag returns for each opportunity.
+    """
+    version_markers = db_session.execute(
+        _get_opportunity_version_marker_stmt().execution_options(yield_per=5000)
+    )
+
+    return {
+        version_marker[0]: _hash_version_marker("opportunity", *version_marker)
+        for version_marker in version_markers
+    }
+
+
+def get_opportunity_versions_etag(db_session: db.Session, opportunity_id: int) -> str | None:
+    """Get an ETag for the versions of the opportunity, or None if the opportunity doesn't exist
+
+    Which versions can be shown depends on the current date, so the ETag
+    changes each day as well as whenever the opportunity's records change.
+    """
+    version_marker = _get_opportunity_version_marker(db_session, opportunity_id)
+    if version_marker is None:
+        return None
+
+    return _hash_version_marker(
+        "opportunity_versions", datetime_util.get_now_us_eastern_date(), *version_marker
+    )
+
+
 def get_opportunity(db_session: db.Session, opportunity_id: int) -> Opportunity:
-    return _fetch_opportunity(db_session, opportunity_id, load_all_opportunity_summaries=False)
+    return _fetch_opportunity(db_session, opportunity_id)
 
 
 def get_opportunity_versions(db_session: db.Session, opportunity_id: int) -> dict:
-    opportunity = _fetch_opportunity(
-        db_session, opportunity_id, load_all_opportunity_summaries=True
-    )
+    opportunity = _fetch_opportunity(db_session, opportunity_id)
 
     now_us_eastern = datetime_util.get_now_us_eastern_date()
 
-    forecasts = _filter_summaries(opportunity.all_forecasts, now_us_eastern)
-    non_forecasts = _filter_summaries(opportunity.all_non_forecasts, now_us_eastern)
+    summaries = db_session.scalars(
+        _get_visible_summaries_stmt(opportunity_id, now_us_eastern)
+    ).all()
+
+    forecasts = [summary for summary in summaries if summary.is_forecast]
+    non_forecasts = [summary for summary in summaries if not summary.is_forecast]
 
     return {"opportunity": opportunity, "forecasts": forecasts, "non_forecasts": non_forecasts}
 
 
-def _filter_summaries(
-    summaries: list[OpportunitySummary], current_date: date
-) -> list[OpportunitySummary]:
-    # Find the most recent summary
-    most_recent_summary: OpportunitySummary | None = None
-    for summary in summaries:
-        if summary.revision_number is None:
-            most_recent_summary = summary
-            summaries.remove(summary)
-            break
-
-    # If there is no most recent summary, even if there is any history records
-    # we have to filter all of the summaries. Effectively this would mean the most recent
-    # was deleted, and we never show deleted summaries (or anything that comes before them).
-    if most_recent_summary is None:
-        return []
-
-    # If the most recent summary isn't able to be public itself, we can't display any history
-    # for this type of summary object.
-    if not most_recent_summary.can_summary_be_public(current_date):
-        return []
-
-    summaries_to_keep = [most_recent_summary]
-
-    # We want to process these in reverse order (most recent first)
-    # as soon as we hit one that we need to filter, we stop adding records.
-    #
-    # For example, if a summary is marked as deleted, we won't add that, and
-    # we also filter out all summaries that came before it (by just breaking the loop)
-    summaries = sorted(summaries, key=lambda s: s.version_number, reverse=True)  # type: ignore
-
-    for summary in summaries:
-        if summary.is_deleted:
-            break
-
-        if summary.post_date is None:
-            break
-
-        # If a historical record was updated (or initially created) before
-        # its own post date (ie. would have been visible when created) regardless
-        # of what the current date may be
-        # TODO - leaving this out of the implementation for the moment
-        # as we need to investigate why this is being done and if there is a better
-        # way as this ends up filtering out records we don't want removed
-        # if summary.updated_at.date() < summary.post_date:
-        #    break
-
-        summaries_to_keep.append(summary)
-
-    return summaries_to_keep
+def _get_visible_summaries_stmt(opportunity_id: int, current_date: date) -> Select:
+    """Get a query of the summaries of an opportunity that can be shown as its versions
+
+    Forecasts and non-forecasts are filtered separately, in the same way:
+
+    * The most recent summary (the one without a revision number) must be
+      able to be public, otherwise nothing is shown, even if there is history.
+      If there is no most recent summary, it was deleted, and we never show
+      deleted summaries or anything that came before them.
+    * Going back through the history from the most recent version, as soon as
+      we hit one that we need to filter (deleted, or without a post date), it
+      and all the versions that came before it are left out.
+
+    The summaries are ordered by is_forecast, then the most recent summary
+    followed by its history, most recent version first.
+    """
+    # The most recent summary and history of the same type as each summary
+    most_recent = aliased(OpportunitySummary)
+    history = aliased(OpportunitySummary)
+
+    most_recent_is_public = (
+        select(most_recent.opportunity_summary_id)
+        .where(
+            most_recent.opportunity_id == OpportunitySummary.opportunity_id,
+            most_recent.is_forecast == OpportunitySummary.is_forecast,
+            most_recent.revision_number.is_(None),
+            most_recent.is_deleted.is_not(True),
+            most_recent.post_date <= current_date,
+        )
+        .exists()
+    )
+
+    # The most recent version of the history that is filtered,
+    # which cuts off itself and every version before it
+    filtered_version_number = (
+        select(func.max(history.version_number))
+        .where(
+            history.opportunity_id == OpportunitySummary.opportunity_id,
+            history.is_forecast == OpportunitySummary.is_forecast,
+            history.revision_number.is_not(None),
+            or_(history.is_deleted.is_(True), history.post_date.is_(None)),
+        )
+        .scalar_subquery()
+    )
+
+    is_visible_history = and_(
+        OpportunitySummary.revision_number.is_not(None),
+        OpportunitySummary.is_deleted.is_not(True),
+        OpportunitySummary.post_date.is_not(None),
+        or_(
+            filtered_version_number.is_(None),
+            OpportunitySummary.version_number > filtered_version_number,
+        ),
+    )
+
+    return (
+        select(OpportunitySummary)
+        .where(OpportunitySummary.opportunity_id == opportunity_id)
+        .where(most_recent_is_public)
+        .where(or_(OpportunitySummary.revision_number.is_(None), is_visible_history))
+        .order_by(
+            OpportunitySummary.is_forecast,
+            OpportunitySummary.revision_number.is_not(None),
+            OpportunitySummary.version_number.desc(),
+        )
+        .options(
+            selectinload(OpportunitySummary.link_funding_instruments),
+            selectinload(OpportunitySummary.link_funding_categories),
+            selectinload(OpportunitySummary.link_applicant_types),
+        )
+    )
@@ -0,0 +1,197 @@
+"""Load an opportunity already serialized as it's returned by the API.
+
+Rather than loading the opportunity and each of its related records with
+a query per relationship, and then serializing them with OpportunityV1Schema,
+this builds the whole response in a single query with Postgres' JSON functions.
+
+The JSON object is built from the fields of the schemas, so adding a field
+that maps to a column of the same name doesn't require any changes here.
+"""
+from typing import Any, Sequence
+
+from marshmallow import Schema
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    Text,
+    case,
+    func,
+    literal,
+    select,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+import src.adapters.db as db
+from src.api.opportunities_v1.opportunity_schemas import (
+    OpportunityAssistanceListingV1Schema,
+    OpportunitySummaryV1Schema,
+    OpportunityV1Schema,
+)
+from src.api.route_utils import raise_flask_error
+from src.api.schemas.extension import fields
+from src.db.models.lookup import LookupRegistry
+from src.db.models.opportunity_models import (
+    CurrentOpportunitySummary,
+    LinkOpportunitySummaryApplicantType,
+    LinkOpportunitySummaryFundingCategory,
+    LinkOpportunitySummaryFundingInstrument,
+    Opportunity,
+    OpportunityAssistanceListing,
+    OpportunitySummary,
+)
+
+
+def _isoformat(column: Any) -> ColumnElement[str]:
+    # The same format as datetime.isoformat() which is what the schemas
+    # use, it leaves out the microseconds if there aren't any.
+    return (
+        func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text)
+        + case(
+            (func.to_char(column, "US", type_=Text) == "000000", ""),
+            else_=func.to_char(column, ".US", type_=Text),
+        )
+        + func.to_char(column, "TZH:TZM", type_=Text)
+    )
+
+
+def _lookup_value(column: Any) -> ColumnElement[str]:
+    # Lookup columns store the ID of the lookup, which is mapped
+    # back to the value of its enum like the LookupColumn would
+    int_to_enum_map = LookupRegistry.get_lookup_config(
+        column.type.lookup_table
+    ).get_int_to_enum_map()
+
+    return case(
+        {lookup_val: lookup_enum.value for lookup_val, lookup_enum in int_to_enum_map.items()},
+        value=type_coerce(column, Integer),
+    )
+
+
+def _json_object(
+    schema: Schema, model: Any, values: dict[str, ColumnElement[Any]]
+) -> ColumnElement[Any]:
+    """Build a JSON object of a record with the fields of the schema
+
+    Any fields not in values are the column of the same name on the model.
+    """
+    args: list[Any] = []
+
+    for field_name, field in schema.dump_fields.items():
+        if field_name in values:
+            value = values[field_name]
+        else:
+            column = getattr(model, field.attribute or field_name)
+
+            if isinstance(field, fields.DateTime):
+                value = _isoformat(column)
+            elif isinstance(field, fields.Enum):
+                value = _lookup_value(column)
+            else:
+                value = column
+
+        args.extend([literal(field.data_key or field_name), value])
+
+    return func.json_build_object(*args)
+
+
+def _json_array(value: ColumnElement[Any], order_by: Any, *where: Any) -> ColumnElement[Any]:
+    return func.coalesce(
+        select(func.json_agg(aggregate_order_by(value, order_by))).where(*where).scalar_subquery(),
+        func.json_build_array(),
+    )
+
+
+def _lookup_array(link_column: Any) -> ColumnElement[Any]:
+    return _json_array(
+        _lookup_value(link_column),
+        link_column,
+        link_column.class_.opportunity_summary_id == OpportunitySummary.opportunity_summary_id,
+    )
+
+
+def _get_summary_json() -> ColumnElement[Any]:
+    summary = _json_object(
+        OpportunitySummaryV1Schema(),
+        OpportunitySummary,
+        {
+            "funding_instruments": _lookup_array(
+                LinkOpportunitySummaryFundingInstrument.funding_instrument
+            ),
+            "funding_categories": _lookup_array(
+                LinkOpportunitySummaryFundingCategory.funding_category
+            ),
+            "applicant_types": _lookup_array(LinkOpportunitySummaryApplicantType.applicant_type),
+        },
+    )
+
+    return (
+        select(summary)
+        .where(
+            OpportunitySummary.opportunity_summary_id
+            == CurrentOpportunitySummary.opportunity_summary_id
+        )
+        .scalar_subquery()
+    )
+
+
+def _get_opportunity_json() -> ColumnElement[Any]:
+    assistance_listings = _json_array(
+        _json_object(OpportunityAssistanceListingV1Schema(), OpportunityAssistanceListing, {}),
+        OpportunityAssistanceListing.opportunity_assistance_listing_id,
+        OpportunityAssistanceListing.opportunity_id == Opportunity.opportunity_id,
+    )
+
+    return _json_object(
+        OpportunityV1Schema(),
+        Opportunity,
+        {
+            "opportunity_assistance_listings": assistance_listings,
+            "summary": _get_summary_json(),
+            "opportunity_status": _lookup_value(CurrentOpportunitySummary.opportunity_status),
+        },
+    )
+
+
+def _get_opportunity_json_stmt() -> Select:
+    return (
+        select(Opportunity.opportunity_id, _get_opportunity_json())
+        .select_from(Opportunity)
+        .outerjoin(
+            CurrentOpportunitySummary,
+            Opportunity.opportunity_id == CurrentOpportunitySummary.opportunity_id,
+        )
+        .where(Opportunity.is_draft.is_(False))
+    )
+
+
+def get_opportunity_json(db_session: db.Session, opportunity_id: int) -> dict:
+    """Get an opportunity serialized the same as OpportunityV1Schema would
+
+    The lists of lookup values and assistance listings are ordered by their
+    IDs, otherwise this matches the response of the schema exactly.
+    """
+    opportunity = db_session.execute(
+        _get_opportunity_json_stmt().where(Opportunity.opportunity_id == opportunity_id)
+    ).one_or_none()
+
+    if opportunity is None:
+        raise_flask_error(404, message=f"Could not find Opportunity with ID {opportunity_id}")
+
+    return opportunity[1]
+
+
+def get_opportunities_json(
+    db_session: db.Session, opportunity_ids: Sequence[int]
+) -> dict[int, dict]:
+    """Get several opportunities serialized like get_opportunity_json, by opportunity ID
+
+    Any drafts, or IDs without an opportunity, are left out.
+    """
+    return {
+        opportunity_id: opportunity_json
+        for opportunity_id, opportunity_json in db_session.execute(
+            _get_opportunity_json_stmt().where(Opportunity.opportunity_id.in_(opportunity_ids))
+        )
+    }
@@ -0,0 +1,80 @@
+import logging
+from typing import Iterator
+
+from sqlalchemy import select
+
+import src.adapters.db as db
+from src.db.models.opportunity_models import (
+    CurrentOpportunitySummary,
+    Opportunity,
+    OpportunityDocument,
+)
+from src.services.opportunities_v1.get_opportunity import get_all_opportunity_etags
+from src.services.opportunities_v1.get_opportunity_json import get_opportunities_json
+
+logger = logging.getLogger(__name__)
+
+
+def get_opportunity_document(db_session: db.Session, opportunity_id: int, etag: str) -> dict | None:
+    """Get the precomputed API response data of an opportunity
+
+    Returns None if there isn't a document for the opportunity,
+    or if the document isn't of the current version (ETag) of the opportunity.
+    """
+    return db_session.execute(
+        select(OpportunityDocument.document).where(
+            OpportunityDocument.opportunity_id == opportunity_id,
+            OpportunityDocument.document_version == etag,
+        )
+    ).scalar_one_or_none()
+
+
+def fetch_opportunity_documents(
+    db_session: db.Session, batch_size: int = 5000
+) -> Iterator[list[dict]]:
+    """
+    Fetch the serialized opportunities in batches. The iterator returned
+    will give you each individual batch to be processed.
+
+    Fetches all opportunities where:
+        * is_draft = False
+        * current_opportunity_summary is not None
+
+    The opportunity documents are used where they're up-to-date, any opportunities
+    without a document of their current version are loaded and serialized instead.
+    """
+    etags = get_all_opportunity_etags(db_session)
+
+    batches = db_session.execute(
+        select(
+            Opportunity.opportunity_id,
+            OpportunityDocument.document,
+            OpportunityDocument.document_version,
+        )
+        .join(CurrentOpportunitySummary)
+        .outerjoin(OpportunityDocument)
+        .where(
+            Opportunity.is_draft.is_(False),
+            CurrentOpportunitySummary.opportunity_status.isnot(None),
+        )
+        .execution_options(yield_per=batch_size)
+    ).partitions()
+
+    for batch in batches:
+        documents: list[dict] = []
+        stale_opportunity_ids: list[int] = []
+
+        for opportunity_id, document, document_version in batch:
+            if document is not None and document_version == etags.get(opportunity_id):
+                documents.append(document)
+            else:
+                stale_opportunity_ids.append(opportunity_id)
+
+        if len(stale_opportunity_ids) > 0:
+            logger.info(
+                "Serializing opportunities without an up-to-date document",
+                extra={"record_count": len(stale_opportunity_ids)},
+            )
+            documents.extend(get_opportunities_json(db_session, stale_opportunity_ids).values())
+
+        yield documents
@@ -14,6 +14,7 @@ from src.search.search_models import (
     IntSearchFilter,
     StrSearchFilter,
 )
+from src.search.search_util import get_top_level_agency
 
 logger = logging.getLogger(__name__)
 
@@ -23,17 +24,21 @@ logger = logging.getLogger(__name__)
 # or for text based fields adding ".keyword" to the end to tell
 # the query we want to use the raw value rather than the tokenized one
 # See: https://opensearch.org/docs/latest/field-types/supported-field-types/keyword/
+#
+# Several of these point to fields that are derived from the summary when
+# the record is loaded into the index and are mapped directly as keyword/date
+# fields, see add_derived_search_fields in load_opportunities_to_index.py
 REQUEST_FIELD_NAME_MAPPING = {
     "opportunity_number": "opportunity_number.keyword",
     "opportunity_title": "opportunity_title.keyword",
-    "post_date": "summary.post_date",
-    "close_date": "summary.close_date",
+    "post_date": "post_date",
+    "close_date": "close_date",
     "agency_code": "agency.keyword",
     "agency": "agency.keyword",
     "opportunity_status": "opportunity_status.keyword",
-    "funding_instrument": "summary.funding_instruments.keyword",
-    "funding_category": "summary.funding_categories.keyword",
-    "applicant_type": "summary.applicant_types.keyword",
+    "funding_instrument": "funding_instrument",
+    "funding_category": "funding_category",
+    "applicant_type": "applicant_type",
     "is_cost_sharing": "summary.is_cost_sharing",
     "expected_number_of_awards": "summary.expected_number_of_awards",
     "award_floor": "summary.award_floor",
@@ -159,6 +164,29 @@ def _get_search_request(params: SearchOpportunityParams) -> dict:
     return builder.build()
 
 
+def _get_search_params(search_params: SearchOpportunityParams) -> dict:
+    """
+    Get the URL params for the search request
+    """
+    params = {}
+
+    # If the index routes opportunities to shards by their top-level agency, then
+    # a search filtered by agency only needs to query the shards for those agencies
+    # See: https://opensearch.org/docs/latest/field-types/metadata-fields/routing/
+    if (
+        get_search_config().opportunity_search_route_by_agency
+        and search_params.filters is not None
+        and search_params.filters.agency is not None
+        and search_params.filters.agency.one_of
+    ):
+        top_level_agencies = {
+            get_top_level_agency(agency) for agency in search_params.filters.agency.one_of
+        }
+        params["routing"] = ",".join(sorted(a for a in top_level_agencies if a is not None))
+
+    return params
+
+
 def search_opportunities(
     search_client: search.SearchClient, raw_search_params: dict
 ) -> Tuple[Sequence[dict], dict, PaginationInfo]:
@@ -171,7 +199,9 @@ def search_opportunities(
         "Querying search index alias %s", index_alias, extra={"search_index_alias": index_alias}
     )
 
-    response = search_client.search(index_alias, search_request)
+    response = search_client.search(
+        index_alias, search_request, params=_get_search_params(search_params)
+    )
 
     pagination_info = PaginationInfo(
         page_offset=search_params.pagination.page_offset,
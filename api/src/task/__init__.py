@@ -4,5 +4,6 @@ from src.task.task_blueprint import task_blueprint
 import src.task.opportunities.set_current_opportunities_task  # noqa: F401 E402 isort:skip
 import src.task.opportunities.import_opportunity_csvs  # noqa: F401 E402 isort:skip
 import src.task.opportunities.export_opportunity_data_task  # noqa: F401 E402 isort:skip
+import src.task.opportunities.update_opportunity_documents_task  # noqa: F401 E402 isort:skip
 
 __all__ = ["task_blueprint"]
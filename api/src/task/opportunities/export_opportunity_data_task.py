@@ -5,14 +5,11 @@ from enum import StrEnum
 from typing import Iterator, Sequence
 
 from pydantic_settings import SettingsConfigDict
-from sqlalchemy import select
-from sqlalchemy.orm import noload, selectinload
 
 import src.adapters.db as db
 import src.adapters.db.flask_db as flask_db
 import src.util.file_util as file_util
-from src.api.opportunities_v1.opportunity_schemas import OpportunityV1Schema
-from src.db.models.opportunity_models import CurrentOpportunitySummary, Opportunity
+from src.services.opportunities_v1.opportunity_document import fetch_opportunity_documents
 from src.services.opportunities_v1.opportunity_to_csv import opportunities_to_csv
 from src.task.task import Task
 from src.task.task_blueprint import task_blueprint
@@ -66,13 +63,10 @@ class ExportOpportunityDataTask(Task):
 
     def run_task(self) -> None:
         # Load records
-        schema = OpportunityV1Schema()
-
         opportunities = []
         for opp_batch in self.fetch_opportunities():
-            for record in opp_batch:
-                self.increment(self.Metrics.RECORDS_EXPORTED)
-                opportunities.append(schema.dump(record))
+            self.increment(self.Metrics.RECORDS_EXPORTED, len(opp_batch))
+            opportunities.extend(opp_batch)
 
         # Format data
         data_to_export: dict = {
@@ -84,29 +78,14 @@ class ExportOpportunityDataTask(Task):
         self.export_data_to_json(data_to_export)
         self.export_opportunities_to_csv(opportunities)
 
-    def fetch_opportunities(self) -> Iterator[Sequence[Opportunity]]:
+    def fetch_opportunities(self) -> Iterator[list[dict]]:
         """
-        Fetch the opportunities in batches. The iterator returned
+        Fetch the serialized opportunities in batches. The iterator returned
         will give you each individual batch to be processed.
 
-        Fetches all opportunities where:
-            * is_draft = False
-            * current_opportunity_summary is not None
+        See fetch_opportunity_documents for which opportunities are fetched.
         """
-        return (
-            self.db_session.execute(
-                select(Opportunity)
-                .join(CurrentOpportunitySummary)
-                .where(
-                    Opportunity.is_draft.is_(False),
-                    CurrentOpportunitySummary.opportunity_status.isnot(None),
-                )
-                .options(selectinload("*"), noload(Opportunity.all_opportunity_summaries))
-                .execution_options(yield_per=5000)
-            )
-            .scalars()
-            .partitions()
-        )
+        return fetch_opportunity_documents(self.db_session)
 
     def export_data_to_json(self, data_to_export: dict) -> None:
         # create the json file
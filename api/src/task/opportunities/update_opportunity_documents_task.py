@@ -0,0 +1,122 @@
+import itertools
+import logging
+from enum import StrEnum
+from typing import Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+import src.adapters.db as db
+import src.adapters.db.flask_db as flask_db
+from src.db.models.opportunity_models import OpportunityDocument
+from src.services.opportunities_v1.get_opportunity import get_all_opportunity_etags
+from src.services.opportunities_v1.get_opportunity_json import get_opportunities_json
+from src.task.task import Task
+from src.task.task_blueprint import task_blueprint
+from src.util import datetime_util
+
+logger = logging.getLogger(__name__)
+
+
+@task_blueprint.cli.command(
+    "update-opportunity-documents",
+    help="For each opportunity in the database create/update its serialized opportunity document",
+)
+@flask_db.with_db_session()
+def update_opportunity_documents(db_session: db.Session) -> None:
+    UpdateOpportunityDocumentsTask(db_session).run()
+
+
+class UpdateOpportunityDocumentsTask(Task):
+    """
+    Keep the opportunity_document table in sync with the opportunities.
+
+    Only the opportunities that changed since their document was made are
+    serialized again, which we know by comparing the version of each document
+    to the current ETag of its opportunity. Documents of opportunities that
+    no longer exist or became drafts are deleted.
+    """
+
+    class Metrics(StrEnum):
+        OPPORTUNITY_COUNT = "opportunity_count"
+
+        NEW_DOCUMENT_COUNT = "new_document_count"
+        UPDATED_DOCUMENT_COUNT = "updated_document_count"
+        UNMODIFIED_DOCUMENT_COUNT = "unmodified_document_count"
+        DELETED_DOCUMENT_COUNT = "deleted_document_count"
+
+    def __init__(self, db_session: db.Session, batch_size: int = 1000) -> None:
+        super().__init__(db_session)
+        self.batch_size = batch_size
+
+    def run_task(self) -> None:
+        with self.db_session.begin():
+            self.update_documents()
+
+    def update_documents(self) -> None:
+        # The ETags are fetched before loading any opportunities. If an opportunity
+        # changes while this runs, its document will be newer than its version says,
+        # which just means it's serialized again on the next run.
+        etags = get_all_opportunity_etags(self.db_session)
+        self.increment(self.Metrics.OPPORTUNITY_COUNT, len(etags))
+
+        existing_versions: dict[int, str] = {
+            opportunity_id: document_version
+            for opportunity_id, document_version in self.db_session.execute(
+                select(OpportunityDocument.opportunity_id, OpportunityDocument.document_version)
+            )
+        }
+
+        opportunity_ids_to_update = []
+        for opportunity_id, etag in etags.items():
+            existing_version = existing_versions.get(opportunity_id)
+
+            if existing_version is None:
+                self.increment(self.Metrics.NEW_DOCUMENT_COUNT)
+            elif existing_version != etag:
+                self.increment(self.Metrics.UPDATED_DOCUMENT_COUNT)
+            else:
+                self.increment(self.Metrics.UNMODIFIED_DOCUMENT_COUNT)
+                continue
+
+            opportunity_ids_to_update.append(opportunity_id)
+
+        for batch in itertools.batched(opportunity_ids_to_update, self.batch_size):
+            self.upsert_documents(batch, etags)
+
+        opportunity_ids_to_delete = existing_versions.keys() - etags.keys()
+        for batch in itertools.batched(opportunity_ids_to_delete, self.batch_size):
+            self.db_session.execute(
+                delete(OpportunityDocument).where(OpportunityDocument.opportunity_id.in_(batch))
+            )
+        self.increment(self.Metrics.DELETED_DOCUMENT_COUNT, len(opportunity_ids_to_delete))
+
+    def upsert_documents(self, opportunity_ids: Sequence[int], etags: dict[int, str]) -> None:
+        logger.info("Serializing batch of opportunity documents...")
+
+        documents = [
+            {
+                "opportunity_id": opportunity_id,
+                "document": opportunity_json,
+                "document_version": etags[opportunity_id],
+            }
+            for opportunity_id, opportunity_json in get_opportunities_json(
+                self.db_session, opportunity_ids
+            ).items()
+        ]
+
+        if len(documents) == 0:
+            return
+
+        insert_stmt = insert(OpportunityDocument)
+        self.db_session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[OpportunityDocument.opportunity_id],
+                set_={
+                    "document": insert_stmt.excluded.document,
+                    "document_version": insert_stmt.excluded.document_version,
+                    "updated_at": datetime_util.utcnow(),
+                },
+            ),
+            documents,
+        )
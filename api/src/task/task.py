@@ -5,6 +5,7 @@ from enum import StrEnum
 from typing import Any
 
 import src.adapters.db as db
+import src.adapters.db.query_stats as query_stats
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class Task(abc.ABC, metaclass=abc.ABCMeta):
     This approach handles a few basic patterns including:
     - Simple metric aggregation & logging
     - Timing metrics
+    - SQL statement count & timing metrics
     - High-level error handling
     """
 
@@ -37,8 +39,10 @@ class Task(abc.ABC, metaclass=abc.ABCMeta):
             # Initialize the metrics
             self.initialize_metrics()
 
-            # Run the actual task
-            self.run_task()
+            # Run the actual task, tracking the SQL statements it runs
+            with query_stats.track_query_stats() as stats:
+                self.run_task()
+            self.set_metrics(stats.get_metrics())
 
             # Calculate and set a duration
             end = time.perf_counter()
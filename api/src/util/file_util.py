@@ -1,8 +1,11 @@
+import dataclasses
 import os
+from datetime import datetime, timezone
 from pathlib import PosixPath
-from typing import Any, Optional, Tuple
+from typing import Any, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
+import boto3
 import smart_open
 from botocore.config import Config
 
@@ -43,16 +46,64 @@ def join(*parts: str) -> str:
 ##################################
 
 
+def _get_s3_client_config() -> Config:
+    return Config(
+        max_pool_connections=10,
+        connect_timeout=60,
+        read_timeout=60,
+        retries={"max_attempts": 10},
+    )
+
+
 def open_stream(path: str, mode: str = "r", encoding: str | None = None) -> Any:
     if is_s3_path(path):
-        so_config = Config(
-            max_pool_connections=10,
-            connect_timeout=60,
-            read_timeout=60,
-            retries={"max_attempts": 10},
-        )
-        so_transport_params = {"client_kwargs": {"config": so_config}}
+        so_transport_params = {"client_kwargs": {"config": _get_s3_client_config()}}
 
         return smart_open.open(path, mode, transport_params=so_transport_params, encoding=encoding)
     else:
         return smart_open.open(path, mode, encoding=encoding)
+
+
+@dataclasses.dataclass
+class FileInfo:
+    path: str
+    size_bytes: int
+    last_modified: datetime
+
+
+def list_files(path: str) -> Iterator[FileInfo]:
+    """
+    Recursively list every file under a local directory or S3 prefix
+    """
+    if is_s3_path(path):
+        bucket_name, prefix = split_s3_url(path)
+        # Make sure a prefix of "folder" doesn't also match "folder2/..."
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+
+        # Use the same client config as smart_open in open_stream, so listing
+        # a large prefix gets the same timeouts and retries as reading from it
+        s3_client = boto3.client("s3", config=_get_s3_client_config())
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for s3_object in page.get("Contents", []):
+                # Skip the placeholder objects some tools create for "folders"
+                if s3_object["Key"].endswith("/"):
+                    continue
+
+                yield FileInfo(
+                    path=f"s3://{bucket_name}/{s3_object['Key']}",
+                    size_bytes=s3_object["Size"],
+                    last_modified=s3_object["LastModified"],
+                )
+    else:
+        for dir_path, _, file_names in os.walk(path):
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                stat = os.stat(file_path)
+
+                yield FileInfo(
+                    path=file_path,
+                    size_bytes=stat.st_size,
+                    last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                )
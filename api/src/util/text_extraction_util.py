@@ -0,0 +1,162 @@
+"""Utilities for extracting the plain text from a file so that it can be searched.
+
+The extraction is written to run inside a worker process (see extract_text_with_limits)
+and intentionally only imports what it needs so that new worker processes start quickly.
+"""
+import io
+import os
+import signal
+import zipfile
+from html.parser import HTMLParser
+from types import FrameType
+from xml.etree import ElementTree
+
+import src.util.file_util as file_util
+
+PLAIN_TEXT_EXTENSIONS = {".txt", ".text", ".csv", ".md"}
+HTML_EXTENSIONS = {".html", ".htm"}
+DOCX_EXTENSIONS = {".docx"}
+
+SUPPORTED_EXTENSIONS = PLAIN_TEXT_EXTENSIONS | HTML_EXTENSIONS | DOCX_EXTENSIONS
+
+DOCX_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedFileTypeError(Exception):
+    pass
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+class ExtractionTimeoutError(Exception):
+    pass
+
+
+def is_supported_file(file_path: str) -> bool:
+    return _get_extension(file_path) in SUPPORTED_EXTENSIONS
+
+
+def extract_text_with_limits(
+    file_path: str, max_file_size_bytes: int, timeout_seconds: float
+) -> str:
+    """
+    Read a file (local or S3) and extract its text, raising an
+    error if the file is larger than max_file_size_bytes, or if reading
+    and extracting the file takes longer than timeout_seconds.
+
+    The timeout is implemented with a SIGALRM timer, so this must be called
+    from the main thread of a process, for example a ProcessPoolExecutor worker.
+    """
+    if not is_supported_file(file_path):
+        raise UnsupportedFileTypeError("Unsupported file type: %s" % file_path)
+
+    def _handle_timeout(signum: int, frame: FrameType | None) -> None:
+        raise ExtractionTimeoutError(
+            "Extracting text took longer than %s seconds: %s" % (timeout_seconds, file_path)
+        )
+
+    previous_handler = signal.signal(signal.SIGALRM, _handle_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        with file_util.open_stream(file_path, "rb") as input_file:
+            # Read one byte past the limit so we can tell if the file was too large
+            # without reading the entire file into memory
+            contents = input_file.read(max_file_size_bytes + 1)
+
+        if len(contents) > max_file_size_bytes:
+            raise FileTooLargeError(
+                "File is larger than %s bytes: %s" % (max_file_size_bytes, file_path)
+            )
+
+        return extract_text(file_path, contents, max_extracted_size_bytes=max_file_size_bytes)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def extract_text(
+    file_path: str, contents: bytes, max_extracted_size_bytes: int | None = None
+) -> str:
+    """
+    Extract the text from the contents of a file, based on the extension of the file
+
+    For compressed formats like docx, raises an error if the decompressed content
+    the text is extracted from is larger than max_extracted_size_bytes.
+    """
+    extension = _get_extension(file_path)
+
+    if extension in PLAIN_TEXT_EXTENSIONS:
+        return contents.decode("utf-8", errors="replace")
+
+    if extension in HTML_EXTENSIONS:
+        return _extract_html_text(contents.decode("utf-8", errors="replace"))
+
+    if extension in DOCX_EXTENSIONS:
+        return _extract_docx_text(contents, max_extracted_size_bytes)
+
+    raise UnsupportedFileTypeError("Unsupported file type: %s" % file_path)
+
+
+def _get_extension(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lower()
+
+
+class _HTMLTextParser(HTMLParser):
+    # Tags whose content isn't text that a user would see
+    IGNORED_TAGS = {"script", "style", "head"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.text_parts: list[str] = []
+        self.ignored_tag_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self.IGNORED_TAGS:
+            self.ignored_tag_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.IGNORED_TAGS and self.ignored_tag_depth > 0:
+            self.ignored_tag_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self.ignored_tag_depth == 0 and data.strip():
+            self.text_parts.append(data.strip())
+
+
+def _extract_html_text(html: str) -> str:
+    parser = _HTMLTextParser()
+    parser.feed(html)
+    parser.close()
+
+    return "\n".join(parser.text_parts)
+
+
+def _extract_docx_text(contents: bytes, max_xml_size_bytes: int | None) -> str:
+    # A docx file is a zip file, with the body of the document stored as XML
+    # See: https://learn.microsoft.com/en-us/office/open-xml/word/structure-of-a-wordprocessingml-document
+    with zipfile.ZipFile(io.BytesIO(contents)) as docx_file:
+        # A small zip file can decompress to a huge one, so check the
+        # size of the XML before decompressing it. Reading from the zip file
+        # stops at this size (and then fails) if the actual content is larger.
+        xml_size = docx_file.getinfo("word/document.xml").file_size
+        if max_xml_size_bytes is not None and xml_size > max_xml_size_bytes:
+            raise FileTooLargeError(
+                "Document XML is larger than %s bytes when decompressed" % max_xml_size_bytes
+            )
+
+        document_xml = docx_file.read("word/document.xml")
+
+    # The bundled expat parser guards against entity expansion attacks
+    root = ElementTree.fromstring(document_xml)  # nosec B314
+
+    paragraphs = []
+    for paragraph in root.iter(f"{DOCX_NAMESPACE}p"):
+        paragraph_text = "".join(
+            text_element.text or "" for text_element in paragraph.iter(f"{DOCX_NAMESPACE}t")
+        )
+        if paragraph_text:
+            paragraphs.append(paragraph_text)
+
+    return "\n".join(paragraphs)
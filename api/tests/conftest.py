@@ -17,6 +17,7 @@ from src.db import models
 from src.db.models.lookup.sync_lookup_values import sync_lookup_values
 from src.db.models.opportunity_models import Opportunity
 from src.db.models.staging import metadata as staging_metadata
+from src.search.backend.load_opportunities_to_index import OPPORTUNITY_INDEX_MAPPINGS
 from src.util.local import load_local_env_vars
 from tests.lib import db_testing
 
@@ -167,7 +168,7 @@ def opportunity_index(search_client):
     # with an actual one, similar to how we create schemas for database tests
     index_name = f"test-opportunity-index-{uuid.uuid4().int}"
 
-    search_client.create_index(index_name)
+    search_client.create_index(index_name, mappings=OPPORTUNITY_INDEX_MAPPINGS)
 
     try:
         yield index_name
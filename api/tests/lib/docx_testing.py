@@ -0,0 +1,16 @@
+"""Helper functions for testing code that reads docx files."""
+import io
+import zipfile
+
+
+def build_docx(paragraphs: list[str]) -> bytes:
+    # A minimal docx file, only containing the document body
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>" for paragraph in paragraphs)
+    document_xml = f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>'
+
+    contents = io.BytesIO()
+    with zipfile.ZipFile(contents, "w", zipfile.ZIP_DEFLATED) as docx_file:
+        docx_file.writestr("word/document.xml", document_xml)
+
+    return contents.getvalue()
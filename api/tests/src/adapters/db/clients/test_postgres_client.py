@@ -3,6 +3,7 @@ from dataclasses import dataclass
 
 import pytest
 
+import src.adapters.db.clients.postgres_client as postgres_client
 from src.adapters.db.clients.postgres_client import get_connection_parameters, verify_ssl
 from src.adapters.db.clients.postgres_config import get_db_config
 
@@ -50,4 +51,87 @@ def test_get_connection_parameters(monkeypatch: pytest.MonkeyPatch):
         port=db_config.port,
         connect_timeout=10,
         sslmode="require",
+        prepare_threshold=5,
     )
+
+
+@pytest.mark.parametrize(
+    "prepare_threshold,pgbouncer_transaction_pooling,expected_prepare_threshold",
+    [("0", "False", 0), ("0", "True", None), ("10", "False", 10)],
+)
+def test_get_connection_parameters_prepare_threshold(
+    monkeypatch: pytest.MonkeyPatch,
+    prepare_threshold,
+    pgbouncer_transaction_pooling,
+    expected_prepare_threshold,
+):
+    monkeypatch.setenv("DB_PREPARE_THRESHOLD", prepare_threshold)
+    monkeypatch.setenv("DB_PGBOUNCER_TRANSACTION_POOLING", pgbouncer_transaction_pooling)
+
+    conn_params = get_connection_parameters(get_db_config())
+    assert conn_params["prepare_threshold"] == expected_prepare_threshold
+
+
+@pytest.fixture
+def clear_iam_auth_tokens(monkeypatch):
+    monkeypatch.setattr(postgres_client, "_iam_auth_tokens", {})
+
+
+def test_get_iam_auth_token_is_cached(reset_aws_env_vars, clear_iam_auth_tokens, monkeypatch):
+    generated_tokens = []
+
+    def generate_iam_auth_token(*args):
+        generated_tokens.append(args)
+        return f"token-{len(generated_tokens)}"
+
+    monkeypatch.setattr(postgres_client, "generate_iam_auth_token", generate_iam_auth_token)
+
+    args = ("us-east-1", "localhost", 5432, "app")
+    assert postgres_client.get_iam_auth_token(*args) == "token-1"
+    assert postgres_client.get_iam_auth_token(*args) == "token-1"
+    # A different user gets its own token
+    assert postgres_client.get_iam_auth_token("us-east-1", "localhost", 5432, "other") == "token-2"
+
+    # Once the token is close to expiring, a new one is generated
+    token, generated_at = postgres_client._iam_auth_tokens[args]
+    postgres_client._iam_auth_tokens[args] = (
+        token,
+        generated_at - postgres_client.IAM_AUTH_TOKEN_REUSE_SECONDS,
+    )
+    assert postgres_client.get_iam_auth_token(*args) == "token-3"
+    assert len(generated_tokens) == 3
+
+
+def test_generate_iam_auth_token_reuses_client(reset_aws_env_vars):
+    token = postgres_client.generate_iam_auth_token("us-east-1", "localhost", 5432, "app")
+    assert token.startswith("localhost:5432/?Action=connect")
+
+    rds_client = postgres_client._get_rds_client("us-east-1")
+    postgres_client.generate_iam_auth_token("us-east-1", "localhost", 5432, "app")
+    assert postgres_client._get_rds_client("us-east-1") is rds_client
+
+
+def test_get_connection_parameters_iam_auth(
+    reset_aws_env_vars, clear_iam_auth_tokens, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.delenv("DB_PASSWORD")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setenv("DB_HOST", "localhost")
+    db_config = get_db_config()
+
+    conn_params = get_connection_parameters(db_config)
+    assert conn_params["password"].startswith(f"{db_config.host}:{db_config.port}/?Action=connect")
+    assert get_connection_parameters(db_config)["password"] == conn_params["password"]
+
+
+def test_get_pool_saturation(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_MAX_OVERFLOW", "1")
+    db_client = postgres_client.PostgresDBClient()
+
+    assert db_client.get_pool_saturation() == 0
+
+    with db_client.get_connection(), db_client.get_connection():
+        assert db_client.get_pool_saturation() == 0.5
+
+    assert db_client.get_pool_saturation() == 0
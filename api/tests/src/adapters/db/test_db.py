@@ -1,3 +1,6 @@
+import os
+import time
+
 import pytest
 from sqlalchemy import text
 
@@ -21,3 +24,221 @@ def test_get_session():
     with db_client.get_session() as session:
         with session.begin():
             assert session.scalar(text("SELECT 1")) == 1
+
+
+@pytest.fixture
+def replica_db_client(monkeypatch: pytest.MonkeyPatch) -> db.PostgresDBClient:
+    # Point the replica at the same database, which isn't in recovery
+    # so always reports that it's caught up
+    monkeypatch.setenv("DB_REPLICA_HOST", db.PostgresDBConfig().host)
+    monkeypatch.setenv("DB_REPLICA_TYPE", "postgres")
+    return db.PostgresDBClient()
+
+
+@pytest.fixture
+def streaming_replica_db_client(monkeypatch: pytest.MonkeyPatch) -> db.PostgresDBClient:
+    # A real streaming replica of the test database, see grants-db-replica in docker-compose.yml
+    replica_host = os.getenv("TEST_DB_REPLICA_HOST")
+    if replica_host is None:
+        pytest.skip("TEST_DB_REPLICA_HOST is not set")
+
+    monkeypatch.setenv("DB_REPLICA_HOST", replica_host)
+    if replica_port := os.getenv("TEST_DB_REPLICA_PORT"):
+        monkeypatch.setenv("DB_REPLICA_PORT", replica_port)
+    monkeypatch.setenv("DB_REPLICA_TYPE", "postgres")
+    db_client = db.PostgresDBClient()
+
+    # The replica may still be copying the primary if it was just started
+    for _ in range(30):
+        if db_client._get_replica_lag_seconds() is not None:
+            break
+        time.sleep(1)
+
+    return db_client
+
+
+def test_get_session_read_only_no_replica():
+    db_client = db.PostgresDBClient()
+    with db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is db_client._engine
+
+
+def test_get_session_read_only_uses_replica(replica_db_client):
+    with replica_db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is replica_db_client._replica_engine
+        with session.begin():
+            assert session.scalar(text("SELECT 1")) == 1
+
+    with replica_db_client.get_session() as session:
+        assert session.get_bind() is replica_db_client._engine
+
+    with replica_db_client.get_connection(read_only=True) as conn:
+        assert conn.engine is replica_db_client._replica_engine
+
+
+@pytest.mark.parametrize("lag_seconds", [None, 31.0])
+def test_get_session_read_only_replica_behind(replica_db_client, monkeypatch, lag_seconds):
+    monkeypatch.setattr(replica_db_client, "_get_replica_lag_seconds", lambda: lag_seconds)
+
+    with replica_db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is replica_db_client._engine
+
+
+def test_get_session_read_only_replica_unreachable(monkeypatch: pytest.MonkeyPatch, caplog):
+    monkeypatch.setenv("DB_REPLICA_HOST", db.PostgresDBConfig().host)
+    monkeypatch.setenv("DB_REPLICA_PORT", "1")
+    db_client = db.PostgresDBClient()
+
+    with db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is db_client._engine
+        with session.begin():
+            assert session.scalar(text("SELECT 1")) == 1
+
+    assert "Failed to check database replica lag" in caplog.messages
+
+
+def test_get_session_read_only_aurora_replica_type(monkeypatch: pytest.MonkeyPatch, caplog):
+    # The Aurora lag check doesn't work against plain Postgres,
+    # so reads stay on the primary
+    monkeypatch.setenv("DB_REPLICA_HOST", db.PostgresDBConfig().host)
+    monkeypatch.setenv("DB_REPLICA_TYPE", "aurora")
+    db_client = db.PostgresDBClient()
+
+    with db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is db_client._engine
+
+    assert "Failed to check database replica lag" in caplog.messages
+
+
+def test_streaming_replica_caught_up(streaming_replica_db_client):
+    db_client = streaming_replica_db_client
+
+    with db_client.get_session(read_only=True) as session:
+        assert session.get_bind() is db_client._replica_engine
+        with session.begin():
+            assert session.scalar(text("SELECT pg_is_in_recovery()")) is True
+
+
+def test_streaming_replica_behind(streaming_replica_db_client):
+    db_client = streaming_replica_db_client
+    db_client._replica_max_lag_seconds = 0
+
+    with db_client._replica_engine.connect() as replica_conn:
+        replica_conn.execute(text("SELECT pg_wal_replay_pause()"))
+        replica_conn.commit()
+
+        try:
+            # Commit a transaction on the primary, which the
+            # replica receives but doesn't replay while paused
+            with db_client.get_connection() as conn, conn.begin():
+                conn.execute(text("SELECT pg_current_xact_id()"))
+
+            for _ in range(50):
+                is_behind = replica_conn.scalar(
+                    text("SELECT pg_last_wal_receive_lsn() != pg_last_wal_replay_lsn()")
+                )
+                replica_conn.commit()
+                if is_behind:
+                    break
+                time.sleep(0.1)
+
+            lag_seconds = db_client._get_replica_lag_seconds()
+            assert lag_seconds is None or lag_seconds > 0
+
+            with db_client.get_session(read_only=True) as session:
+                assert session.get_bind() is db_client._engine
+        finally:
+            replica_conn.execute(text("SELECT pg_wal_replay_resume()"))
+            replica_conn.commit()
+
+
+def test_replica_lag_check_is_cached(replica_db_client, monkeypatch):
+    lag_checks = []
+
+    def get_replica_lag_seconds():
+        lag_checks.append(1)
+        return 0.0
+
+    monkeypatch.setattr(replica_db_client, "_get_replica_lag_seconds", get_replica_lag_seconds)
+
+    for _ in range(3):
+        with replica_db_client.get_session(read_only=True) as session:
+            assert session.get_bind() is replica_db_client._replica_engine
+
+    assert len(lag_checks) == 1
+
+    # Once the interval has passed, the lag is checked again
+    replica_db_client._replica_lag_checked_at -= (
+        replica_db_client._replica_lag_check_interval_seconds
+    )
+    with replica_db_client.get_session(read_only=True):
+        pass
+
+    assert len(lag_checks) == 2
+
+
+def test_pool_config(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "5")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "True")
+    db_client = db.PostgresDBClient()
+
+    conn_pool = db_client._engine.pool
+    assert conn_pool.size() == 4
+    assert conn_pool._max_overflow == 2
+    assert conn_pool._timeout == 5
+    assert conn_pool._recycle == 600
+    assert conn_pool._pre_ping is True
+
+    with db_client.get_connection() as conn:
+        assert conn.scalar(text("SELECT 1")) == 1
+
+
+def test_pool_prefill(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_PREFILL_SIZE", "3")
+    db_client = db.PostgresDBClient()
+
+    conn_pool = db_client._engine.pool
+    assert conn_pool.checkedin() == 3
+    assert conn_pool.checkedout() == 0
+
+
+def test_pool_prefill_limited_to_pool_size(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "2")
+    monkeypatch.setenv("DB_POOL_PREFILL_SIZE", "5")
+    monkeypatch.setenv("DB_REPLICA_HOST", db.PostgresDBConfig().host)
+    db_client = db.PostgresDBClient()
+
+    assert db_client._engine.pool.checkedin() == 2
+    assert db_client._replica_engine.pool.checkedin() == 2
+
+
+def test_pool_prefill_failure_is_logged(monkeypatch: pytest.MonkeyPatch, caplog):
+    monkeypatch.setenv("DB_POOL_PREFILL_SIZE", "2")
+    monkeypatch.setenv("DB_PORT", "1")
+    db_client = db.PostgresDBClient()
+
+    assert db_client._engine.pool.checkedin() == 0
+    assert "Failed to prefill database connection pool" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "pgbouncer_transaction_pooling,is_prepared", [("False", True), ("True", False)]
+)
+def test_prepared_statements(
+    monkeypatch: pytest.MonkeyPatch, pgbouncer_transaction_pooling, is_prepared
+):
+    monkeypatch.setenv("DB_PREPARE_THRESHOLD", "0")
+    monkeypatch.setenv("DB_PGBOUNCER_TRANSACTION_POOLING", pgbouncer_transaction_pooling)
+    db_client = db.PostgresDBClient()
+
+    with db_client.get_connection() as conn:
+        conn.execute(text("SELECT 'prepared statement test'"))
+        prepared_statements = conn.scalars(
+            text("SELECT statement FROM pg_prepared_statements")
+        ).all()
+
+    assert ("SELECT 'prepared statement test'" in prepared_statements) is is_prepared
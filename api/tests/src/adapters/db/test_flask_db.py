@@ -1,9 +1,13 @@
+import logging
+import sys
+
 import pytest
 from flask import Flask, current_app
 from sqlalchemy import text
 
 import src.adapters.db as db
 import src.adapters.db.flask_db as flask_db
+import src.logging.flask_logger as flask_logger
 
 
 # Define an isolated example Flask app fixture specific to this test module
@@ -49,3 +53,48 @@ def test_with_db_session_not_default_name(example_app: Flask):
 
     response = example_app.test_client().get("/hello")
     assert response.get_json() == {"data": "hello, world"}
+
+
+def test_request_logs_query_stats(caplog):
+    logger = logging.getLogger("src")
+    handler = logging.StreamHandler(sys.stdout)
+    logger.addHandler(handler)
+
+    # The flask logger needs to be setup first for the stats to be on the end request log
+    app = Flask(__name__)
+    flask_logger.init_app(logger, app)
+    flask_db.register_db_client(db.PostgresDBClient(), app)
+
+    @app.route("/hello")
+    @flask_db.with_db_session()
+    def hello(db_session: db.Session):
+        with db_session.begin():
+            db_session.execute(text("SELECT 1"))
+            return {"data": db_session.scalar(text("SELECT 'hello, world'"))}
+
+    caplog.set_level(logging.INFO)
+    app.test_client().get("/hello")
+    logger.removeHandler(handler)
+
+    end_request_record = [r for r in caplog.records if r.msg == "end request"][0]
+    # BEGIN/COMMIT aren't run as statements so aren't counted
+    assert end_request_record.__dict__["db.statement_count"] == 2
+    assert end_request_record.__dict__["db.duration_ms"] > 0
+
+
+def test_with_db_session_read_only(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_REPLICA_HOST", db.PostgresDBConfig().host)
+    monkeypatch.setenv("DB_REPLICA_TYPE", "postgres")
+    db_client = db.PostgresDBClient()
+    app = Flask(__name__)
+    flask_db.register_db_client(db_client, app)
+
+    @app.route("/hello")
+    @flask_db.with_db_session(read_only=True)
+    def hello(db_session: db.Session):
+        assert db_session.get_bind() is db_client._replica_engine
+        with db_session.begin():
+            return {"data": db_session.scalar(text("SELECT 'hello, world'"))}
+
+    response = app.test_client().get("/hello")
+    assert response.get_json() == {"data": "hello, world"}
@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+import sqlalchemy
+from sqlalchemy import text
+
+import src.adapters.db as db
+import src.adapters.db.query_stats as query_stats
+
+
+def test_track_query_stats(db_client):
+    with db_client.get_connection() as conn:
+        # Statements outside of any tracking aren't recorded anywhere
+        conn.execute(text("SELECT 1"))
+
+        with query_stats.track_query_stats() as stats:
+            assert query_stats.get_current_query_stats() is stats
+
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+    assert query_stats.get_current_query_stats() is None
+
+    assert stats.statement_count == 3
+    assert stats.duration_ms > 0
+    assert stats.statement_counts == {"SELECT 1": 2, "SELECT 2": 1}
+
+    metrics = stats.get_metrics()
+    assert metrics["db.statement_count"] == 3
+    assert metrics["db.distinct_statement_count"] == 2
+
+
+def test_track_query_stats_nested(db_client):
+    with db_client.get_connection() as conn:
+        with query_stats.track_query_stats() as outer_stats:
+            conn.execute(text("SELECT 1"))
+
+            with query_stats.track_query_stats() as inner_stats:
+                conn.execute(text("SELECT 2"))
+
+    assert outer_stats.statement_count == 2
+    assert inner_stats.statement_count == 1
+
+
+def test_track_query_stats_statement_error(db_client):
+    with db_client.get_connection() as conn:
+        with query_stats.track_query_stats() as stats:
+            with pytest.raises(sqlalchemy.exc.ProgrammingError):
+                conn.execute(text("SELECT * FROM table_that_does_not_exist"))
+
+    # A failed statement isn't counted
+    assert stats.statement_count == 0
+
+
+@pytest.mark.parametrize("statement_count,expect_warning", [(3, False), (4, True), (10, True)])
+def test_track_query_stats_repeated_statement_warning(
+    monkeypatch, caplog, statement_count, expect_warning
+):
+    monkeypatch.setenv("DB_REPEATED_STATEMENT_WARNING_THRESHOLD", "3")
+    db_client = db.PostgresDBClient()
+    caplog.set_level(logging.WARNING)
+
+    with db_client.get_connection() as conn:
+        with query_stats.track_query_stats():
+            for _ in range(statement_count):
+                conn.execute(text("SELECT 1"))
+
+    warnings = [record for record in caplog.records if record.name == "src.adapters.db.query_stats"]
+    # We only warn once per statement, no matter how many more times it runs
+    assert len(warnings) == (1 if expect_warning else 0)
+    if expect_warning:
+        assert warnings[0].__dict__["db.repeated_statement"] == "SELECT 1"
+
+
+def test_track_query_stats_new_connections():
+    # A new client so the connection isn't already in the pool
+    db_client = db.PostgresDBClient()
+
+    with query_stats.track_query_stats() as outer_stats:
+        with query_stats.track_query_stats() as stats:
+            with db_client.get_connection() as conn:
+                conn.execute(text("SELECT 1"))
+
+            # Reuses the pooled connection
+            with db_client.get_connection() as conn:
+                conn.execute(text("SELECT 1"))
+
+    for s in [stats, outer_stats]:
+        assert s.connection_count == 1
+        assert s.connection_duration_ms > 0
+
+    metrics = stats.get_metrics()
+    assert metrics["db.connection_count"] == 1
+    assert metrics["db.connection_duration_ms"] > 0
@@ -58,3 +58,18 @@ def test_lookup_column_process_result_type_invalid():
     lookup_column = LookupColumn(LkOpportunityCategory)
     with pytest.raises(Exception, match="Cannot process value from DB of type"):
         lookup_column.process_result_value("hello", None)
+
+
+def test_lookup_column_result_processor():
+    lookup_column = LookupColumn(LkOpportunityCategory)
+    process = lookup_column.result_processor(None, None)
+
+    assert [process(value) for value in [3, None, 4, 1000]] == [
+        OpportunityCategory.CONTINUATION,
+        None,
+        OpportunityCategory.EARMARK,
+        None,
+    ]
+
+    with pytest.raises(Exception, match="Cannot process value from DB of type"):
+        process("hello")
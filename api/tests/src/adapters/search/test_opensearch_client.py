@@ -2,6 +2,9 @@ import uuid
 
 import pytest
 
+from src.adapters.search.opensearch_client import _get_connection_parameters
+from src.adapters.search.opensearch_config import OpensearchConfig
+
 ########################################################################
 # These tests are primarily looking to validate
 # that our wrappers around the OpenSearch client
@@ -84,6 +87,60 @@ def test_bulk_delete(search_client, generic_index):
     assert resp.records == []
 
 
+def test_bulk_upsert_and_delete_with_routing(search_client):
+    index_name = f"test-index-{uuid.uuid4().int}"
+    search_client.create_index(index_name, shard_count=3)
+
+    records = [
+        {"id": 1, "author": "Dr. Seuss", "title": "Green Eggs & Ham"},
+        {"id": 2, "author": "Dr. Seuss", "title": "The Cat in the Hat"},
+        {"id": 3, "author": "Shel Silverstein", "title": "The Giving Tree"},
+        {"id": 4, "author": None, "title": "Goodnight Moon"},
+    ]
+    search_client.bulk_upsert(index_name, records, primary_key_field="id", routing_field="author")
+
+    # The records with a routing value can be fetched when using the same routing
+    for record in records[:3]:
+        resp = search_client._client.get(index_name, record["id"], routing=record["author"])
+        assert resp["_source"] == record
+        assert resp["_routing"] == record["author"]
+
+    # Searching with a routing value only returns records on that shard
+    resp = search_client.search(
+        index_name, {}, include_scores=False, params={"routing": "Dr. Seuss"}
+    )
+    assert set([1, 2]).issubset(set([record["id"] for record in resp.records]))
+
+    # Deleting requires the routing value the records were upserted with
+    search_client.bulk_delete(
+        index_name, [1, 3, 4], routing={1: "Dr. Seuss", 3: "Shel Silverstein", 4: None}
+    )
+    resp = search_client.search(index_name, {}, include_scores=False)
+    assert resp.records == [records[1]]
+
+    search_client.delete_index(index_name)
+
+
+def test_reindex(search_client, generic_index):
+    records = [
+        {"id": 1, "title": "Green Eggs & Ham", "notes": "why are the eggs green?"},
+        {"id": 2, "title": "The Cat in the Hat", "notes": "silly cat wears a hat"},
+        {"id": 3, "title": "One Fish, Two Fish, Red Fish, Blue Fish", "notes": "fish"},
+    ]
+    search_client.bulk_upsert(generic_index, records, primary_key_field="id")
+
+    dest_index = f"test-index-{uuid.uuid4().int}"
+    search_client.create_index(dest_index, shard_count=2)
+
+    response = search_client.reindex(generic_index, dest_index, poll_interval_seconds=0.1)
+    assert response["created"] == len(records)
+
+    resp = search_client.search(dest_index, {}, include_scores=False)
+    assert sorted(resp.records, key=lambda r: r["id"]) == records
+
+    search_client.delete_index(dest_index)
+
+
 def test_swap_alias_index(search_client, generic_index):
     alias_name = f"tmp-alias-{uuid.uuid4().int}"
 
@@ -193,3 +250,9 @@ def test_scroll(search_client, generic_index):
     assert len(results[0].records) == 3
     assert len(results[1].records) == 3
     assert len(results[2].records) == 2
+
+
+def test_get_connection_parameters_pool_maxsize():
+    opensearch_config = OpensearchConfig(host="localhost", port=9200, pool_maxsize=100)
+
+    assert _get_connection_parameters(opensearch_config)["pool_maxsize"] == 100
@@ -269,6 +269,8 @@ def validate_search_pagination(
 
     assert pagination_info["total_pages"] == expected_total_pages
     assert pagination_info["total_records"] == expected_total_records
+    # Our test datasets are small enough that the counts are always exact
+    assert pagination_info["is_total_records_approximate"] is False
 
     searched_opportunities = search_response["data"]
     assert len(searched_opportunities) == expected_response_record_count
@@ -9,6 +9,7 @@ from src.constants.lookup_constants import (
     FundingInstrument,
     OpportunityStatus,
 )
+from src.search.search_config import get_search_config
 from src.util.dict_util import flatten_dict
 from tests.conftest import BaseTestClass
 from tests.src.api.opportunities_v0_1.conftest import (
@@ -207,6 +208,63 @@ class TestSearchOrdering(BaseTestClass):
 
         assert returned_opportunity_ids == expected_order
 
+    @pytest.mark.parametrize(
+        "order_by,sort_direction,expected_order",
+        [
+            ("opportunity_id", "ascending", [1, 2, 3, 4, 5]),
+            ("opportunity_title", "descending", [1, 2, 5, 3, 4]),
+            ("post_date", "ascending", [5, 2, 1, 4, 3]),
+            # opportunity id 1 has a null close date, so is at the end regardless of direction
+            ("close_date", "ascending", [5, 4, 3, 2, 1]),
+            ("close_date", "descending", [2, 3, 4, 5, 1]),
+            ("agency_code", "descending", [5, 2, 1, 3, 4]),
+        ],
+    )
+    def test_opportunity_sorting_cursor_200(
+        self, client, api_auth_token, order_by, sort_direction, expected_order, setup_scenarios
+    ):
+        # Fetch every page by following the cursor of the prior page
+        search_request = get_search_request(
+            page_size=2, order_by=order_by, sort_direction=sort_direction
+        )
+
+        returned_opportunity_ids = []
+        for _ in range(5):
+            resp = client.post(
+                "/v0.1/opportunities/search",
+                json=search_request,
+                headers={"X-Auth": api_auth_token},
+            )
+            assert resp.status_code == 200
+
+            search_response = resp.get_json()
+            returned_opportunity_ids.extend(
+                [record["opportunity_id"] for record in search_response["data"]]
+            )
+
+            next_cursor = search_response["pagination_info"]["next_cursor"]
+            if next_cursor is None:
+                break
+            search_request["pagination"]["cursor"] = next_cursor
+
+        assert returned_opportunity_ids == expected_order
+
+    def test_opportunity_search_invalid_cursor_422(self, client, api_auth_token):
+        search_request = get_search_request()
+        search_request["pagination"]["cursor"] = "not-a-cursor"
+
+        resp = client.post(
+            "/v0.1/opportunities/search", json=search_request, headers={"X-Auth": api_auth_token}
+        )
+        assert resp.status_code == 422
+        assert resp.get_json()["errors"] == [
+            {
+                "field": "pagination.cursor",
+                "message": "Not a valid pagination cursor.",
+                "type": "invalid",
+            }
+        ]
+
 
 #####################################
 # Search querying & filtering
@@ -910,6 +968,96 @@ class TestSearchScenarios(BaseTestClass):
         )
 
 
+class TestSearchFullText(BaseTestClass):
+    @pytest.fixture(scope="class")
+    def full_text_search(self, monkeypatch_class):
+        monkeypatch_class.setattr(get_search_config(), "opportunity_db_search_full_text", True)
+
+    @pytest.fixture(scope="class")
+    def setup_scenarios(self, truncate_opportunities, enable_factory_create, full_text_search):
+        setup_opportunity(1, opportunity_title="Research grants for coastal wetlands")
+        setup_opportunity(2, summary_description="Funding to research the restoration of wetlands")
+        setup_opportunity(
+            3,
+            opportunity_title="Community health clinics",
+            summary_description="Supports rural clinics and coastal communities",
+            assistance_listings=[("12.345", "Wetland conservation program")],
+        )
+        setup_opportunity(4, opportunity_title="Youth fellowship program")
+        setup_opportunity(5, opportunity_title="Research wetlands draft", is_draft=True)
+
+    @pytest.mark.parametrize(
+        "query,expected_opportunity_ids",
+        [
+            # Matches the title, summary description, and program title, including
+            # different forms of the same word (wetland / wetlands)
+            ("wetlands", [1, 2, 3]),
+            ("WETLAND", [1, 2, 3]),
+            ("research", [1, 2]),
+            # Every word needs to match, but can be in any order or field
+            ("coastal research", [1]),
+            ("coastal clinics", [3]),
+            # Web search syntax - excluded words, "or" and phrases
+            ("coastal -wetlands", [3]),
+            ("fellowship or clinics", [3, 4]),
+            ('"health clinics"', [3]),
+            ('"clinics health"', []),
+            # Partial opportunity number, and exact assistance listing number
+            ("NUMBER-4", [4]),
+            ("12.345", [3]),
+            ("volcano", []),
+        ],
+    )
+    def test_opportunity_full_text_query_200(
+        self, client, api_auth_token, setup_scenarios, query, expected_opportunity_ids
+    ):
+        search_request = get_search_request(page_size=25, query=query)
+        resp = client.post(
+            "/v0.1/opportunities/search", json=search_request, headers={"X-Auth": api_auth_token}
+        )
+        assert resp.status_code == 200
+
+        search_response = resp.get_json()
+        opportunity_ids = [record["opportunity_id"] for record in search_response["data"]]
+        assert set(opportunity_ids) == set(expected_opportunity_ids)
+        assert search_response["pagination_info"]["total_records"] == len(expected_opportunity_ids)
+
+    @pytest.mark.parametrize(
+        "query,sort_direction,expected_order",
+        [
+            # A match in the title is weighted above a match in the summary
+            ("research", "descending", [1, 2]),
+            ("research", "ascending", [2, 1]),
+            # Without a query, there is nothing to rank so it sorts by ID
+            (None, "descending", [4, 3, 2, 1]),
+        ],
+    )
+    def test_opportunity_full_text_relevancy_200(
+        self, client, api_auth_token, setup_scenarios, query, sort_direction, expected_order
+    ):
+        search_request = get_search_request(
+            page_size=1, order_by="relevancy", sort_direction=sort_direction, query=query
+        )
+
+        # Fetch every page with the cursor, to verify it works with the rank
+        opportunity_ids = []
+        for _ in range(len(expected_order)):
+            resp = client.post(
+                "/v0.1/opportunities/search",
+                json=search_request,
+                headers={"X-Auth": api_auth_token},
+            )
+            assert resp.status_code == 200
+
+            search_response = resp.get_json()
+            opportunity_ids.extend(record["opportunity_id"] for record in search_response["data"])
+            search_request["pagination"]["cursor"] = search_response["pagination_info"][
+                "next_cursor"
+            ]
+
+        assert opportunity_ids == expected_order
+
+
 #####################################
 # Request validation tests
 #####################################
@@ -948,7 +1096,7 @@ class TestSearchScenarios(BaseTestClass):
             [
                 {
                     "field": "pagination.order_by",
-                    "message": "Value must be one of: opportunity_id, opportunity_number, opportunity_title, post_date, close_date, agency_code",
+                    "message": "Value must be one of: relevancy, opportunity_id, opportunity_number, opportunity_title, post_date, close_date, agency_code",
                     "type": "invalid_choice",
                 },
                 {
@@ -1,5 +1,6 @@
 import pytest
 
+import src.auth.rate_limit as rate_limit
 from tests.src.api.opportunities_v1.conftest import get_search_request
 
 
@@ -19,3 +20,28 @@ def test_opportunity_unauthorized_401(client, api_auth_token, method, url, body)
         response.get_json()["message"]
         == "The server could not verify that you are authorized to access the URL requested"
     )
+
+
+@pytest.mark.parametrize(
+    "search_request",
+    [
+        get_search_request(format="csv"),
+        get_search_request(page_size=1000),
+        get_search_request(agency_one_of=[f"AGENCY-{i}" for i in range(25)]),
+    ],
+)
+def test_opportunity_search_expensive_429(app, client, api_auth_token, monkeypatch, search_request):
+    # Expensive searches have their own budget, which is used up before searching
+    rate_limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimitConfig(
+            enabled=True, expensive_search_capacity=0, expensive_search_refill_per_second=0.1
+        )
+    )
+    monkeypatch.setitem(app.extensions, "rate-limiter", rate_limiter)
+
+    response = client.post(
+        "/v1/opportunities/search", json=search_request, headers={"X-Auth": api_auth_token}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
@@ -1,8 +1,17 @@
+import json
+
 import pytest
 
+from src.api.opportunities_v1.opportunity_schemas import OpportunityGetResponseV1Schema
+from src.api.response import ApiResponse
+from src.constants.lookup_constants import ApplicantType
+from src.db.models.opportunity_models import OpportunityDocument
+from src.services.opportunities_v1.get_opportunity import get_opportunity, get_opportunity_etag
+from src.services.opportunities_v1.get_opportunity_json import get_opportunity_json
 from tests.src.api.opportunities_v1.conftest import validate_opportunity
 from tests.src.db.models.factories import (
     CurrentOpportunitySummaryFactory,
+    LinkOpportunitySummaryApplicantTypeFactory,
     OpportunityFactory,
     OpportunitySummaryFactory,
 )
@@ -12,6 +21,19 @@ from tests.src.db.models.factories import (
 #####################################
 
 
+def sort_lists(response_json: dict) -> dict:
+    # The order of these lists isn't defined when loaded by the ORM
+    opportunity = response_json["data"]
+    opportunity["opportunity_assistance_listings"].sort(
+        key=lambda listing: json.dumps(listing, sort_keys=True)
+    )
+    if opportunity["summary"] is not None:
+        for key in ["funding_instruments", "funding_categories", "applicant_types"]:
+            opportunity["summary"][key].sort()
+
+    return response_json
+
+
 @pytest.mark.parametrize(
     "opportunity_params,opportunity_summary_params",
     [
@@ -62,6 +84,98 @@ def test_get_opportunity_200(
     validate_opportunity(db_opportunity, response_data)
 
 
+@pytest.mark.parametrize(
+    "opportunity_params",
+    [
+        {},
+        {"opportunity_assistance_listings": []},
+        {"no_current_summary": True},
+        {"all_fields_null": True},
+    ],
+)
+def test_get_opportunity_from_document(
+    client, api_auth_token, enable_factory_create, db_session, opportunity_params
+):
+    opportunity = OpportunityFactory.create(**opportunity_params)
+    url = f"/v1/opportunities/{opportunity.opportunity_id}"
+
+    live_resp = client.get(url, headers={"X-Auth": api_auth_token})
+    assert live_resp.status_code == 200
+
+    document = OpportunityDocument(
+        opportunity_id=opportunity.opportunity_id,
+        document=get_opportunity_json(db_session, opportunity.opportunity_id),
+        document_version=get_opportunity_etag(db_session, opportunity.opportunity_id),
+    )
+    db_session.add(document)
+    db_session.commit()
+
+    # The document is returned exactly as the opportunity itself would be
+    resp = client.get(url, headers={"X-Auth": api_auth_token})
+    assert resp.status_code == 200
+    assert resp.data == live_resp.data
+    assert resp.headers["ETag"] == live_resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == live_resp.headers["Cache-Control"]
+
+    # The response is the document as is
+    document.document = document.document | {"opportunity_title": "From the document"}
+    db_session.commit()
+    resp = client.get(url, headers={"X-Auth": api_auth_token})
+    assert resp.get_json()["data"]["opportunity_title"] == "From the document"
+
+
+def test_get_opportunity_from_document_out_of_date(
+    client, api_auth_token, enable_factory_create, db_session
+):
+    opportunity = OpportunityFactory.create()
+    document = get_opportunity_json(db_session, opportunity.opportunity_id)
+
+    db_session.add(
+        OpportunityDocument(
+            opportunity_id=opportunity.opportunity_id,
+            document=document,
+            document_version=get_opportunity_etag(db_session, opportunity.opportunity_id),
+        )
+    )
+    opportunity.opportunity_title = "An updated title"
+    db_session.commit()
+
+    # The opportunity changed after the document was made, so the document isn't used
+    resp = client.get(
+        f"/v1/opportunities/{opportunity.opportunity_id}", headers={"X-Auth": api_auth_token}
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["data"]["opportunity_title"] == "An updated title"
+
+
+@pytest.mark.parametrize(
+    "opportunity_params",
+    [
+        {"is_posted_summary": True},
+        {"is_forecasted_summary": True},
+        {"no_current_summary": True},
+        {"all_fields_null": True},
+    ],
+)
+def test_get_opportunity_matches_schema(
+    client, api_auth_token, enable_factory_create, db_session, opportunity_params
+):
+    opportunity = OpportunityFactory.create(**opportunity_params)
+
+    resp = client.get(
+        f"/v1/opportunities/{opportunity.opportunity_id}", headers={"X-Auth": api_auth_token}
+    )
+    assert resp.status_code == 200
+
+    # The opportunity is serialized in SQL, make sure it's the
+    # same as what serializing it with the schema would return
+    db_session.expire_all()
+    expected_response = OpportunityGetResponseV1Schema().dump(
+        ApiResponse(message="Success", data=get_opportunity(db_session, opportunity.opportunity_id))
+    )
+    assert sort_lists(resp.get_json()) == sort_lists(json.loads(json.dumps(expected_response)))
+
+
 def test_get_opportunity_404_not_found(client, api_auth_token, truncate_opportunities):
     resp = client.get("/v1/opportunities/1", headers={"X-Auth": api_auth_token})
     assert resp.status_code == 404
@@ -80,3 +194,63 @@ def test_get_opportunity_404_not_found_is_draft(client, api_auth_token, enable_f
         resp.get_json()["message"]
         == f"Could not find Opportunity with ID {opportunity.opportunity_id}"
     )
+
+
+def test_get_opportunity_etag(client, api_auth_token, enable_factory_create, db_session):
+    opportunity = OpportunityFactory.create()
+    url = f"/v1/opportunities/{opportunity.opportunity_id}"
+
+    resp = client.get(url, headers={"X-Auth": api_auth_token})
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "public, max-age=60, must-revalidate"
+    assert "X-Auth" in resp.headers["Vary"]
+
+    # The client already has the current version
+    resp = client.get(url, headers={"X-Auth": api_auth_token, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert resp.headers["ETag"] == etag
+    assert resp.headers["Cache-Control"] == "public, max-age=60, must-revalidate"
+
+    # An ETag for a different version gets the full response
+    resp = client.get(url, headers={"X-Auth": api_auth_token, "If-None-Match": '"abc123"'})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == etag
+
+    # Changing the opportunity itself, or any of its related records, changes the ETag
+    etags = {etag}
+
+    opportunity.opportunity_title = "An updated title"
+    db_session.commit()
+    resp = client.get(url, headers={"X-Auth": api_auth_token, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.get_json()["data"]["opportunity_title"] == "An updated title"
+    etags.add(resp.headers["ETag"])
+
+    opportunity_summary = opportunity.current_opportunity_summary.opportunity_summary
+    existing_applicant_types = {
+        link.applicant_type for link in opportunity_summary.link_applicant_types
+    }
+    LinkOpportunitySummaryApplicantTypeFactory.create(
+        opportunity_summary=opportunity_summary,
+        applicant_type=next(a for a in ApplicantType if a not in existing_applicant_types),
+    )
+    etags.add(client.get(url, headers={"X-Auth": api_auth_token}).headers["ETag"])
+
+    db_session.delete(opportunity.opportunity_assistance_listings[0])
+    db_session.commit()
+    etags.add(client.get(url, headers={"X-Auth": api_auth_token}).headers["ETag"])
+
+    assert len(etags) == 4
+
+
+def test_get_opportunity_etag_404(client, api_auth_token, enable_factory_create):
+    opportunity = OpportunityFactory.create(is_draft=True)
+
+    resp = client.get(
+        f"/v1/opportunities/{opportunity.opportunity_id}",
+        headers={"X-Auth": api_auth_token, "If-None-Match": "*"},
+    )
+    assert resp.status_code == 404
+    assert "ETag" not in resp.headers
@@ -1,5 +1,7 @@
 from datetime import date
 
+from freezegun import freeze_time
+
 from tests.src.db.models.factories import OpportunityFactory, OpportunitySummaryHistoryBuilder
 
 
@@ -160,3 +162,36 @@ def test_get_opportunity_404_not_found_is_draft(client, api_auth_token, enable_f
         resp.get_json()["message"]
         == f"Could not find Opportunity with ID {opportunity.opportunity_id}"
     )
+
+
+def test_get_opportunity_versions_etag(client, api_auth_token, enable_factory_create):
+    opportunity = (
+        OpportunitySummaryHistoryBuilder()
+        .add_non_forecast(is_current=True)
+        .add_non_forecast_history()
+        .build()
+    )
+    url = f"/v1/opportunities/{opportunity.opportunity_id}/versions"
+
+    with freeze_time("2024-06-01 12:00:00"):
+        resp = client.get(url, headers={"X-Auth": api_auth_token})
+        assert resp.status_code == 200
+        etag = resp.headers["ETag"]
+        assert resp.headers["Cache-Control"] == "public, max-age=60, must-revalidate"
+
+        resp = client.get(url, headers={"X-Auth": api_auth_token, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    # Which versions are shown depends on the date, so a new day gets a new ETag
+    with freeze_time("2024-06-02 12:00:00"):
+        resp = client.get(url, headers={"X-Auth": api_auth_token, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    # The GET endpoint has its own ETag for the same opportunity
+    resp = client.get(
+        f"/v1/opportunities/{opportunity.opportunity_id}",
+        headers={"X-Auth": api_auth_token, "If-None-Match": etag},
+    )
+    assert resp.status_code == 200
@@ -12,6 +12,8 @@ from src.constants.lookup_constants import (
 )
 from src.db.models.opportunity_models import Opportunity
 from src.pagination.pagination_models import SortDirection
+from src.search.backend.load_opportunities_to_index import add_derived_search_fields
+from src.util.datetime_util import get_now_us_eastern_date
 from src.util.dict_util import flatten_dict
 from tests.conftest import BaseTestClass
 from tests.src.api.opportunities_v1.conftest import get_search_request
@@ -349,7 +351,11 @@ class TestOpportunityRouteSearch(BaseTestClass):
     def setup_search_data(self, opportunity_index, opportunity_index_alias, search_client):
         # Load into the search index
         schema = OpportunityV1Schema()
-        json_records = [schema.dump(opportunity) for opportunity in OPPORTUNITIES]
+        current_date = get_now_us_eastern_date()
+        json_records = [
+            add_derived_search_fields(schema.dump(opportunity), current_date)
+            for opportunity in OPPORTUNITIES
+        ]
         search_client.bulk_upsert(opportunity_index, json_records, "opportunity_id")
 
         # Swap the search index alias
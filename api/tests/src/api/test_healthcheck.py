@@ -1,4 +1,7 @@
+import time
+
 import src.adapters.db as db
+import src.api.readiness as readiness
 
 
 def test_get_healthcheck_200(client):
@@ -18,3 +21,54 @@ def test_get_healthcheck_503_db_bad_state(client, monkeypatch):
     response = client.get("/health")
     assert response.status_code == 503
     assert response.get_json()["message"] == "Service Unavailable"
+
+
+def test_get_healthcheck_live_200(client):
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Service alive"
+
+
+def test_get_healthcheck_ready_200(client, app, monkeypatch):
+    readiness_checker = readiness.get_readiness_checker(app)
+    monkeypatch.setitem(readiness_checker._checks, "search_index", lambda: True)
+    monkeypatch.setattr(readiness_checker, "_result", readiness_checker.run_checks())
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Service ready"
+    assert response.get_json()["data"] == {"db": True, "db_pool": True, "search_index": True}
+
+
+def test_get_healthcheck_ready_503(client, app, monkeypatch):
+    readiness_checker = readiness.get_readiness_checker(app)
+    monkeypatch.setattr(
+        readiness_checker,
+        "_result",
+        readiness.ReadinessResult(
+            checks={"db": False, "db_pool": True, "search_index": True},
+            checked_at=time.monotonic(),
+        ),
+    )
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["message"] == "Service Unavailable"
+    assert response.get_json()["data"] == {"db": False, "db_pool": True, "search_index": True}
+
+
+def test_get_healthcheck_ready_200_with_failed_informational_checks(client, app, monkeypatch):
+    readiness_checker = readiness.get_readiness_checker(app)
+    monkeypatch.setattr(
+        readiness_checker,
+        "_result",
+        readiness.ReadinessResult(
+            checks={"db": True, "db_pool": False, "search_index": False},
+            checked_at=time.monotonic(),
+        ),
+    )
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Service ready"
+    assert response.get_json()["data"] == {"db": True, "db_pool": False, "search_index": False}
@@ -0,0 +1,142 @@
+import dataclasses
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import IntEnum, StrEnum
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import tests.src.db.models.factories as factories
+from src.api.json_provider import OrjsonProvider
+
+
+class ExampleStrEnum(StrEnum):
+    VALUE = "value"
+
+
+class ExampleIntEnum(IntEnum):
+    VALUE = 1
+
+
+@dataclasses.dataclass
+class ExampleDataclass:
+    z_field: str
+    a_field: date
+
+
+EXAMPLE_VALUES = {
+    "strings": {"b": "text", "a": 'with "quotes" and \\ slashes\n', "c": ""},
+    "numbers": [0, -1, 2**63 - 1, 1.5, 0.1, -123.456],
+    "constants": [True, False, None],
+    "date": date(2024, 2, 29),
+    "datetime": datetime(2024, 2, 29, 13, 45, 1, tzinfo=timezone.utc),
+    "naive_datetime": datetime(2024, 2, 29, 13, 45, 1),
+    "decimal": Decimal("12345.678"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "enums": [ExampleStrEnum.VALUE, ExampleIntEnum.VALUE],
+    "dataclass": ExampleDataclass(z_field="z", a_field=date(2024, 1, 1)),
+    "int_keys": {2: "two", 1: "one"},
+    "nested": {"list": [{"y": 1, "x": [1, {"b": 2, "a": 1}]}], "empty": {}},
+}
+
+
+@pytest.fixture
+def example_app() -> Flask:
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("compact", [True, False])
+@pytest.mark.parametrize("key", EXAMPLE_VALUES.keys())
+def test_response_matches_default_provider(example_app, compact, key):
+    default_provider = DefaultJSONProvider(example_app)
+    orjson_provider = OrjsonProvider(example_app)
+    default_provider.compact = orjson_provider.compact = compact
+
+    value = {key: EXAMPLE_VALUES[key]}
+    with example_app.app_context():
+        default_response = default_provider.response(value)
+        orjson_response = orjson_provider.response(value)
+
+    assert orjson_response.get_data() == default_response.get_data()
+    assert orjson_response.mimetype == default_response.mimetype
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        # The default provider escapes non-ASCII characters, orjson writes them as UTF-8
+        {"text": "café – naïve ✓"},
+        # orjson writes exponents without a sign or leading zeros, like 1e16 rather than 1e+16
+        {"numbers": [1e16, -2.5e-8, 1.7976931348623157e308]},
+    ],
+)
+def test_response_semantically_matches_default_provider(example_app, value):
+    with example_app.app_context():
+        default_response = DefaultJSONProvider(example_app).response(value)
+        orjson_response = OrjsonProvider(example_app).response(value)
+
+    assert json.loads(orjson_response.get_data()) == json.loads(default_response.get_data())
+
+
+def test_response_falls_back_to_json(example_app):
+    # orjson can't encode integers over 64 bits
+    value = {"big": 2**70}
+    with example_app.app_context():
+        response = OrjsonProvider(example_app).response(value)
+
+    assert json.loads(response.get_data()) == value
+
+
+def test_loads(example_app):
+    provider = OrjsonProvider(example_app)
+
+    assert provider.loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert provider.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_unserializable_value(example_app):
+    with example_app.app_context(), pytest.raises(TypeError):
+        OrjsonProvider(example_app).response({"a": object()})
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_api_responses_match_default_provider(
+    app, client, api_auth_token, enable_factory_create, monkeypatch, compact
+):
+    opportunities = factories.OpportunityFactory.create_batch(size=5)
+    requests = [
+        ("get", f"/v1/opportunities/{opportunities[0].opportunity_id}", None),
+        ("get", f"/v1/opportunities/{opportunities[0].opportunity_id}/versions", None),
+        (
+            "post",
+            "/v0.1/opportunities/search",
+            {
+                "pagination": {
+                    "page_offset": 1,
+                    "page_size": 5,
+                    "order_by": "opportunity_id",
+                    "sort_direction": "ascending",
+                }
+            },
+        ),
+        ("get", "/health", None),
+        ("get", "/v1/opportunities/0", None),
+    ]
+    monkeypatch.setattr(app.json, "compact", compact)
+
+    def make_requests():
+        return [
+            getattr(client, method)(url, json=body, headers={"X-Auth": api_auth_token}).data
+            for method, url, body in requests
+        ]
+
+    default_responses = make_requests()
+
+    orjson_provider = OrjsonProvider(app)
+    orjson_provider.compact = compact
+    monkeypatch.setattr(app, "json", orjson_provider)
+
+    assert make_requests() == default_responses
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+import src.api.readiness as readiness
+
+
+class FakeSearchClient:
+    def __init__(self, alias_exists: bool = True):
+        self._alias_exists = alias_exists
+
+    def alias_exists(self, alias_name: str) -> bool:
+        return self._alias_exists
+
+
+@pytest.fixture
+def readiness_config():
+    return readiness.ReadinessConfig(check_interval_seconds=60, max_db_pool_saturation=0.5)
+
+
+def test_readiness_checker_ready(db_client, readiness_config, monkeypatch):
+    checker = readiness.ReadinessChecker(db_client, FakeSearchClient(), readiness_config)
+    monkeypatch.setattr(checker, "_start_background_checks", lambda: None)
+
+    result = checker.get_result()
+
+    assert result.is_ready
+    assert result.checks == {"db": True, "db_pool": True, "search_index": True}
+    # The result is reused rather than checked again
+    assert checker.get_result() is result
+
+
+def test_readiness_checker_search_index_missing(db_client, readiness_config, monkeypatch):
+    checker = readiness.ReadinessChecker(
+        db_client, FakeSearchClient(alias_exists=False), readiness_config
+    )
+    monkeypatch.setattr(checker, "_start_background_checks", lambda: None)
+
+    result = checker.get_result()
+
+    # Only reported, the API can still handle everything but searches
+    assert result.is_ready
+    assert result.checks == {"db": True, "db_pool": True, "search_index": False}
+
+
+def test_readiness_checker_db_error(db_client, readiness_config, monkeypatch):
+    def err_method(*args):
+        raise Exception("Fake Error")
+
+    monkeypatch.setattr(db_client, "get_connection", err_method)
+
+    checker = readiness.ReadinessChecker(db_client, FakeSearchClient(), readiness_config)
+    result = checker.run_checks()
+
+    assert not result.is_ready
+    assert result.checks["db"] is False
+
+
+def test_readiness_checker_db_pool_saturated(db_client, readiness_config, monkeypatch):
+    monkeypatch.setattr(db_client, "get_pool_saturation", lambda: 0.75)
+
+    checker = readiness.ReadinessChecker(db_client, FakeSearchClient(), readiness_config)
+    result = checker.run_checks()
+
+    # Only reported, as the pool frees up when this worker's requests finish
+    assert result.is_ready
+    assert result.checks["db_pool"] is False
+
+
+def test_readiness_checker_stale_result(db_client, readiness_config, monkeypatch):
+    checker = readiness.ReadinessChecker(db_client, FakeSearchClient(), readiness_config)
+    # The background checks stopped updating the result three intervals ago
+    monkeypatch.setattr(
+        checker,
+        "_result",
+        readiness.ReadinessResult(
+            checks={"db": True, "db_pool": True, "search_index": True},
+            checked_at=time.monotonic() - 181,
+        ),
+    )
+
+    result = checker.get_result()
+
+    assert not result.is_ready
+    assert result.checks["fresh"] is False
+
+
+def test_readiness_checker_background_checks(db_client, monkeypatch):
+    config = readiness.ReadinessConfig(check_interval_seconds=0.01)
+    checker = readiness.ReadinessChecker(db_client, FakeSearchClient(), config)
+
+    try:
+        first_result = checker.get_result()
+
+        # Wait for the background thread to check again
+        for _ in range(100):
+            if checker.get_result() is not first_result:
+                break
+            time.sleep(0.01)
+
+        assert checker.get_result() is not first_result
+        assert checker.get_result().is_ready
+    finally:
+        checker.stop()
+
+    assert not checker._thread.is_alive()
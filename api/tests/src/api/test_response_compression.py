@@ -0,0 +1,154 @@
+import gzip
+
+import brotli
+import pytest
+import zstandard
+from flask import Flask, Response
+
+import src.api.response_compression as response_compression
+from src.api.response_compression import ResponseCompressionConfig
+
+LARGE_DATA = {"data": [{"opportunity_title": f"Opportunity {i}"} for i in range(200)]}
+
+
+@pytest.fixture
+def compression_config() -> ResponseCompressionConfig:
+    return ResponseCompressionConfig(RESPONSE_COMPRESSION_MIN_SIZE=100)
+
+
+@pytest.fixture
+def example_app(compression_config) -> Flask:
+    app = Flask(__name__)
+    response_compression.init_app(app, compression_config)
+
+    @app.get("/large")
+    def large():
+        return LARGE_DATA
+
+    @app.get("/small")
+    def small():
+        return {"data": "hello"}
+
+    @app.get("/etag")
+    def etag():
+        response = app.json.response(LARGE_DATA)
+        response.set_etag("abc123")
+        return response
+
+    @app.get("/not_modified")
+    def not_modified():
+        return Response(status=304, headers={"ETag": '"abc123"'})
+
+    @app.get("/image")
+    def image():
+        return Response(b"0" * 1000, mimetype="image/png")
+
+    @app.get("/csv")
+    def csv():
+        return Response("a,b,c\n" * 1000, mimetype="text/csv")
+
+    return app
+
+
+def test_compress_response_gzip(example_app):
+    resp = example_app.test_client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["Content-Length"] == str(len(resp.data))
+
+    uncompressed = example_app.test_client().get("/large")
+    assert gzip.decompress(resp.data) == uncompressed.data
+    assert len(resp.data) < len(uncompressed.data)
+
+
+def test_compress_response_csv(example_app):
+    resp = example_app.test_client().get("/csv", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == b"a,b,c\n" * 1000
+
+
+@pytest.mark.parametrize(
+    "url,accept_encoding",
+    [
+        # Small responses aren't worth compressing
+        ("/small", "gzip"),
+        # The client doesn't accept an encoding we support
+        ("/large", None),
+        ("/large", "identity"),
+        ("/large", "gzip;q=0"),
+        ("/large", "deflate"),
+        # Not a text format
+        ("/image", "gzip"),
+    ],
+)
+def test_compress_response_not_compressed(example_app, url, accept_encoding):
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    resp = example_app.test_client().get(url, headers=headers)
+
+    assert resp.status_code == 200
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_compress_response_weakens_etag(example_app):
+    client = example_app.test_client()
+
+    assert client.get("/etag").headers["ETag"] == '"abc123"'
+    assert client.get("/etag", headers={"Accept-Encoding": "gzip"}).headers["ETag"] == 'W/"abc123"'
+
+
+def test_compress_response_weakens_etag_not_modified(example_app):
+    client = example_app.test_client()
+
+    resp = client.get("/not_modified")
+    assert resp.headers["ETag"] == '"abc123"'
+    assert "Accept-Encoding" in resp.headers["Vary"]
+
+    # The same ETag as the compressed 200 response would have
+    resp = client.get("/not_modified", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == 'W/"abc123"'
+    assert "Accept-Encoding" in resp.headers["Vary"]
+
+
+def test_compress_response_already_encoded(example_app):
+    @example_app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(b"x" * 1000),
+            mimetype="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    resp = example_app.test_client().get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(resp.data) == b"x" * 1000
+
+
+@pytest.mark.parametrize(
+    "encoding,decompress", [("zstd", zstandard.decompress), ("br", brotli.decompress)]
+)
+def test_compress_response_preferred_encodings(example_app, encoding, decompress):
+    resp = example_app.test_client().get(
+        "/large", headers={"Accept-Encoding": f"gzip;q=0.5, {encoding}"}
+    )
+    assert resp.headers["Content-Encoding"] == encoding
+    assert decompress(resp.data) == example_app.test_client().get("/large").data
+
+
+def test_get_encoders(compression_config):
+    encoders = response_compression.get_encoders(compression_config)
+    assert list(encoders) == ["zstd", "br", "gzip"]
+    assert gzip.decompress(encoders["gzip"](b"hello")) == b"hello"
+
+
+def test_compression_disabled():
+    app = Flask(__name__)
+    response_compression.init_app(app, ResponseCompressionConfig(ENABLE_RESPONSE_COMPRESSION=False))
+
+    @app.get("/large")
+    def large():
+        return LARGE_DATA
+
+    resp = app.test_client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
@@ -0,0 +1,111 @@
+import pytest
+from freezegun import freeze_time
+
+import src.app as app_entry
+import src.auth.rate_limit as rate_limit
+from src.auth.api_key_auth import api_key_auth
+
+
+def test_in_memory_rate_limit_store():
+    store = rate_limit.InMemoryRateLimitStore()
+
+    with freeze_time("2026-01-01 00:00:00") as frozen_time:
+        # The bucket starts full
+        for remaining in [2, 1, 0]:
+            result = store.take_token("default:user", capacity=3, refill_per_second=0.5)
+            assert result == rate_limit.RateLimitResult(
+                is_allowed=True, remaining=remaining, retry_after_seconds=0
+            )
+
+        result = store.take_token("default:user", capacity=3, refill_per_second=0.5)
+        assert result == rate_limit.RateLimitResult(
+            is_allowed=False, remaining=0, retry_after_seconds=2
+        )
+
+        # Other keys have their own bucket
+        assert store.take_token("default:other_user", capacity=3, refill_per_second=0.5).is_allowed
+
+        # Refills at the given rate
+        frozen_time.tick(1)
+        result = store.take_token("default:user", capacity=3, refill_per_second=0.5)
+        assert result == rate_limit.RateLimitResult(
+            is_allowed=False, remaining=0, retry_after_seconds=1
+        )
+        frozen_time.tick(1)
+        assert store.take_token("default:user", capacity=3, refill_per_second=0.5).is_allowed
+
+        # But not past the capacity
+        frozen_time.tick(60)
+        result = store.take_token("default:user", capacity=3, refill_per_second=0.5)
+        assert result == rate_limit.RateLimitResult(
+            is_allowed=True, remaining=2, retry_after_seconds=0
+        )
+
+
+@pytest.mark.parametrize(
+    "page_size,is_csv,filter_value_count,expected",
+    [
+        (25, False, 5, False),
+        (100, False, 20, False),
+        (101, False, 0, True),
+        (25, True, 0, True),
+        (25, False, 21, True),
+    ],
+)
+def test_rate_limiter_is_expensive_search(page_size, is_csv, filter_value_count, expected):
+    rate_limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimitConfig(
+            expensive_search_page_size=100, expensive_search_filter_values=20
+        )
+    )
+
+    assert rate_limiter.is_expensive_search(page_size, is_csv, filter_value_count) is expected
+
+
+@pytest.fixture
+def rate_limited_app(all_api_auth_tokens):
+    # We can't add an endpoint to the app from the tests, see test_username_logging
+    app = app_entry.create_app()
+
+    @app.get("/dummy_auth_endpoint")
+    @app.auth_required(api_key_auth)
+    def dummy_endpoint():
+        return "ok"
+
+    rate_limit.register_rate_limiter(
+        rate_limit.RateLimiter(
+            rate_limit.RateLimitConfig(enabled=True, capacity=2, refill_per_second=0.25)
+        ),
+        app,
+    )
+
+    return app
+
+
+def test_check_rate_limit(rate_limited_app, all_api_auth_tokens, caplog):
+    client = rate_limited_app.test_client()
+    headers = {"X-Auth": all_api_auth_tokens[0]}
+
+    for remaining in [1, 0]:
+        resp = client.get("/dummy_auth_endpoint", headers=headers)
+        assert resp.status_code == 200
+        assert caplog.records[-1].__dict__["rate_limit.default.remaining"] == remaining
+
+    resp = client.get("/dummy_auth_endpoint", headers=headers)
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "4"
+    assert resp.get_json()["message"] == "Too many requests, please try again later"
+    assert caplog.records[-1].__dict__["auth.username"] == "auth_token_0"
+    assert caplog.records[-1].__dict__["rate_limit.exceeded_bucket"] == "default"
+
+    # Another API key isn't limited
+    resp = client.get("/dummy_auth_endpoint", headers={"X-Auth": all_api_auth_tokens[1]})
+    assert resp.status_code == 200
+
+
+def test_check_rate_limit_disabled(app, client, api_auth_token, monkeypatch):
+    rate_limiter = rate_limit.RateLimiter(rate_limit.RateLimitConfig(enabled=False, capacity=0))
+    monkeypatch.setitem(app.extensions, "rate-limiter", rate_limiter)
+
+    resp = client.get("/v1/opportunities/1", headers={"X-Auth": api_auth_token})
+    assert resp.status_code == 404
@@ -44,6 +44,27 @@ def test_lookup_config():
     assert config.get_enum_for_int(4) == EnumY.D
 
 
+def test_lookup_config_bulk_conversion():
+    config = LookupConfig(
+        [
+            LookupStr(EnumX.A, 1),
+            LookupStr(EnumX.B, 2),
+            LookupStr(EnumY.C, 3),
+            LookupStr(EnumY.D, 4),
+        ]
+    )
+
+    assert config.get_ints_for_enums([EnumY.D, None, EnumX.A, EnumX.A]) == [4, None, 1, 1]
+    assert config.get_enums_for_ints([3, None, 5, 2]) == [EnumY.C, None, None, EnumX.B]
+
+    assert config.get_enum_to_int_map() == {EnumX.A: 1, EnumX.B: 2, EnumY.C: 3, EnumY.D: 4}
+    assert config.get_int_to_enum_map() == {1: EnumX.A, 2: EnumX.B, 3: EnumY.C, 4: EnumY.D}
+
+    # The mappings are shared by every column using the config, so can't be modified
+    with pytest.raises(TypeError):
+        config.get_int_to_enum_map()[5] = EnumX.A  # type: ignore[index]
+
+
 def test_lookup_config_duplicate_enum_str():
     with pytest.raises(AttributeError, match="Duplicate lookup_enum B defined"):
         LookupConfig(
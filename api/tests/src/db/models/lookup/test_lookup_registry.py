@@ -61,6 +61,16 @@ def test_lookup_registry():
         assert LookupRegistry.get_lookup_int_for_enum(LkTmp, AnotherEnum.D) is None
         assert LookupRegistry.get_lookup_int_for_enum(LkTmp, AnotherEnum.E) is None
         assert LookupRegistry.get_lookup_int_for_enum(LkTmp, None) is None
+
+        assert LookupRegistry.get_enums_for_lookup_ints(LkTmp, [3, 1, None, 4]) == [
+            TmpEnum.C,
+            TmpEnum.A,
+            None,
+            None,
+        ]
+        assert LookupRegistry.get_lookup_ints_for_enums(
+            LkTmp, [TmpEnum.B, None, AnotherEnum.D]
+        ) == [2, None, None]
     finally:
         # Because the registry is global, remove LkTmp
         # so it doesn't affect other tests that run
@@ -1,6 +1,7 @@
 import pytest
-from sqlalchemy import select
+from sqlalchemy import asc, desc, nulls_last, select, text
 
+import src.adapters.db.query_stats as query_stats
 from src.db.models.opportunity_models import (
     CurrentOpportunitySummary,
     LinkOpportunitySummaryApplicantType,
@@ -9,7 +10,7 @@ from src.db.models.opportunity_models import (
     Opportunity,
     OpportunitySummary,
 )
-from src.pagination.paginator import Paginator
+from src.pagination.paginator import CountStrategy, InvalidCursorError, Paginator, encode_cursor
 from tests.src.db.models.factories import OpportunityFactory
 
 DEFAULT_OPPORTUNITY_PARAMS = {
@@ -150,3 +151,281 @@ def test_paginator(db_session, create_opportunities):
 def test_page_size_zero_or_negative(db_session, page_size):
     with pytest.raises(ValueError, match="Page size must be at least 1"):
         Paginator(Opportunity, select(Opportunity), db_session, page_size)
+
+
+@pytest.mark.parametrize("is_ascending", [True, False])
+@pytest.mark.parametrize("page_size", [1, 2, 4, 15, 20])
+def test_paginator_page_after(db_session, create_opportunities, is_ascending, page_size):
+    # Sort by a column with many duplicate values, and a few nulls
+    opportunities = db_session.query(Opportunity).all()
+    for i, opportunity in enumerate(opportunities):
+        opportunity.agency = None if i % 5 == 0 else f"AGENCY-{i % 3}"
+    db_session.commit()
+
+    sort_fn = asc if is_ascending else desc
+    stmt = select(Opportunity).order_by(
+        nulls_last(sort_fn(Opportunity.agency)), sort_fn(Opportunity.opportunity_id)
+    )
+
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=page_size,
+        sort_column=Opportunity.agency,
+        is_ascending=is_ascending,
+    )
+    expected_ids = [opp.opportunity_id for opp in db_session.execute(stmt).scalars()]
+
+    # Following the cursors returns every record once, in the same order as the query
+    fetched_ids = [opp.opportunity_id for opp in paginator.page_at(1)]
+    while paginator.next_cursor is not None:
+        cursor = paginator.next_cursor
+        paginator.next_cursor = None
+        fetched_ids.extend([opp.opportunity_id for opp in paginator.page_after(cursor)])
+
+    assert fetched_ids == expected_ids
+
+
+def test_paginator_page_after_date_column(db_session, enable_factory_create):
+    opportunities = OpportunityFactory.create_batch(size=3, is_posted_summary=True)
+    opportunity_ids = [opp.opportunity_id for opp in opportunities]
+
+    stmt = (
+        select(Opportunity)
+        .join(
+            CurrentOpportunitySummary,
+            Opportunity.opportunity_id == CurrentOpportunitySummary.opportunity_id,
+        )
+        .join(
+            OpportunitySummary,
+            CurrentOpportunitySummary.opportunity_summary_id
+            == OpportunitySummary.opportunity_summary_id,
+        )
+        .where(Opportunity.opportunity_id.in_(opportunity_ids))
+        .order_by(nulls_last(asc(OpportunitySummary.post_date)), asc(Opportunity.opportunity_id))
+    )
+    paginator = Paginator(
+        Opportunity, stmt, db_session, page_size=2, sort_column=OpportunitySummary.post_date
+    )
+
+    first_page = paginator.page_at(1)
+    second_page = paginator.page_after(paginator.next_cursor)
+
+    expected_ids = [opp.opportunity_id for opp in db_session.execute(stmt).scalars()]
+    assert [opp.opportunity_id for opp in [*first_page, *second_page]] == expected_ids
+
+
+def test_paginator_page_after_invalid_cursor(db_session):
+    paginator = Paginator(
+        Opportunity, select(Opportunity), db_session, sort_column=Opportunity.agency
+    )
+
+    with pytest.raises(InvalidCursorError):
+        paginator.page_after("not-a-cursor")
+
+
+def test_paginator_page_after_no_sort_column(db_session):
+    paginator = Paginator(Opportunity, select(Opportunity), db_session)
+
+    with pytest.raises(ValueError, match="A sort column is required"):
+        paginator.page_after(encode_cursor("ABC", 1))
+
+
+@pytest.mark.parametrize(
+    "page_size,page_offset,expected_page_size,expected_total_pages",
+    [(6, 1, 6, 3), (6, 3, 3, 3), (6, 4, 0, 3), (15, 1, 15, 1), (20, 1, 15, 1)],
+)
+def test_paginator_window_count(
+    db_session,
+    create_opportunities,
+    page_size,
+    page_offset,
+    expected_page_size,
+    expected_total_pages,
+):
+    stmt = select(Opportunity).order_by(Opportunity.opportunity_id)
+    paginator = Paginator(
+        Opportunity, stmt, db_session, page_size=page_size, count_strategy=CountStrategy.WINDOW
+    )
+
+    with query_stats.track_query_stats() as stats:
+        page = paginator.page_at(page_offset)
+
+    assert len(page) == expected_page_size
+    assert paginator.total_records == 15
+    assert paginator.total_pages == expected_total_pages
+    assert paginator.is_total_records_exact is True
+
+    # The count comes from the page query, unless the page
+    # is past the end and there are no rows to get it from
+    assert stats.statement_count == (1 if expected_page_size > 0 else 2)
+
+
+def test_paginator_window_count_page_after(db_session, create_opportunities):
+    stmt = select(Opportunity).order_by(asc(Opportunity.opportunity_id))
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=10,
+        sort_column=Opportunity.opportunity_id,
+        count_strategy=CountStrategy.WINDOW,
+    )
+
+    first_page = paginator.page_at(1)
+    second_page = paginator.page_after(paginator.next_cursor)
+
+    assert len(first_page) == 10
+    assert len(second_page) == 5
+    # The total is of every record, not just those after the cursor
+    assert paginator.total_records == 15
+    assert paginator.total_pages == 2
+
+
+@pytest.mark.parametrize(
+    "max_count,expected_total_records,expected_total_pages,expected_is_exact",
+    [(10, 10, 2, False), (14, 14, 3, False), (15, 15, 3, True), (100, 15, 3, True)],
+)
+def test_paginator_capped_count(
+    db_session,
+    create_opportunities,
+    max_count,
+    expected_total_records,
+    expected_total_pages,
+    expected_is_exact,
+):
+    # Join to a one-to-many table to verify the capped count is of distinct records
+    stmt = select(Opportunity).outerjoin(OpportunitySummary).order_by(Opportunity.opportunity_id)
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=6,
+        count_strategy=CountStrategy.CAPPED,
+        max_count=max_count,
+    )
+
+    assert paginator.total_records == expected_total_records
+    assert paginator.total_pages == expected_total_pages
+    assert paginator.is_total_records_exact is expected_is_exact
+
+    assert len(paginator.page_at(1)) == 6
+
+
+@pytest.mark.parametrize(
+    "page_offset,expected_page_size,expected_total_records,expected_is_exact",
+    [(1, 6, 7, False), (2, 6, 13, False), (3, 3, 15, True), (4, 0, 0, False)],
+)
+def test_paginator_no_count(
+    db_session,
+    create_opportunities,
+    page_offset,
+    expected_page_size,
+    expected_total_records,
+    expected_is_exact,
+):
+    stmt = select(Opportunity).order_by(Opportunity.opportunity_id)
+    paginator = Paginator(
+        Opportunity, stmt, db_session, page_size=6, count_strategy=CountStrategy.NONE
+    )
+
+    with query_stats.track_query_stats() as stats:
+        page = paginator.page_at(page_offset)
+
+    assert stats.statement_count == 1
+    assert len(page) == expected_page_size
+    assert paginator.total_records == expected_total_records
+    assert paginator.is_total_records_exact is expected_is_exact
+
+
+def test_paginator_no_count_page_after(db_session, create_opportunities):
+    stmt = select(Opportunity).order_by(asc(Opportunity.opportunity_id))
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=6,
+        sort_column=Opportunity.opportunity_id,
+        count_strategy=CountStrategy.NONE,
+    )
+    paginator.page_at(1)
+
+    # The rows after the cursor don't say how many records there are in total,
+    # neither on a page in the middle, nor on the last page
+    for expected_page_size in [6, 3]:
+        with query_stats.track_query_stats() as stats:
+            page = paginator.page_after(paginator.next_cursor)
+
+        assert stats.statement_count == 1
+        assert len(page) == expected_page_size
+        assert paginator.total_records == 0
+        assert paginator.total_pages == 0
+        assert paginator.is_total_records_exact is False
+
+
+def test_paginator_estimated_count(db_session, create_opportunities):
+    # Make sure the planner has up-to-date statistics for the table
+    db_session.execute(text(f"ANALYZE {_get_table_name(db_session, Opportunity)}"))
+
+    stmt = select(Opportunity).order_by(Opportunity.opportunity_id)
+
+    # Under the max count, the records are counted exactly instead
+    paginator = Paginator(
+        Opportunity, stmt, db_session, page_size=6, count_strategy=CountStrategy.ESTIMATED
+    )
+    assert paginator.total_records == 15
+    assert paginator.total_pages == 3
+    assert paginator.is_total_records_exact is True
+
+    # The planner's estimate of an entire table is its row count
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=6,
+        count_strategy=CountStrategy.ESTIMATED,
+        max_count=1,
+    )
+    assert paginator.total_records == 15
+    assert paginator.total_pages == 3
+    assert paginator.is_total_records_exact is False
+
+    assert len(paginator.page_at(1)) == 6
+    assert paginator.is_total_records_exact is False
+
+    # Fetching the last page lets us correct the total
+    assert len(paginator.page_at(3)) == 3
+    assert paginator.total_records == 15
+    assert paginator.is_total_records_exact is True
+
+
+def test_paginator_estimated_count_filtered(db_session, create_opportunities):
+    db_session.execute(text(f"ANALYZE {_get_table_name(db_session, Opportunity)}"))
+
+    stmt = (
+        select(Opportunity)
+        .where(Opportunity.opportunity_title == "something else")
+        # Also verify the query params are passed through to the explain query
+        .where(Opportunity.opportunity_id.in_([1, 2, 3]))
+        .order_by(Opportunity.opportunity_id)
+    )
+    paginator = Paginator(
+        Opportunity,
+        stmt,
+        db_session,
+        page_size=6,
+        count_strategy=CountStrategy.ESTIMATED,
+        max_count=1,
+    )
+
+    # The planner's estimate of a filtered query isn't exact, but it always estimates a row
+    assert paginator.total_records >= 1
+    assert paginator.is_total_records_exact is False
+
+
+def _get_table_name(db_session, table_model):
+    # The tests use a different schema than the models are defined with
+    schema_translate_map = db_session.connection().get_execution_options()["schema_translate_map"]
+    table = table_model.__table__
+    return f"{schema_translate_map[table.schema]}.{table.name}"
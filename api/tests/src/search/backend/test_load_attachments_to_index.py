@@ -0,0 +1,104 @@
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.search.backend.load_attachments_to_index import (
+    LoadAttachmentsToIndex,
+    LoadAttachmentsToIndexConfig,
+    _get_attachment_id,
+)
+from src.util.file_util import FileInfo
+from tests.conftest import BaseTestClass
+from tests.lib.docx_testing import build_docx
+
+
+def write_attachment(attachment_path, relative_path: str, contents: bytes) -> None:
+    full_path = os.path.join(attachment_path, relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+    with open(full_path, "wb") as outfile:
+        outfile.write(contents)
+
+
+@pytest.mark.parametrize(
+    "attachment_path,file_path,expected_attachment_id",
+    [
+        ("s3://bucket/attachments", "s3://bucket/attachments/123/file.pdf", "123/file.pdf"),
+        ("s3://bucket/attachments/", "s3://bucket/attachments/123/file.pdf", "123/file.pdf"),
+        ("/tmp/attachments", "/tmp/attachments/45/nested/file.txt", "45/nested/file.txt"),
+        ("/tmp/attachments", "/tmp/attachments/file.txt", None),
+        ("/tmp/attachments", "/tmp/attachments/not-an-id/file.txt", None),
+    ],
+)
+def test_get_attachment_id(attachment_path, file_path, expected_attachment_id):
+    file_info = FileInfo(path=file_path, size_bytes=1, last_modified=datetime.now(tz=timezone.utc))
+
+    assert _get_attachment_id(attachment_path, file_info) == expected_attachment_id
+
+
+class TestLoadAttachmentsToIndex(BaseTestClass):
+    @pytest.fixture
+    def attachment_path(self, tmp_path):
+        attachment_path = str(tmp_path / "attachments")
+
+        write_attachment(attachment_path, "1/notes.txt", b"research into tree growth")
+        write_attachment(attachment_path, "1/nofo.docx", build_docx(["Eligibility", "Deadlines"]))
+        write_attachment(attachment_path, "2/page.html", b"<p>Grants for fish</p>")
+        write_attachment(attachment_path, "2/image.png", b"not text")
+        write_attachment(attachment_path, "3/large.txt", b"x" * 1000)
+        write_attachment(attachment_path, "misplaced.txt", b"not under an opportunity")
+
+        return attachment_path
+
+    @pytest.fixture
+    def config(self, attachment_path):
+        return LoadAttachmentsToIndexConfig(
+            attachment_path=attachment_path,
+            alias_name=f"test-attachment-index-alias-{uuid.uuid4().int}",
+            index_prefix="test-load-attachments",
+            max_workers=2,
+            max_file_size_bytes=500,
+        )
+
+    def test_load_attachments_to_index(self, db_session, search_client, attachment_path, config):
+        task = LoadAttachmentsToIndex(db_session, search_client, True, config)
+        task.run()
+
+        assert task.metrics[task.Metrics.FILES_FOUND] == 6
+        assert task.metrics[task.Metrics.FILES_SKIPPED_INVALID_PATH] == 1
+        assert task.metrics[task.Metrics.FILES_SKIPPED_UNSUPPORTED_TYPE] == 1
+        assert task.metrics[task.Metrics.FILES_SKIPPED_TOO_LARGE] == 1
+        assert task.metrics[task.Metrics.RECORDS_LOADED] == 3
+
+        resp = search_client.search(config.alias_name, {"size": 100}, include_scores=False)
+        records = {record["attachment_id"]: record for record in resp.records}
+        assert records.keys() == {"1/notes.txt", "1/nofo.docx", "2/page.html"}
+        assert records["1/nofo.docx"]["opportunity_id"] == 1
+        assert records["1/nofo.docx"]["content"] == "Eligibility\nDeadlines"
+
+        # Incrementally, only the changed and new files are loaded, and removed files are deleted
+        write_attachment(attachment_path, "1/notes.txt", b"research into tree growth rates")
+        write_attachment(attachment_path, "4/notes.txt", b"a new attachment")
+        os.remove(os.path.join(attachment_path, "2/page.html"))
+
+        task = LoadAttachmentsToIndex(db_session, search_client, False, config)
+        task.run()
+
+        assert task.metrics[task.Metrics.FILES_UNCHANGED] == 1
+        assert task.metrics[task.Metrics.RECORDS_LOADED] == 2
+        assert task.metrics[task.Metrics.RECORDS_DELETED] == 1
+
+        resp = search_client.search(config.alias_name, {"size": 100}, include_scores=False)
+        records = {record["attachment_id"]: record for record in resp.records}
+        assert records.keys() == {"1/notes.txt", "1/nofo.docx", "4/notes.txt"}
+        assert records["1/notes.txt"]["content"] == "research into tree growth rates"
+
+    def test_load_attachments_to_index_index_does_not_exist(
+        self, db_session, search_client, config
+    ):
+        task = LoadAttachmentsToIndex(db_session, search_client, False, config)
+
+        with pytest.raises(RuntimeError, match="please run the full refresh job"):
+            task.run()
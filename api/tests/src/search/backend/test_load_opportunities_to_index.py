@@ -1,8 +1,11 @@
+from datetime import date
+
 import pytest
 
 from src.search.backend.load_opportunities_to_index import (
     LoadOpportunitiesToIndex,
     LoadOpportunitiesToIndexConfig,
+    add_derived_search_fields,
 )
 from src.util.datetime_util import get_now_us_eastern_datetime
 from tests.conftest import BaseTestClass
@@ -86,6 +89,57 @@ class TestLoadOpportunitiesToIndexFullRefresh(BaseTestClass):
         )
 
 
+class TestLoadOpportunitiesToIndexReindex(BaseTestClass):
+    def test_reindex(
+        self,
+        truncate_opportunities,
+        enable_factory_create,
+        db_session,
+        search_client,
+        opportunity_index_alias,
+    ):
+        config = LoadOpportunitiesToIndexConfig(
+            alias_name=opportunity_index_alias, index_prefix="test-load-opps"
+        )
+        opportunities = OpportunityFactory.create_batch(size=5, is_posted_summary=True)
+        LoadOpportunitiesToIndex(db_session, search_client, True, config).run()
+        original_index_names = search_client.get_alias_index_names(opportunity_index_alias)
+
+        # Opportunities added to the DB after the last load are not picked up
+        # as the reindex only copies what is already in the search index
+        OpportunityFactory.create_batch(size=2, is_posted_summary=True)
+
+        config.shard_count = 2
+        config.reindex_poll_interval = 0.1
+        reindex_task = LoadOpportunitiesToIndex(
+            db_session, search_client, False, config, is_reindex=True
+        )
+        reindex_task.index_name = reindex_task.index_name + "-reindex"
+        reindex_task.run()
+
+        assert reindex_task.metrics[reindex_task.Metrics.RECORDS_LOADED] == len(opportunities)
+        assert search_client.get_alias_index_names(opportunity_index_alias) == [
+            reindex_task.index_name
+        ]
+        assert search_client.index_exists(original_index_names[0]) is False
+
+        resp = search_client.search(opportunity_index_alias, {"size": 100})
+        assert set([opp.opportunity_id for opp in opportunities]) == set(
+            [record["opportunity_id"] for record in resp.records]
+        )
+
+    def test_reindex_alias_does_not_exist(self, db_session, search_client):
+        config = LoadOpportunitiesToIndexConfig(
+            alias_name="fake-index-that-will-not-exist", index_prefix="test-load-opps"
+        )
+        reindex_task = LoadOpportunitiesToIndex(
+            db_session, search_client, False, config, is_reindex=True
+        )
+
+        with pytest.raises(RuntimeError, match="to point to exactly one index"):
+            reindex_task.run()
+
+
 class TestLoadOpportunitiesToIndexPartialRefresh(BaseTestClass):
     @pytest.fixture(scope="class")
     def load_opportunities_to_index(self, db_session, search_client, opportunity_index_alias):
@@ -151,3 +205,119 @@ class TestLoadOpportunitiesToIndexPartialRefresh(BaseTestClass):
 
         with pytest.raises(RuntimeError, match="please run the full refresh job"):
             load_opportunities_to_index.run()
+
+
+class TestLoadOpportunitiesToIndexRouteByAgency(BaseTestClass):
+    @pytest.fixture(scope="class")
+    def load_opportunities_to_index(self, db_session, search_client, opportunity_index_alias):
+        config = LoadOpportunitiesToIndexConfig(
+            alias_name=opportunity_index_alias,
+            index_prefix="test-load-opps",
+            route_by_agency=True,
+        )
+        return LoadOpportunitiesToIndex(db_session, search_client, False, config)
+
+    def test_load_opportunities_to_index(
+        self,
+        truncate_opportunities,
+        enable_factory_create,
+        db_session,
+        search_client,
+        opportunity_index_alias,
+        load_opportunities_to_index,
+    ):
+        index_name = "route-by-agency-index-" + get_now_us_eastern_datetime().strftime(
+            "%Y-%m-%d_%H-%M-%S"
+        )
+        search_client.create_index(index_name, shard_count=3)
+        search_client.swap_alias_index(
+            index_name, load_opportunities_to_index.config.alias_name, delete_prior_indexes=True
+        )
+
+        opportunities = []
+        opportunities.extend(
+            OpportunityFactory.create_batch(size=4, agency="DOC-NIST", is_posted_summary=True)
+        )
+        opportunities.extend(
+            OpportunityFactory.create_batch(size=4, agency="USAID", is_posted_summary=True)
+        )
+        no_agency_opportunity = OpportunityFactory.create(agency=None, is_posted_summary=True)
+        opportunities.append(no_agency_opportunity)
+
+        load_opportunities_to_index.run()
+
+        resp = search_client.search(opportunity_index_alias, {"size": 100})
+        assert resp.total_records == len(opportunities)
+
+        # Change the agency of an opportunity, and delete a few others
+        moved_opportunity = opportunities[0]
+        moved_opportunity.agency = "USAID"
+        for opportunity in [opportunities.pop(), opportunities.pop()]:
+            db_session.delete(opportunity)
+        db_session.commit()
+
+        load_opportunities_to_index.run()
+
+        # The opportunity that moved agencies isn't left behind on its prior shard
+        resp = search_client.search(opportunity_index_alias, {"size": 100})
+        assert resp.total_records == len(opportunities)
+        assert set([opp.opportunity_id for opp in opportunities]) == set(
+            [record["opportunity_id"] for record in resp.records]
+        )
+
+        resp = search_client._client.get(
+            index=opportunity_index_alias, id=moved_opportunity.opportunity_id, routing="USAID"
+        )
+        assert resp["_source"]["agency"] == "USAID"
+
+
+@pytest.mark.parametrize(
+    "opportunity_status,close_date,expected_days_until_close,expected_is_open",
+    [
+        ("posted", "2024-06-20", 5, True),
+        ("posted", "2024-06-15", 0, True),
+        ("posted", None, None, True),
+        ("posted", "2024-06-10", -5, False),
+        ("forecasted", "2024-06-20", 5, False),
+        ("closed", "2024-06-10", -5, False),
+    ],
+)
+def test_add_derived_search_fields(
+    opportunity_status, close_date, expected_days_until_close, expected_is_open
+):
+    json_record = {
+        "opportunity_id": 1,
+        "agency": "HHS-NIH11",
+        "opportunity_status": opportunity_status,
+        "summary": {
+            "post_date": "2024-05-01",
+            "close_date": close_date,
+            "funding_instruments": ["grant"],
+            "funding_categories": ["arts", "health"],
+            "applicant_types": ["individuals"],
+        },
+    }
+
+    json_record = add_derived_search_fields(json_record, date(2024, 6, 15))
+
+    assert json_record["post_date"] == "2024-05-01"
+    assert json_record["close_date"] == close_date
+    assert json_record["days_until_close"] == expected_days_until_close
+    assert json_record["is_open"] is expected_is_open
+    assert json_record["top_level_agency"] == "HHS"
+    assert json_record["funding_instrument"] == ["grant"]
+    assert json_record["funding_category"] == ["arts", "health"]
+    assert json_record["applicant_type"] == ["individuals"]
+
+
+def test_add_derived_search_fields_no_summary():
+    json_record = add_derived_search_fields(
+        {"opportunity_id": 1, "agency": None, "summary": None}, date(2024, 6, 15)
+    )
+
+    assert json_record["post_date"] is None
+    assert json_record["close_date"] is None
+    assert json_record["days_until_close"] is None
+    assert json_record["is_open"] is False
+    assert json_record["top_level_agency"] is None
+    assert json_record["funding_instrument"] == []
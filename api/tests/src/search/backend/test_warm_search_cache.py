@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from src.search.backend.warm_search_cache import (
+    WarmSearchCacheConfig,
+    WarmSearchCacheTask,
+    get_search_request_from_log_record,
+    normalize_search_request,
+)
+from src.util.dict_util import flatten_dict
+from tests.src.api.opportunities_v1.conftest import get_search_request
+
+
+def build_log_record(
+    search_request: dict,
+    msg: str = "end request",
+    url_rule: str = "/v1/opportunities/search",
+    status_code: int = 200,
+) -> dict:
+    # Mirror what the search endpoint + flask logger write to every log line
+    return {
+        "msg": msg,
+        "request.method": "POST",
+        "request.url_rule": url_rule,
+        "response.status_code": status_code,
+    } | flatten_dict(search_request, prefix="request.body")
+
+
+def write_log_file(file_path: str, log_records: list) -> None:
+    with open(file_path, "w") as outfile:
+        for log_record in log_records:
+            if isinstance(log_record, str):
+                outfile.write(log_record + "\n")
+            else:
+                outfile.write(json.dumps(log_record) + "\n")
+
+
+def test_get_search_request_from_log_record():
+    search_request = get_search_request(
+        query="research", agency_one_of=["USAID", "ARPAH"], post_date={"start_date": "2024-01-01"}
+    )
+
+    assert get_search_request_from_log_record(build_log_record(search_request)) == search_request
+
+
+@pytest.mark.parametrize(
+    "log_record",
+    [
+        build_log_record(get_search_request(), msg="start request"),
+        build_log_record(get_search_request(), url_rule="/v0.1/opportunities/search"),
+        build_log_record(get_search_request(), status_code=422),
+        {"msg": "end request", "request.url_rule": "/v1/opportunities/search"},
+        "not a dict",
+    ],
+)
+def test_get_search_request_from_log_record_not_search(log_record):
+    assert get_search_request_from_log_record(log_record) is None
+
+
+def test_normalize_search_request():
+    assert normalize_search_request(
+        get_search_request(query="research", agency_one_of=["USAID", "ARPAH"])
+    ) == normalize_search_request(
+        get_search_request(query="research", agency_one_of=["ARPAH", "USAID"])
+    )
+
+    assert normalize_search_request(get_search_request(page_offset=1)) != normalize_search_request(
+        get_search_request(page_offset=2)
+    )
+
+
+class TestWarmSearchCacheTask:
+    @pytest.fixture
+    def log_file_path(self, tmp_path):
+        common_request = get_search_request(query="research")
+        less_common_request = get_search_request(agency_one_of=["USAID", "ARPAH"])
+        same_request_reordered = get_search_request(agency_one_of=["ARPAH", "USAID"])
+        rare_request = get_search_request(page_offset=5)
+
+        log_records = [
+            build_log_record(common_request, msg="start request"),
+            build_log_record(common_request),
+            build_log_record(common_request),
+            build_log_record(common_request),
+            build_log_record(less_common_request),
+            build_log_record(same_request_reordered),
+            build_log_record(rare_request),
+            build_log_record(rare_request, status_code=500),
+            "some log line that isn't JSON",
+        ]
+
+        file_path = str(tmp_path / "request_logs.json")
+        write_log_file(file_path, log_records)
+        return file_path
+
+    def test_get_top_search_requests(self, db_session, search_client, log_file_path):
+        config = WarmSearchCacheConfig(log_file_path=log_file_path, top_n=2)
+        task = WarmSearchCacheTask(db_session, search_client, config)
+
+        search_requests = task.get_top_search_requests()
+
+        assert search_requests == [
+            get_search_request(query="research"),
+            get_search_request(agency_one_of=["ARPAH", "USAID"]),
+        ]
+
+        assert task.metrics[task.Metrics.LOG_LINES_PROCESSED] == 9
+        assert task.metrics[task.Metrics.LOG_LINES_UNPARSEABLE] == 1
+        assert task.metrics[task.Metrics.SEARCH_REQUESTS_FOUND] == 6
+        assert task.metrics[task.Metrics.UNIQUE_SEARCH_REQUESTS_FOUND] == 3
+
+    def test_warm_search_cache(
+        self, db_session, search_client, opportunity_index, opportunity_index_alias, log_file_path
+    ):
+        search_client.swap_alias_index(opportunity_index, opportunity_index_alias)
+
+        config = WarmSearchCacheConfig(log_file_path=log_file_path, max_concurrency=2)
+        task = WarmSearchCacheTask(db_session, search_client, config)
+        task.run()
+
+        # Each of the 3 unique requests is replayed once cold and once warm
+        assert task.metrics[task.Metrics.SEARCH_REQUESTS_REPLAYED] == 6
+        assert task.metrics[task.Metrics.SEARCH_REQUESTS_FAILED] == 0
+
+        for prefix in ["cold", "warm"]:
+            for stat in ["p50", "p90", "p99", "max"]:
+                assert task.metrics[f"{prefix}_{stat}_ms"] is not None
@@ -0,0 +1,11 @@
+import pytest
+
+from src.search.search_util import get_top_level_agency
+
+
+@pytest.mark.parametrize(
+    "agency,expected_top_level_agency",
+    [("HHS-NIH11", "HHS"), ("USAID", "USAID"), ("DOC-NOAA-ERL", "DOC"), ("", None), (None, None)],
+)
+def test_get_top_level_agency(agency, expected_top_level_agency):
+    assert get_top_level_agency(agency) == expected_top_level_agency
@@ -0,0 +1,27 @@
+from src.db.models.opportunity_models import OpportunitySummary
+from src.services.opportunities_v1.get_opportunity import get_opportunity_versions
+from tests.src.db.models.factories import OpportunitySummaryHistoryBuilder
+
+
+def test_get_opportunity_versions_only_loads_visible_summaries(enable_factory_create, db_session):
+    opportunity = (
+        OpportunitySummaryHistoryBuilder()
+        .add_forecast()
+        .add_forecast_history()
+        .add_forecast_history(is_deleted=True)
+        .add_forecast_history()
+        .add_non_forecast(is_current=True)
+        .add_non_forecast_history(post_date=None)
+        .add_non_forecast_history()
+        .build()
+    )
+    db_session.expunge_all()
+
+    versions = get_opportunity_versions(db_session, opportunity.opportunity_id)
+
+    assert [s.version_number for s in versions["forecasts"]] == [4, 3]
+    assert [s.version_number for s in versions["non_forecasts"]] == [3]
+
+    # The summaries that were filtered out were never loaded
+    loaded_summaries = [obj for obj in db_session if isinstance(obj, OpportunitySummary)]
+    assert len(loaded_summaries) == 3
@@ -0,0 +1,69 @@
+import pytest
+
+from src.api.opportunities_v1.opportunity_schemas import OpportunityV1Schema
+from src.db.models.lookup import LookupRegistry
+from src.db.models.lookup_models import LkApplicantType
+from src.services.opportunities_v1.get_opportunity import get_opportunity
+from src.services.opportunities_v1.get_opportunity_json import get_opportunity_json
+from tests.src.db.models.factories import OpportunityFactory
+
+
+def sort_lists(opportunity_json: dict) -> dict:
+    # The order of the lists isn't defined when they're loaded by the ORM
+    opportunity_json["opportunity_assistance_listings"].sort(
+        key=lambda listing: (listing["assistance_listing_number"] or "", listing["program_title"])
+    )
+    if opportunity_json["summary"] is not None:
+        for key in ["funding_instruments", "funding_categories", "applicant_types"]:
+            opportunity_json["summary"][key].sort()
+
+    return opportunity_json
+
+
+@pytest.mark.parametrize(
+    "opportunity_params",
+    [
+        {},
+        {"is_posted_summary": True},
+        {"is_forecasted_summary": True},
+        {"is_archived_non_forecast_summary": True},
+        {"opportunity_assistance_listings": []},
+        {"no_current_summary": True},
+        {"all_fields_null": True},
+    ],
+)
+def test_get_opportunity_json(enable_factory_create, db_session, opportunity_params):
+    opportunity = OpportunityFactory.create(**opportunity_params)
+    db_session.expire_all()
+
+    opportunity_json = get_opportunity_json(db_session, opportunity.opportunity_id)
+    expected_json = OpportunityV1Schema().dump(
+        get_opportunity(db_session, opportunity.opportunity_id)
+    )
+
+    assert sort_lists(opportunity_json) == sort_lists(expected_json)
+
+
+def test_get_opportunity_json_lookup_order(enable_factory_create, db_session):
+    opportunity = OpportunityFactory.create(is_posted_summary=True)
+    db_session.expire_all()
+
+    summary_json = get_opportunity_json(db_session, opportunity.opportunity_id)["summary"]
+    applicant_types = get_opportunity(
+        db_session, opportunity.opportunity_id
+    ).summary.applicant_types
+
+    # Lookup values are ordered by their lookup ID
+    assert summary_json["applicant_types"] == sorted(
+        applicant_types,
+        key=lambda a: LookupRegistry.get_lookup_int_for_enum(LkApplicantType, a),
+    )
+
+
+def test_get_opportunity_json_404(enable_factory_create, db_session):
+    opportunity = OpportunityFactory.create(is_draft=True)
+
+    with pytest.raises(Exception) as exc_info:
+        get_opportunity_json(db_session, opportunity.opportunity_id)
+
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,39 @@
+from src.services.opportunities_v1.get_opportunity_json import get_opportunity_json
+from src.services.opportunities_v1.opportunity_document import fetch_opportunity_documents
+from src.task.opportunities.update_opportunity_documents_task import UpdateOpportunityDocumentsTask
+from tests.conftest import BaseTestClass
+from tests.src.db.models.factories import OpportunityFactory
+
+
+class TestFetchOpportunityDocuments(BaseTestClass):
+    def test_fetch_opportunity_documents(
+        self, db_session, truncate_opportunities, enable_factory_create
+    ):
+        opportunities = OpportunityFactory.create_batch(size=3, is_posted_summary=True)
+        # These aren't fetched
+        OpportunityFactory.create_batch(size=2, is_draft=True)
+        OpportunityFactory.create_batch(size=2, no_current_summary=True)
+
+        UpdateOpportunityDocumentsTask(db_session).run()
+
+        # Change an opportunity after its document was made, and add
+        # another without a document, neither document is up-to-date
+        opportunities[0].opportunity_title = "An updated title"
+        opportunities.append(OpportunityFactory.create(is_forecasted_summary=True))
+        db_session.commit()
+        db_session.expire_all()
+
+        documents = [
+            document
+            for batch in fetch_opportunity_documents(db_session, batch_size=2)
+            for document in batch
+        ]
+
+        assert sorted(documents, key=lambda d: d["opportunity_id"]) == [
+            get_opportunity_json(db_session, opportunity.opportunity_id)
+            for opportunity in sorted(opportunities, key=lambda o: o.opportunity_id)
+        ]
+        updated_document = next(
+            d for d in documents if d["opportunity_id"] == opportunities[0].opportunity_id
+        )
+        assert updated_document["opportunity_title"] == "An updated title"
@@ -0,0 +1,38 @@
+import pytest
+
+from src.search.search_config import get_search_config
+from src.services.opportunities_v1.search_opportunities import (
+    SearchOpportunityParams,
+    _get_search_params,
+)
+from tests.src.api.opportunities_v1.conftest import get_search_request
+
+
+@pytest.fixture
+def route_by_agency(monkeypatch):
+    monkeypatch.setattr(get_search_config(), "opportunity_search_route_by_agency", True)
+
+
+@pytest.mark.parametrize(
+    "search_request,expected_params",
+    [
+        (get_search_request(), {}),
+        (get_search_request(query="research"), {}),
+        (get_search_request(agency_one_of=["USAID"]), {"routing": "USAID"}),
+        (
+            get_search_request(agency_one_of=["USAID", "DOC-NIST", "DOC-EDA", "ARPAH"]),
+            {"routing": "ARPAH,DOC,USAID"},
+        ),
+    ],
+)
+def test_get_search_params_route_by_agency(route_by_agency, search_request, expected_params):
+    search_params = SearchOpportunityParams.model_validate(search_request)
+    assert _get_search_params(search_params) == expected_params
+
+
+def test_get_search_params_route_by_agency_disabled():
+    search_params = SearchOpportunityParams.model_validate(
+        get_search_request(agency_one_of=["USAID"])
+    )
+
+    assert _get_search_params(search_params) == {}
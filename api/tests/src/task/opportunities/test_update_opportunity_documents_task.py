@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import select
+
+from src.db.models.opportunity_models import OpportunityDocument
+from src.services.opportunities_v1.get_opportunity import get_opportunity_etag
+from src.services.opportunities_v1.get_opportunity_json import get_opportunity_json
+from src.task.opportunities.update_opportunity_documents_task import UpdateOpportunityDocumentsTask
+from tests.conftest import BaseTestClass
+from tests.src.db.models.factories import OpportunityFactory
+
+
+def get_documents(db_session) -> dict[int, OpportunityDocument]:
+    db_session.expire_all()
+    return {
+        document.opportunity_id: document
+        for document in db_session.scalars(select(OpportunityDocument))
+    }
+
+
+class TestUpdateOpportunityDocumentsTask(BaseTestClass):
+    @pytest.fixture
+    def update_opportunity_documents_task(self, db_session):
+        # A small batch size so the opportunities are split across batches
+        return UpdateOpportunityDocumentsTask(db_session, batch_size=2)
+
+    def test_update_opportunity_documents_task(
+        self,
+        db_session,
+        truncate_opportunities,
+        enable_factory_create,
+        update_opportunity_documents_task,
+    ):
+        opportunities = OpportunityFactory.create_batch(size=4, is_posted_summary=True)
+        opportunities.extend(OpportunityFactory.create_batch(size=1, no_current_summary=True))
+        # Drafts don't get a document
+        OpportunityFactory.create_batch(size=2, is_draft=True)
+
+        update_opportunity_documents_task.run()
+
+        documents = get_documents(db_session)
+        assert documents.keys() == {opp.opportunity_id for opp in opportunities}
+        for opportunity in opportunities:
+            document = documents[opportunity.opportunity_id]
+            assert document.document == get_opportunity_json(db_session, opportunity.opportunity_id)
+            assert document.document_version == get_opportunity_etag(
+                db_session, opportunity.opportunity_id
+            )
+
+        metrics = update_opportunity_documents_task.metrics
+        assert metrics[UpdateOpportunityDocumentsTask.Metrics.OPPORTUNITY_COUNT] == 5
+        assert metrics[UpdateOpportunityDocumentsTask.Metrics.NEW_DOCUMENT_COUNT] == 5
+
+        # Change a summary of one opportunity, and make another a draft
+        updated_opportunity = opportunities[0]
+        updated_opportunity.summary.summary_description = "An updated description"
+        draft_opportunity = opportunities[1]
+        draft_opportunity.is_draft = True
+        db_session.commit()
+
+        update_task = UpdateOpportunityDocumentsTask(db_session)
+        update_task.run()
+
+        documents = get_documents(db_session)
+        assert draft_opportunity.opportunity_id not in documents
+        assert (
+            documents[updated_opportunity.opportunity_id].document["summary"]["summary_description"]
+            == "An updated description"
+        )
+
+        assert update_task.metrics == update_task.metrics | {
+            UpdateOpportunityDocumentsTask.Metrics.OPPORTUNITY_COUNT: 4,
+            UpdateOpportunityDocumentsTask.Metrics.NEW_DOCUMENT_COUNT: 0,
+            UpdateOpportunityDocumentsTask.Metrics.UPDATED_DOCUMENT_COUNT: 1,
+            UpdateOpportunityDocumentsTask.Metrics.UNMODIFIED_DOCUMENT_COUNT: 3,
+            UpdateOpportunityDocumentsTask.Metrics.DELETED_DOCUMENT_COUNT: 1,
+        }
+
+        # Deleting an opportunity deletes its document
+        db_session.delete(opportunities[2])
+        db_session.commit()
+        assert opportunities[2].opportunity_id not in get_documents(db_session)
+
+
+def test_via_cli(cli_runner, db_session, enable_factory_create):
+    opportunity = OpportunityFactory.create(is_posted_summary=True)
+
+    cli_runner.invoke(args=["task", "update-opportunity-documents"])
+
+    db_session.expire_all()
+    document = db_session.get(OpportunityDocument, opportunity.opportunity_id)
+    assert document is not None
+    assert document.document == get_opportunity_json(db_session, opportunity.opportunity_id)
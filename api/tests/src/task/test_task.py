@@ -0,0 +1,19 @@
+from sqlalchemy import text
+
+from src.task.task import Task
+
+
+class SimpleTask(Task):
+    def run_task(self) -> None:
+        for _ in range(3):
+            self.db_session.execute(text("SELECT 1"))
+
+
+def test_task_query_stats_metrics(db_session):
+    task = SimpleTask(db_session)
+    task.run()
+
+    assert task.metrics["db.statement_count"] == 3
+    assert task.metrics["db.distinct_statement_count"] == 1
+    assert task.metrics["db.duration_ms"] > 0
+    assert task.metrics["task_duration_sec"] >= 0
@@ -0,0 +1,31 @@
+import src.adapters.db.flask_db as flask_db
+import src.adapters.search.flask_opensearch as flask_opensearch
+import src.app as app_entry
+
+
+def test_create_app_defer_clients(db_client):
+    app = app_entry.create_app(defer_clients=True)
+
+    # The clients aren't made until the app is in the process it'll run in
+    assert "dbdefault" not in app.extensions
+    assert "search-client" not in app.extensions
+    # But the OpenAPI spec is already built, so isn't built again by every process
+    spec_build_count = 0
+
+    @app.spec_processor
+    def count_spec_builds(spec):
+        nonlocal spec_build_count
+        spec_build_count += 1
+        return spec
+
+    app_entry.register_clients(app)
+
+    assert isinstance(flask_db.get_db(app), type(db_client))
+    assert flask_opensearch.get_search_client(app) is not None
+
+    resp = app.test_client().get("/health")
+    assert resp.status_code == 200
+
+    resp = app.test_client().get("/openapi.json")
+    assert resp.status_code == 200
+    assert spec_build_count == 0
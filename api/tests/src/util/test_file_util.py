@@ -81,3 +81,32 @@ def test_get_s3_file_key(path, file_key):
 )
 def test_get_s3_file_name(path, file_name):
     assert file_util.get_file_name(path) == file_name
+
+
+def test_list_files_local(tmp_path):
+    create_file(tmp_path, "a.txt")
+    create_file(tmp_path, "folder/b.txt")
+    create_file(tmp_path, "folder/nested/c.txt")
+
+    files = sorted(file_util.list_files(str(tmp_path)), key=lambda f: f.path)
+
+    assert [f.path for f in files] == [
+        os.path.join(tmp_path, "a.txt"),
+        os.path.join(tmp_path, "folder/b.txt"),
+        os.path.join(tmp_path, "folder/nested/c.txt"),
+    ]
+    assert [f.size_bytes for f in files] == [5, 5, 5]
+
+
+def test_list_files_s3(mock_s3_bucket):
+    root_path = f"s3://{mock_s3_bucket}/folder"
+    create_file(root_path, "a.txt")
+    create_file(root_path, "nested/b.txt")
+    create_file(f"s3://{mock_s3_bucket}/folder2", "c.txt")
+
+    files = sorted(file_util.list_files(root_path), key=lambda f: f.path)
+
+    assert [f.path for f in files] == [
+        f"s3://{mock_s3_bucket}/folder/a.txt",
+        f"s3://{mock_s3_bucket}/folder/nested/b.txt",
+    ]
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+import src.util.text_extraction_util as text_extraction_util
+from tests.lib.docx_testing import build_docx
+
+
+def write_file(file_path, contents: bytes) -> str:
+    with open(file_path, "wb") as outfile:
+        outfile.write(contents)
+
+    return str(file_path)
+
+
+@pytest.mark.parametrize(
+    "file_name,contents,expected_text",
+    [
+        ("notes.txt", b"Some plain text", "Some plain text"),
+        ("NOTES.TXT", b"Some plain text", "Some plain text"),
+        (
+            "page.html",
+            b"<html><head><title>Title</title><style>p {}</style></head>"
+            b"<body><h1>Header</h1><p>Some <b>bold</b> text</p><script>x = 1</script></body></html>",
+            "Header\nSome\nbold\ntext",
+        ),
+        (
+            "document.docx",
+            build_docx(["First paragraph", "Second paragraph"]),
+            "First paragraph\nSecond paragraph",
+        ),
+    ],
+)
+def test_extract_text(file_name, contents, expected_text):
+    assert text_extraction_util.extract_text(file_name, contents) == expected_text
+
+
+def test_extract_text_unsupported_file_type():
+    with pytest.raises(text_extraction_util.UnsupportedFileTypeError):
+        text_extraction_util.extract_text("image.png", b"")
+
+
+def test_extract_text_with_limits(tmp_path):
+    file_path = write_file(tmp_path / "notes.txt", b"Some plain text")
+
+    assert (
+        text_extraction_util.extract_text_with_limits(
+            file_path, max_file_size_bytes=100, timeout_seconds=5
+        )
+        == "Some plain text"
+    )
+
+
+def test_extract_text_with_limits_too_large(tmp_path):
+    file_path = write_file(tmp_path / "notes.txt", b"Some plain text")
+
+    with pytest.raises(text_extraction_util.FileTooLargeError):
+        text_extraction_util.extract_text_with_limits(
+            file_path, max_file_size_bytes=5, timeout_seconds=5
+        )
+
+
+def test_extract_text_with_limits_docx_too_large_when_decompressed(tmp_path):
+    # Repetitive text compresses to a small fraction of its size
+    file_path = write_file(tmp_path / "document.docx", build_docx(["a" * 10_000]))
+
+    with pytest.raises(text_extraction_util.FileTooLargeError):
+        text_extraction_util.extract_text_with_limits(
+            file_path, max_file_size_bytes=5_000, timeout_seconds=5
+        )
+
+
+def test_extract_text_with_limits_timeout(tmp_path):
+    # Opening a named pipe blocks until something writes to it, which never happens
+    file_path = str(tmp_path / "notes.txt")
+    os.mkfifo(file_path)
+
+    with pytest.raises(text_extraction_util.ExtractionTimeoutError):
+        text_extraction_util.extract_text_with_limits(
+            file_path, max_file_size_bytes=100, timeout_seconds=0.1
+        )
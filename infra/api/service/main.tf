@@ -122,6 +122,14 @@ module "service" {
   cpu                   = 1024
   memory                = 2048
 
+  # The container is only restarted if the process itself stops responding, while
+  # the load balancer stops sending it requests whenever its dependencies aren't ready
+  healthcheck_command = [
+    "CMD-SHELL",
+    "wget --no-verbose --tries=1 --spider http://localhost:8000/health/live || exit 1"
+  ]
+  healthcheck_path = "/health/ready"
+
   cert_arn = local.domain != null ? data.aws_acm_certificate.cert[0].arn : null
 
   app_access_policy_arn      = data.aws_iam_policy.app_db_access_policy[0].arn